@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Image pipeline timings on synthetic inputs: multipart parsing, loading a
+preview source, transforms, panel formatting, preview rebuilds (in process
+and through the render worker), a burst of concurrent transform requests,
+text layout and rendering and EPD.getbuffer (quantize + pack). No display
+hardware is touched; without the panel library (off the Pi) frames are packed
+the way `display_photo.py render` packs them there.
+
+  python3 benchmarks/bench_pipeline.py            -> small, medium and large inputs
+  python3 benchmarks/bench_pipeline.py --quick    -> small input only, fewer runs
+"""
+
+import io
+import sys
+import threading
+
+from PIL import Image
+
+from common import dp, timed
+
+SIZES = {
+    "small": (800, 600),
+    "medium": (2400, 1800),
+    "large": (4000, 3000),
+}
+SHORT_TEXT = "Back at 5"
+LONG_TEXT = " ".join(["The quick brown fox jumps over the lazy dog."] * 40)
+PAGES_TEXT = "\n\n".join([LONG_TEXT] * 25)
+TRANSFORM_BURST = 8
+
+
+def synthetic_photo(width, height):
+    """Deterministic photo-like RGB image: gradients with noise, so quantizing
+    dithers like it would on a real photo."""
+    red = Image.linear_gradient("L").resize((width, height))
+    green = Image.linear_gradient("L").rotate(90).resize((width, height))
+    blue = Image.effect_noise((width, height), 48)
+    return Image.merge("RGB", (red, green, blue))
+
+
+def _multipart(jpeg):
+    boundary = "benchboundary"
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="orientation"\r\n\r\n'
+        "portrait\r\n"
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="photo"; filename="photo.jpg"\r\n'
+        "Content-Type: image/jpeg\r\n\r\n"
+    ).encode("ascii") + jpeg + f"\r\n--{boundary}--\r\n".encode("ascii")
+    return f"multipart/form-data; boundary={boundary}", body
+
+
+def _rebuild_preview(image, state):
+    with dp._preview_lock:
+        dp._preview_source = image
+        dp._preview_state = state
+        dp._rebuild_preview_locked()
+
+
+def _transform_burst(image):
+    """TRANSFORM_BURST crop changes sent at once, as from several clients."""
+    with dp._preview_lock:
+        dp._preview_source = image
+        dp._preview_state = dp.PreviewState(orientation="landscape")
+    threads = [
+        threading.Thread(target=dp.update_preview_state, kwargs={"crop": 1.0 - i * 0.05})
+        for i in range(TRANSFORM_BURST)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def _load_preview_source(jpeg):
+    """Decode an upload and make it the preview source, as /api/preview/source does."""
+    image = dp.load_image_from_bytes(jpeg, max_pixels=dp.preview_source_max_pixels())
+    dp.set_preview_source(image, orientation="portrait", original=jpeg)
+
+
+def _render_new_text(text, font_size):
+    """Render as if text were new: forget earlier renders, keep the loaded fonts."""
+    dp._text_renders.clear()
+    return dp.render_text_to_image(text, font_size)
+
+
+def _frame_packer():
+    """The panel driver's getbuffer, or its library-free equivalent."""
+    try:
+        return dp.epd_driver().EPD().getbuffer
+    except (ImportError, OSError):
+        return dp._panel_getbuffer
+
+
+def run(sizes=None, samples=5):
+    """Return {case: timing} for every pipeline stage and input size."""
+    sizes = sizes or list(SIZES)
+    results = {}
+    photos = {}
+    packer = _frame_packer()
+
+    for name in sizes:
+        width, height = SIZES[name]
+        photo = photos[name] = synthetic_photo(width, height)
+        buf = io.BytesIO()
+        photo.save(buf, format="JPEG", quality=90)
+        content_type, body = _multipart(buf.getvalue())
+
+        results[f"parse_multipart_form.{name}"] = timed(
+            lambda: dp.parse_multipart_form(io.BytesIO(body), content_type, str(len(body))),
+            [()] * samples,
+        )
+        results[f"load_preview_source.{name}"] = timed(_load_preview_source, [(buf.getvalue(),)] * samples)
+        results[f"apply_transform.{name}"] = timed(
+            lambda: dp.apply_transform(photo, rotation=90, fill=True),
+            [()] * samples,
+        )
+        results[f"format_for_display.{name}"] = timed(dp.format_for_display, [(photo,)] * samples)
+        results[f"rebuild_preview.{name}"] = timed(
+            _rebuild_preview,
+            [(photo, dp.PreviewState(rotation=90, fill=True, orientation="landscape"))] * samples,
+        )
+
+    # The same rebuilds with the pixels handed to the render worker and back.
+    dp.start_render_worker()
+    try:
+        for name in sizes:
+            results[f"rebuild_preview_worker.{name}"] = timed(
+                _rebuild_preview,
+                [(photos[name], dp.PreviewState(rotation=90, fill=True, orientation="landscape"))] * samples,
+            )
+            results[f"transform_burst_worker.{name}"] = timed(_transform_burst, [(photos[name],)] * samples)
+    finally:
+        dp.stop_render_worker()
+
+    frame = dp.format_for_display(synthetic_photo(*SIZES["small"]))
+    flat = Image.new("RGB", (dp.EPD_WIDTH, dp.EPD_HEIGHT), (255, 255, 255))
+    results["getbuffer.photo"] = timed(packer, [(frame,)] * samples)
+    results["getbuffer.flat"] = timed(packer, [(flat,)] * samples)
+
+    results["render_text_to_image.short"] = timed(_render_new_text, [(SHORT_TEXT, 72)] * samples)
+    results["render_text_to_image.long"] = timed(_render_new_text, [(LONG_TEXT, 48)] * samples)
+    with dp._text_lock:
+        font = dp._text_font_locked(24)
+    results["wrap_text.pages"] = timed(
+        lambda: dp._wrap_text_lines(PAGES_TEXT, dp._text_width_table(font), dp.EPD_WIDTH - 80),
+        [()] * samples,
+    )
+    results["render_text_to_image.repeat"] = timed(dp.render_text_to_image, [(LONG_TEXT, 48)] * samples)
+    return results
+
+
+def main():
+    quick = "--quick" in sys.argv
+    results = run(sizes=["small"] if quick else None, samples=3 if quick else 5)
+    print("Image pipeline" + (" (quick)" if quick else ""))
+    for name, timing in results.items():
+        print(f"  {name:<32} median {timing['median_ms']:9.2f} ms  p95 {timing['p95_ms']:9.2f} ms")
+    memory = dp.get_preview_memory()
+    print(
+        f"Preview memory after the last load: {memory['used_bytes'] / 2**20:.1f} MB"
+        f" of {memory['budget_bytes'] / 2**20:.0f} MB (source {memory['source_size'][0]}x{memory['source_size'][1]})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Rotation store latency with a large queue. No display hardware is touched:
+item files are tiny placeholders and the panel refresh is skipped.
+
+  python3 benchmarks/bench_rotation_store.py           -> 10,000 items
+  python3 benchmarks/bench_rotation_store.py 50000     -> custom queue size
+"""
+
+import sys
+import tempfile
+import time
+
+from common import add_item, close_temp_store, dp, new_item, patched, timed, use_temp_store
+
+
+def run(item_count=10_000, samples=50):
+    """Return {operation: timing} for a queue of item_count items."""
+    # Rendering and SPI are not part of the store cost.
+    with patched(
+        render_image=lambda *args, **kwargs: {"frame": b""},
+        run_display_job=lambda *args, **kwargs: None,
+    ), tempfile.TemporaryDirectory() as root:
+        use_temp_store(root)
+        for _ in range(item_count):
+            add_item(new_item())
+        dp.sync_rotation_state()
+
+        results = {}
+        started = time.perf_counter()
+        dp.load_rotation_state()
+        results["load"] = {"median_ms": (time.perf_counter() - started) * 1000.0, "p95_ms": None, "runs": 1}
+
+        added = [new_item() for _ in range(samples)]
+        results["add"] = timed(add_item, [(item,) for item in added])
+
+        ids = [item.item_id for item in dp._rotation_state.items]
+        step = max(1, len(ids) // samples)
+        results["jump"] = timed(dp.jump_to_rotation_item, [(ids[i],) for i in range(0, len(ids), step)][:samples])
+        results["status"] = timed(dp.get_rotation_status, [()] * samples)
+        results["status_page"] = timed(
+            lambda: dp.get_rotation_status(limit=50, around_next=True),
+            [()] * samples,
+        )
+        results["status_summary"] = timed(lambda: dp.get_rotation_status(items=False), [()] * samples)
+        results["remove"] = timed(dp.remove_rotation_item, [(item.item_id,) for item in added])
+        results["sync"] = timed(dp.sync_rotation_state, [()] * samples)
+        close_temp_store()
+        return results
+
+
+def main():
+    item_count = int(sys.argv[1]) if len(sys.argv) >= 2 else 10_000
+    print(f"Rotation store, {item_count} items")
+    for name, timing in run(item_count).items():
+        p95 = "" if timing["p95_ms"] is None else f"  p95 {timing['p95_ms']:8.3f} ms"
+        print(f"  {name:<14} median {timing['median_ms']:8.3f} ms{p95}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Simulate a day of rotation on a fake clock: counts switches, measures drift
+and lateness of the panel transfer start against the intended schedule, and
+reports frames prepared late (inline at the due time) and scheduler wakeups.
+With --schedule, runs a day/night playlist schedule with quiet hours and
+checks that nothing switches while quiet and every switch shows the
+scheduled playlist. Runs in well under a second and touches no hardware.
+
+  python3 benchmarks/bench_scheduler.py                  -> 900 s interval, 24 h
+  python3 benchmarks/bench_scheduler.py 3600 --align     -> on the hour
+  python3 benchmarks/bench_scheduler.py --schedule       -> day/night playlists, quiet 23:00-07:00
+"""
+
+import sys
+import tempfile
+import time
+
+from common import add_item, close_temp_store, dp, new_item, use_temp_store
+
+SIMULATED_REFRESH_SECONDS = 19.0
+SIMULATED_PREPARE_SECONDS = 2.5
+DAY_NIGHT_SCHEDULE = [
+    {"name": "night", "start": "23:00", "end": "07:00", "quiet": True},
+    {"name": "day", "start": "07:00", "end": "19:00", "playlist": "day"},
+    {"name": "evening", "start": "19:00", "end": "23:00", "playlist": "evening", "interval_seconds": 1800},
+]
+
+
+def _scheduled_playlist(ts):
+    """DAY_NIGHT_SCHEDULE evaluated directly: the playlist at ts, None when quiet."""
+    hour = time.localtime(ts).tm_hour
+    if hour >= 23 or hour < 7:
+        return None
+    return "day" if hour < 19 else "evening"
+
+
+class SimulatedClock:
+    """Clock whose waits return instantly after advancing simulated time."""
+
+    def __init__(self, start):
+        self.now = start
+        self.waits = 0
+
+    def time(self):
+        return self.now
+
+    def wait(self, event, timeout):
+        self.waits += 1
+        if event.is_set() or timeout is None:
+            return event.is_set()
+        self.now += timeout
+        return False
+
+
+def simulate(interval_seconds=900, align=False, hours=24, item_count=5, scheduled=False):
+    """Run the scheduler for `hours` of simulated time; returns a summary dict.
+
+    With scheduled, item_count items are queued for each playlist of
+    DAY_NIGHT_SCHEDULE plus untagged ones, and drift is not measured.
+    """
+    start = 1_700_000_000.0 + 17.0  # deliberately not on a boundary
+    end = start + hours * 3600
+    clock = SimulatedClock(start)
+    switches = []
+    late_prepares = []
+    lateness = []
+    mismatches = []
+
+    with tempfile.TemporaryDirectory() as root:
+        use_temp_store(root)
+        for playlist in ("", "day", "evening") if scheduled else ("",):
+            for _ in range(item_count):
+                item = new_item()
+                item.playlist = playlist
+                add_item(item)
+        if scheduled:
+            dp._rotation_state.schedule = dp.parse_schedule(DAY_NIGHT_SCHEDULE)
+        dp._rotation_state.enabled = True
+        dp._rotation_state.interval_seconds = interval_seconds
+        dp._rotation_state.align_to_clock = align
+
+        scheduler = None
+
+        def prepare(item):
+            clock.now += SIMULATED_PREPARE_SECONDS
+            return b"frame"
+
+        def display(item, frame=None):
+            if frame is None:
+                late_prepares.append(item.item_id)
+                prepare(item)
+            switches.append(clock.now)
+            if scheduled and item.playlist != _scheduled_playlist(dp._rotation_state.last_switch_ts):
+                mismatches.append((clock.now, item.playlist))
+            lateness.append(clock.now - dp._rotation_state.last_switch_ts)
+            clock.now += SIMULATED_REFRESH_SECONDS
+            if clock.now >= end:
+                scheduler.stop()
+
+        scheduler = dp.RotationScheduler(clock=clock, display=display, prepare=prepare)
+        started = time.perf_counter()
+        scheduler.run()
+        elapsed = time.perf_counter() - started
+        close_temp_store()
+
+    # Drift: how far each later switch lands from its ideal slot. The first
+    # switch happens immediately (frame prepared inline), so anchor on the second.
+    first = switches[1] if len(switches) > 1 else switches[0]
+    drift = [abs((ts - first) - round((ts - first) / interval_seconds) * interval_seconds) for ts in switches[2:]]
+    if scheduled:
+        drift = []
+    return {
+        "switches": len(switches),
+        "quiet_switches": sum(1 for ts in switches if scheduled and _scheduled_playlist(ts) is None),
+        "playlist_mismatches": len(mismatches),
+        "max_drift_seconds": max(drift) if drift else 0.0,
+        "max_late_seconds": max(lateness[1:]) if len(lateness) > 1 else 0.0,
+        "late_prepares": len(late_prepares),
+        "clock_waits": clock.waits,
+        "wall_seconds": elapsed,
+    }
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    interval = int(args[0]) if args else 900
+    align = "--align" in sys.argv
+    scheduled = "--schedule" in sys.argv
+    result = simulate(interval_seconds=interval, align=align, scheduled=scheduled)
+    mode = ("aligned" if align else "relative") + (", day/night schedule" if scheduled else "")
+    print(f"Scheduler, 24 h simulated, interval={interval}s ({mode})")
+    print(f"  switches       {result['switches']}")
+    if scheduled:
+        print(f"  quiet switches {result['quiet_switches']}")
+        print(f"  wrong playlist {result['playlist_mismatches']}")
+    print(f"  max drift      {result['max_drift_seconds']:.3f} s")
+    print(f"  max late start {result['max_late_seconds']:.3f} s")
+    print(f"  late prepares  {result['late_prepares']}")
+    print(f"  clock waits    {result['clock_waits']}")
+    print(f"  wall time      {result['wall_seconds'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Server cold start: time from launching the server until its port accepts
+connections and until the API answers (rotation state loaded), plus the
+slowest imports on the way to listening (python3 -X importtime). The script
+runs from a temporary copy, so the real rotation store is untouched, on a
+spare port, so a running service is not disturbed.
+
+  python3 benchmarks/bench_startup.py            -> 5 starts as the service runs it (-m display_photo)
+  python3 benchmarks/bench_startup.py --script   -> 5 starts as python3 display_photo.py
+"""
+
+import http.client
+import os
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+_THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+_REPO_DIR = os.path.dirname(_THIS_DIR)
+PORT = 5099
+TIMEOUT_SECONDS = 30
+
+
+def _server_env():
+    env = dict(os.environ, EPAPER_PORT=str(PORT))
+    # Start like the service does, which keeps compiled bytecode between boots.
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def _server_copy(root):
+    shutil.copy(os.path.join(_REPO_DIR, "display_photo.py"), root)
+    os.symlink(os.path.join(_REPO_DIR, "python"), os.path.join(root, "python"))
+
+
+def _api_ready():
+    conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=TIMEOUT_SECONDS)
+    try:
+        conn.request("GET", "/api/rotation/status")
+        return conn.getresponse().status == 200
+    finally:
+        conn.close()
+
+
+def _start_once(root, as_module):
+    """Launch the server once; returns (seconds to listen, seconds to API ready)."""
+    command = [sys.executable, "-m", "display_photo"] if as_module else [sys.executable, "display_photo.py"]
+    env = _server_env()
+    started = time.perf_counter()
+    proc = subprocess.Popen(command, cwd=root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"Server exited during startup (code {proc.returncode})")
+            if time.perf_counter() - started > TIMEOUT_SECONDS:
+                raise RuntimeError("Server did not start listening")
+            try:
+                socket.create_connection(("127.0.0.1", PORT), timeout=1).close()
+                break
+            except OSError:
+                time.sleep(0.001)
+        listening = time.perf_counter() - started
+        if not _api_ready():
+            raise RuntimeError("Rotation status did not return 200")
+        return listening, time.perf_counter() - started
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=TIMEOUT_SECONDS)
+
+
+def _timing(seconds):
+    ms = sorted(s * 1000.0 for s in seconds)
+    return {"median_ms": statistics.median(ms), "p95_ms": ms[min(len(ms) - 1, int(len(ms) * 0.95))], "runs": len(ms)}
+
+
+def run(samples=5, as_module=True):
+    """Return {"listen": timing, "ready": timing} over `samples` cold starts."""
+    with tempfile.TemporaryDirectory() as root:
+        _server_copy(root)
+        _start_once(root, as_module)  # writes __pycache__ and warms the page cache
+        runs = [_start_once(root, as_module) for _ in range(samples)]
+    return {
+        "listen": _timing([listening for listening, _ready in runs]),
+        "ready": _timing([ready for _listening, ready in runs]),
+    }
+
+
+def import_report(top=15):
+    """[(module, self_ms, cumulative_ms)] for the slowest imports of display_photo."""
+    with tempfile.TemporaryDirectory() as root:
+        _server_copy(root)
+        command = [sys.executable, "-X", "importtime", "-c", "import display_photo"]
+        subprocess.run(command, cwd=root, env=_server_env(), capture_output=True, check=True)
+        proc = subprocess.run(command, cwd=root, env=_server_env(), capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.rstrip(), int(self_us) / 1000.0, int(cumulative_us) / 1000.0))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows[:top]
+
+
+def main():
+    as_module = "--script" not in sys.argv
+    command = "python3 -m display_photo" if as_module else "python3 display_photo.py"
+    print(f"Server startup ({command}), port {PORT}")
+    for name, timing in run(as_module=as_module).items():
+        print(f"  {name:<8} median {timing['median_ms']:7.1f} ms  p95 {timing['p95_ms']:7.1f} ms")
+    print("Slowest imports before listening (cumulative)")
+    for name, self_ms, cumulative_ms in import_report():
+        print(f"  {cumulative_ms:7.1f} ms  (self {self_ms:6.1f} ms)  {name}")
+
+
+if __name__ == "__main__":
+    main()
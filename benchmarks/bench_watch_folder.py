@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Watched-folder rescan cost: the startup/periodic scan of an already indexed
+directory, where nothing needs rendering. Rendering is replaced by a stub so
+only the scan, diff and bookkeeping are timed.
+
+  python3 benchmarks/bench_watch_folder.py           -> 5,000 files
+  python3 benchmarks/bench_watch_folder.py 20000     -> custom file count
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from common import add_item, close_temp_store, dp, new_item, patched, use_temp_store
+
+FILES_PER_DIR = 500
+
+
+def _fake_import(files, settings, workers=None):
+    for index, (name, _read) in enumerate(files):
+        item = new_item()
+        add_item(item)
+        yield {"index": index, "total": len(files), "file": name, "ok": True, "item_id": item.item_id}
+    yield {"done": True}
+
+
+def run(file_count=5_000):
+    """Return {phase: seconds} for indexing and rescanning file_count files.
+
+    first_index: initial scan with rendering stubbed; restart_rescan: state
+    load plus a scan that finds nothing new; incremental_rescan: one file
+    added and one deleted.
+    """
+    with (
+        patched(import_rotation_images=_fake_import),
+        tempfile.TemporaryDirectory() as root,
+        tempfile.TemporaryDirectory() as photos,
+    ):
+        use_temp_store(root)
+        for i in range(file_count):
+            folder = os.path.join(photos, f"album{i // FILES_PER_DIR:03d}")
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, f"photo{i:06d}.jpg"), "wb") as f:
+                f.write(b"x")
+        with dp._rotation_lock:
+            dp._rotation_state.watch_dir = photos
+            dp._persist_rotation_locked()
+            dp._flush_rotation_settings_locked()
+
+        results = {}
+        started = time.perf_counter()
+        dp.sync_watch_folder()
+        results["first_index"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        dp.load_rotation_state()
+        summary = dp.sync_watch_folder()
+        results["restart_rescan"] = time.perf_counter() - started
+        assert summary["added"] == 0 and summary["removed"] == 0, summary
+
+        os.remove(os.path.join(photos, "album000", "photo000000.jpg"))
+        with open(os.path.join(photos, "album000", "new.jpg"), "wb") as f:
+            f.write(b"y")
+        started = time.perf_counter()
+        summary = dp.sync_watch_folder()
+        results["incremental_rescan"] = time.perf_counter() - started
+        assert summary["added"] == 1 and summary["removed"] == 1, summary
+        close_temp_store()
+        return results
+
+
+def main():
+    file_count = int(sys.argv[1]) if len(sys.argv) >= 2 else 5_000
+    print(f"Watched folder, {file_count} files")
+    for name, seconds in run(file_count).items():
+        print(f"  {name:<20} {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
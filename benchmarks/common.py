@@ -0,0 +1,80 @@
+"""Shared helpers for the benchmark scripts: import path and a throwaway rotation store."""
+
+import os
+import statistics
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+_THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.dirname(_THIS_DIR))
+
+import display_photo as dp
+
+
+def use_temp_store(root):
+    """Point the rotation store at root and reset in-memory rotation state."""
+    dp._ROTATION_STORE_DIR = root
+    dp._ROTATION_ITEMS_DIR = os.path.join(root, "items")
+    dp._ROTATION_THUMBS_DIR = os.path.join(root, "thumbs")
+    dp._ROTATION_FRAMES_DIR = os.path.join(root, "frames")
+    dp._ROTATION_MANIFEST_PATH = os.path.join(root, "manifest.json")
+    dp._ROTATION_DB_PATH = os.path.join(root, "rotation.db")
+    dp._rotation_db = None
+    dp._rotation_state = dp.RotationState()
+    dp._rotation_timetable = None
+    dp._ensure_rotation_dirs()
+
+
+def close_temp_store():
+    if dp._rotation_db is not None:
+        dp._rotation_db.close()
+        dp._rotation_db = None
+
+
+def new_item():
+    """Create a rotation item backed by an empty placeholder file."""
+    item_id = uuid.uuid4().hex
+    filename = f"{item_id}.png"
+    with open(os.path.join(dp._ROTATION_ITEMS_DIR, filename), "wb"):
+        pass
+    return dp.RotationItem(item_id=item_id, filename=filename, created_at=time.time())
+
+
+def add_item(item):
+    with dp._rotation_lock:
+        dp._append_rotation_item_locked(item)
+
+
+def summarize(samples):
+    """Median/p95 of millisecond samples, in the shape every benchmark reports."""
+    samples = sorted(samples)
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "runs": len(samples),
+    }
+
+
+def timed(fn, args_list):
+    """Call fn once per args tuple; returns median/p95 milliseconds."""
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return summarize(samples)
+
+
+@contextmanager
+def patched(**replacements):
+    """Temporarily replace display_photo attributes, so benchmarks can share a process."""
+    saved = {name: getattr(dp, name) for name in replacements}
+    for name, value in replacements.items():
+        setattr(dp, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(dp, name, value)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Run the whole benchmark suite, write the results as JSON and compare them
+with the committed baseline. Exits 1 when any case is slower than the
+baseline by more than the threshold.
+
+  python3 benchmarks/run_benchmarks.py                      -> run, compare with baseline.json
+  python3 benchmarks/run_benchmarks.py --quick              -> smaller inputs (compares with baseline-quick.json)
+  python3 benchmarks/run_benchmarks.py --threshold 0.5      -> allow 50% slowdown
+  python3 benchmarks/run_benchmarks.py --update-baseline    -> record this run as the baseline
+
+Baselines are only comparable on the same kind of machine; record one on
+the Pi itself before relying on the regression check there.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import PIL
+
+import bench_pipeline
+import bench_rotation_store
+import bench_scheduler
+import bench_startup
+import bench_watch_folder
+from common import summarize
+
+_THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+DEFAULT_THRESHOLD = 0.25
+# Differences below this are timer noise, whatever the ratio.
+MIN_REGRESSION_MS = 0.05
+
+
+def _repeat(run, repeats):
+    """Median/p95 per case of `repeats` runs of a bench returning {case: seconds}."""
+    samples = {}
+    for _ in range(repeats):
+        for case, seconds in run().items():
+            samples.setdefault(case, []).append(seconds * 1000.0)
+    return {case: summarize(values) for case, values in samples.items()}
+
+
+def _suite(quick):
+    yield "pipeline", lambda: bench_pipeline.run(
+        sizes=["small"] if quick else None,
+        samples=3 if quick else 5,
+    )
+    yield "rotation_store", lambda: bench_rotation_store.run(
+        item_count=2_000 if quick else 10_000,
+        samples=20 if quick else 50,
+    )
+    yield "startup", lambda: bench_startup.run(samples=3 if quick else 5)
+    yield "scheduler", lambda: _repeat(
+        lambda: {
+            "day_900s": bench_scheduler.simulate(interval_seconds=900)["wall_seconds"],
+            "day_30s": bench_scheduler.simulate(interval_seconds=30)["wall_seconds"],
+            "day_30s_scheduled": bench_scheduler.simulate(interval_seconds=30, scheduled=True)["wall_seconds"],
+        },
+        repeats=5,
+    )
+    yield "watch_folder", lambda: _repeat(
+        lambda: bench_watch_folder.run(1_000 if quick else 5_000),
+        repeats=3,
+    )
+
+
+def run_suite(quick=False):
+    results = {}
+    for group, run in _suite(quick):
+        started = time.perf_counter()
+        for case, timing in run().items():
+            results[f"{group}.{case}"] = timing
+        print(f"  {group:<16} {time.perf_counter() - started:6.1f} s", file=sys.stderr)
+    return {
+        "mode": "quick" if quick else "full",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Return [(case, baseline_ms, current_ms, ratio, regressed)] for cases in both runs."""
+    rows = []
+    for case, timing in current["results"].items():
+        before = baseline["results"].get(case)
+        if before is None:
+            continue
+        old, new = before["median_ms"], timing["median_ms"]
+        ratio = new / old if old > 0 else float("inf")
+        regressed = ratio > 1.0 + threshold and new - old > MIN_REGRESSION_MS
+        rows.append((case, old, new, ratio, regressed))
+    return rows
+
+
+def _baseline_path(quick):
+    return os.path.join(_THIS_DIR, "baseline-quick.json" if quick else "baseline.json")
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="smaller inputs and fewer runs")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown ratio (0.25 = 25%%)")
+    parser.add_argument("--baseline", help="baseline JSON to compare with")
+    parser.add_argument("--output", default=os.path.join(_THIS_DIR, "results", "latest.json"), help="where to write results")
+    parser.add_argument("--update-baseline", action="store_true", help="write this run as the baseline")
+    args = parser.parse_args()
+
+    print(f"Running benchmark suite ({'quick' if args.quick else 'full'})", file=sys.stderr)
+    current = run_suite(quick=args.quick)
+    _write_json(args.output, current)
+    print(f"Results written to {args.output}")
+
+    baseline_path = args.baseline or _baseline_path(args.quick)
+    if args.update_baseline:
+        _write_json(baseline_path, current)
+        print(f"Baseline updated: {baseline_path}")
+        return 0
+
+    try:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"No usable baseline at {baseline_path} ({e}); run with --update-baseline")
+        return 0
+    if baseline.get("mode") != current["mode"]:
+        print(f"Baseline {baseline_path} is a {baseline.get('mode')} run; this is a {current['mode']} run")
+        return 2
+    if baseline.get("machine") != current["machine"]:
+        print(f"Warning: baseline was recorded on {baseline.get('machine')}, this is {current['machine']}")
+
+    rows = compare(current, baseline, args.threshold)
+    print(f"{'case':<44} {'baseline':>11} {'current':>11} {'change':>8}")
+    for case, old, new, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{case:<44} {old:9.2f}ms {new:9.2f}ms {(ratio - 1) * 100:+7.1f}%{flag}")
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed by more than {args.threshold * 100:.0f}%")
+        return 1
+    print(f"No regressions beyond {args.threshold * 100:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,37 +6,59 @@ Run from repo root. No extra installs; uses same deps as the demo.
   python3 display_photo.py              -> start webserver (Web UI + API)
   python3 display_photo.py <image_url>  -> fetch from URL and display
   python3 display_photo.py --clear      -> clear screen (CLI)
+  python3 display_photo.py render <files/dirs/zips> -o <dir>
+                                        -> pre-render panel frames (no panel needed)
+  python3 display_photo.py push <dir> [--server URL]
+                                        -> add pre-rendered frames to a server's queue
 
   API (when server is running):
     GET  /api/status
     GET  /api/rotation/status
     GET  /api/rotation/item_image?id=<item_id>
+    GET  /api/rotation/item_thumb?id=<item_id>
+    GET  /api/events
+    GET  /api/metrics
+    GET  /api/debug/memory
     POST /api/preview/source
     POST /api/preview/transform
     GET  /api/preview/image
+    GET  /api/preview/source_image
     POST /api/display
+    POST /api/display/raw
     POST /api/clear
+    POST /api/batch
+    POST /api/debug/memory
     POST /api/rotation/toggle
     POST /api/rotation/settings
+    POST /api/rotation/schedule
+    POST /api/rotation/playlist
     POST /api/rotation/add
+    POST /api/rotation/import
+    POST /api/rotation/push
+    POST /api/rotation/add_raw
+    POST /api/rotation/watch
     POST /api/rotation/display_now
     POST /api/rotation/jump
     POST /api/rotation/remove
     POST /api/rotation/clear
 """
 
+import bisect
+import heapq
 import io
-import ipaddress
 import json
 import os
 import re
+import signal
 import socket
 import sys
 import threading
 import time
-import uuid
+import weakref
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import parse_qs, urlparse
 
 # Run from repo root: lib is python/lib
@@ -45,22 +67,102 @@ _LIB_DIR = os.path.join(_THIS_DIR, "python", "lib")
 if os.path.exists(_LIB_DIR):
     sys.path.insert(0, _LIB_DIR)
 
-import epd13in3E
-from PIL import Image, ImageDraw, ImageFont, UnidentifiedImageError
+# Pillow, the panel driver, sqlite3 and other modules not needed to accept a
+# connection are imported where they are used, so the server is listening
+# before they have loaded.
+# Importing the driver is the slowest part: epdconfig shells out twice and
+# loads the SPI library.
 
 EPD_WIDTH = 1200
 EPD_HEIGHT = 1600
 DISPLAY_ASPECT = EPD_WIDTH / EPD_HEIGHT
+# Packed panel frame: two 4-bit palette indices per byte
+FRAME_BYTES = EPD_WIDTH * EPD_HEIGHT // 2
+# Panel colours by palette index, as the driver's getbuffer quantizes to (4 is unused)
+PANEL_PALETTE = ((0, 0, 0), (255, 255, 255), (255, 255, 0), (255, 0, 0), (0, 0, 0), (0, 0, 255), (0, 255, 0))
+# .epd file: magic, SHA-256 of the frame, packed frame
+EPD_FILE_MAGIC = b"EPD1"
 
 MAX_UPLOAD_BYTES = 16 * 1024 * 1024
+MAX_IMPORT_BYTES = 256 * 1024 * 1024
+MAX_IMPORT_FILES = 1000
+IMPORT_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".tif", ".tiff")
 MAX_FORM_BYTES = 256 * 1024
 MAX_FETCH_BYTES = 12 * 1024 * 1024
 MAX_IMAGE_PIXELS = 30_000_000
 FETCH_TIMEOUT_SECONDS = 30
+# A render job still running after this is taken to be stuck (e.g. in a decoder).
+RENDER_TIMEOUT_SECONDS = 60
+FETCH_CACHE_MAX_BYTES = 64 * 1024 * 1024
+FETCH_CACHE_MAX_HEURISTIC_SECONDS = 5 * 60
+FETCH_DECODED_CACHE_MAX_PIXELS = 24_000_000
 ALLOWED_ROTATIONS = {0, 90, 180, 270}
 ALLOWED_ORIENTATIONS = {"portrait", "landscape"}
+MIN_CROP = 0.25
+# A source wider than this has more detail than even the deepest crop can show.
+PREVIEW_SOURCE_MAX_EDGE = int(max(EPD_WIDTH, EPD_HEIGHT) / MIN_CROP)
 MIN_ROTATION_INTERVAL_SECONDS = 30
 MAX_ROTATION_INTERVAL_SECONDS = 24 * 60 * 60
+THUMBNAIL_MAX_EDGE = 150
+# Copy of the preview source the web page transforms locally; panel resolution
+LIVE_PREVIEW_MAX_EDGE = max(EPD_WIDTH, EPD_HEIGHT)
+THUMBNAIL_CACHE_SECONDS = 365 * 24 * 60 * 60
+EVENT_LOG_SIZE = 256
+EVENT_KEEPALIVE_SECONDS = 25
+ROTATION_PREPARE_LEAD_SECONDS = 30
+MAX_SCHEDULE_RULES = 32
+MAX_PLAYLIST_NAME_LENGTH = 64
+TIMETABLE_DAYS = 8
+MAX_STATUS_ITEMS = 500
+MAX_BATCH_OPERATIONS = 32
+BATCH_OPERATIONS = ("source", "transform", "display", "add", "jump")
+# Renders in a row a transform burst may throw away before one is published anyway
+MAX_ABANDONED_PREVIEW_RENDERS = 4
+METRIC_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DEFAULT_REFRESH_SECONDS = 19.0
+TEXT_FONT_PATHS = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+)
+TEXT_FONT_CACHE_SIZE = 64
+TEXT_MEASURE_SIZE = 100
+TEXT_RENDER_CACHE_SIZE = 8
+MEMORY_REPORT_TOP = 15
+MAX_MEMORY_REPORT_TOP = 100
+MAX_TRACEMALLOC_FRAMES = 25
+SHARED_MEMORY_STRIP_ROWS = 64
+
+try:
+    ROTATION_SYNC_SECONDS = max(1.0, float(os.environ.get("EPAPER_ROTATION_SYNC_SECONDS", "30")))
+except ValueError:
+    ROTATION_SYNC_SECONDS = 30.0
+
+try:
+    PREVIEW_MEMORY_BUDGET_BYTES = max(16, int(os.environ.get("EPAPER_PREVIEW_MEMORY_MB", "64"))) * 1024 * 1024
+except ValueError:
+    PREVIEW_MEMORY_BUDGET_BYTES = 64 * 1024 * 1024
+
+PREVIEW_KEEP_ORIGINAL = os.environ.get("EPAPER_PREVIEW_KEEP_ORIGINAL", "").lower() in ("1", "true", "yes")
+
+try:
+    RENDER_WORKERS = max(0, int(os.environ.get("EPAPER_RENDER_WORKERS", "1")))
+except ValueError:
+    RENDER_WORKERS = 1
+
+try:
+    SERVER_PORT = int(os.environ.get("EPAPER_PORT", "5000"))
+except ValueError:
+    SERVER_PORT = 5000
+
+try:
+    WATCH_SCAN_SECONDS = max(5.0, float(os.environ.get("EPAPER_WATCH_SCAN_SECONDS", "60")))
+except ValueError:
+    WATCH_SCAN_SECONDS = 60.0
+
+try:
+    TRACEMALLOC_FRAMES = max(0, min(MAX_TRACEMALLOC_FRAMES, int(os.environ.get("EPAPER_TRACEMALLOC", "0"))))
+except ValueError:
+    TRACEMALLOC_FRAMES = 0
 
 ALLOW_PRIVATE_URLS = os.environ.get("EPAPER_ALLOW_PRIVATE_URLS", "").lower() in (
     "1",
@@ -68,10 +170,17 @@ ALLOW_PRIVATE_URLS = os.environ.get("EPAPER_ALLOW_PRIVATE_URLS", "").lower() in
     "yes",
 )
 
-Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
-
-# One EPD instance, init on first use
+# The epd13in3E module and one EPD instance, both loaded on first use
+_epd_module = None
 _epd = None
+# getbuffer of an uninitialised driver instance (never touches the bus), or
+# _panel_getbuffer where the panel library cannot load
+_frame_packer = None
+# Palette indices the driver's getbuffer produces: the unused duplicate black (4)
+# is never chosen, so a frame with it would not survive a round trip through PNG
+_FRAME_INDICES = frozenset(i for i, rgb in enumerate(PANEL_PALETTE) if PANEL_PALETTE.index(rgb) == i)
+# Bytes whose two nibbles are both such indices
+_FRAME_BYTE_VALUES = bytes(b for b in range(256) if b >> 4 in _FRAME_INDICES and b & 15 in _FRAME_INDICES)
 
 
 @dataclass
@@ -89,6 +198,20 @@ _preview_state = PreviewState()
 _preview_display = None
 _preview_png = None
 _preview_version = 0
+# Bumped for each new source; the JPEG copy for the page is built on first request
+_preview_source_version = 0
+_preview_live_jpeg = None
+# Size of the full-resolution upload kept on disk, when there is one
+_preview_original_size = None
+# Transform requests coalesced into the next preview render: merged changes,
+# one result slot per waiting caller, and whether a caller is rendering.
+_transform_cond = threading.Condition()
+_transform_pending = {}
+_transform_waiters = []
+_transform_rendering = False
+
+_PREVIEW_STORE_DIR = os.path.join(_THIS_DIR, ".preview_store")
+_PREVIEW_ORIGINAL_PATH = os.path.join(_PREVIEW_STORE_DIR, "original")
 
 
 @dataclass
@@ -96,25 +219,430 @@ class RotationItem:
     item_id: str
     filename: str
     created_at: float
+    playlist: str = ""
+
+
+class RotationQueue:
+    """Rotation items in queue order, indexed by item_id.
+
+    Items form a ring linked by ID, so lookup, append, removal and advancing
+    the cursor (the next item to display) are O(1). Positions are only needed
+    for next_index and status listings; they come from an order list that is
+    rebuilt lazily after removals. Items may share a content-addressed file,
+    so references per filename are counted too, as are items per playlist.
+    Playlists share the one cursor: advancing within a playlist skips the
+    items of others. version changes whenever items are added, removed or
+    retagged (not when the cursor moves), so listings can be reused.
+    """
+
+    def __init__(self, items=()):
+        self.version = 0
+        self._items = {}
+        self._refs = {}
+        self._playlists = {}
+        self._prev = {}
+        self._next = {}
+        self._head = None
+        self._cursor = None
+        self._order = []
+        self._positions = {}
+        for item in items:
+            self.append(item)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        item_id = self._head
+        for _ in range(len(self._items)):
+            yield self._items[item_id]
+            item_id = self._next[item_id]
+
+    def get(self, item_id):
+        return self._items.get(item_id)
+
+    @property
+    def cursor_id(self):
+        return self._cursor
+
+    def append(self, item):
+        item_id = item.item_id
+        if item_id in self._items:
+            raise ValueError("Duplicate rotation item")
+        if self._head is None:
+            self._head = self._cursor = item_id
+            self._prev[item_id] = self._next[item_id] = item_id
+        else:
+            tail = self._prev[self._head]
+            self._next[tail] = item_id
+            self._prev[item_id] = tail
+            self._next[item_id] = self._head
+            self._prev[self._head] = item_id
+        self._items[item_id] = item
+        self.version += 1
+        self._refs[item.filename] = self._refs.get(item.filename, 0) + 1
+        self._playlists[item.playlist] = self._playlists.get(item.playlist, 0) + 1
+        if self._order is not None:
+            self._positions[item_id] = len(self._order)
+            self._order.append(item_id)
+
+    def remove(self, item_id):
+        item = self._items.pop(item_id)
+        self.version += 1
+        if self._refs[item.filename] == 1:
+            del self._refs[item.filename]
+        else:
+            self._refs[item.filename] -= 1
+        self._count_playlist(item.playlist, -1)
+        prev_id = self._prev.pop(item_id)
+        next_id = self._next.pop(item_id)
+        if not self._items:
+            self._head = self._cursor = None
+            self._order, self._positions = [], {}
+            return item
+        self._next[prev_id] = next_id
+        self._prev[next_id] = prev_id
+        if self._head == item_id:
+            self._head = next_id
+        if self._cursor == item_id:
+            self._cursor = next_id
+        self._order = None
+        return item
+
+    def refs(self, filename):
+        return self._refs.get(filename, 0)
+
+    def approx_bytes(self):
+        """Rough size of the index structures and items, for memory reports."""
+        size = sum(
+            sys.getsizeof(d)
+            for d in (self._items, self._refs, self._playlists, self._prev, self._next, self._order, self._positions)
+        )
+        for item in self._items.values():
+            size += sys.getsizeof(item) + sys.getsizeof(item.item_id) + sys.getsizeof(item.filename)
+        return size
+
+    def _count_playlist(self, playlist, delta):
+        count = self._playlists.get(playlist, 0) + delta
+        if count:
+            self._playlists[playlist] = count
+        else:
+            self._playlists.pop(playlist, None)
+
+    def has_playlist(self, playlist):
+        """True when playlist has items; "" means the whole queue."""
+        return bool(self._items) if not playlist else playlist in self._playlists
+
+    def set_playlist(self, item_id, playlist):
+        item = self._items[item_id]
+        self.version += 1
+        self._count_playlist(item.playlist, -1)
+        item.playlist = playlist
+        self._count_playlist(playlist, 1)
+
+    def clear(self):
+        self.version += 1
+        self._items.clear()
+        self._refs.clear()
+        self._playlists.clear()
+        self._prev.clear()
+        self._next.clear()
+        self._head = self._cursor = None
+        self._order, self._positions = [], {}
+
+    def peek(self, playlist=""):
+        """The item advance(playlist) would return, without moving the cursor.
+
+        Filtering by playlist walks past other playlists' items, so it costs
+        O(skipped items); the whole queue ("") is O(1).
+        """
+        item_id = self._cursor
+        if item_id is None:
+            return None
+        for _ in range(len(self._items)):
+            item = self._items[item_id]
+            if not playlist or item.playlist == playlist:
+                return item
+            item_id = self._next[item_id]
+        return None
+
+    def advance(self, playlist=""):
+        """Return the next item (in playlist, if given) and move the cursor past it."""
+        item = self.peek(playlist)
+        if item is not None:
+            self._cursor = self._next[item.item_id]
+        return item
+
+    def set_cursor(self, item_id):
+        if item_id in self._items:
+            self._cursor = item_id
+
+    def set_cursor_after(self, item_id):
+        self._cursor = self._next[item_id]
+
+    def _ensure_order(self):
+        if self._order is None:
+            self._order = [item.item_id for item in self]
+            self._positions = {item_id: idx for idx, item_id in enumerate(self._order)}
+
+    def index_of(self, item_id):
+        self._ensure_order()
+        return self._positions[item_id]
+
+    def window(self, offset=0, limit=None, playlist=None, around=None):
+        """(total, offset, [(index, item)]) listing up to limit items from
+        offset in queue order. With playlist only its items are counted and
+        listed; around, a queue index, centres the window on that position
+        instead. Unfiltered windows cost O(limit) once the order list is built.
+        """
+        self._ensure_order()
+        if playlist is None:
+            total = len(self._order)
+            positions = None
+        else:
+            positions = [i for i, item_id in enumerate(self._order) if self._items[item_id].playlist == playlist]
+            total = len(positions)
+        if around is not None:
+            start = around if positions is None else bisect.bisect_left(positions, around)
+            offset = max(0, min(start - (limit or 0) // 2, total - (limit or total)))
+        stop = total if limit is None else min(total, offset + limit)
+        indexes = range(offset, stop) if positions is None else positions[offset:stop]
+        return total, offset, [(i, self._items[self._order[i]]) for i in indexes]
+
+    def seek(self, index):
+        if not self._items:
+            self._cursor = None
+            return
+        self._ensure_order()
+        self._cursor = self._order[int(index) % len(self._order)]
 
 
 @dataclass
 class RotationState:
     enabled: bool = False
     interval_seconds: int = 15 * 60
-    next_index: int = 0
+    align_to_clock: bool = False
     last_switch_ts: float = 0.0
-    items: list = field(default_factory=list)
+    items: RotationQueue = field(default_factory=RotationQueue)
+    watch_dir: str = ""
+    watch_transform: dict = field(default_factory=dict)
+    schedule: list = field(default_factory=list)
+
+    @property
+    def next_index(self):
+        if self.items.cursor_id is None:
+            return 0
+        return self.items.index_of(self.items.cursor_id)
+
+    @next_index.setter
+    def next_index(self, value):
+        self.items.seek(value)
+
+
+class RotationTimetable:
+    """Schedule rules expanded into consecutive local-time segments.
+
+    Each rule's daily windows from a day before `now` to TIMETABLE_DAYS after
+    it are swept in start order through a heap keyed by rule index, so where
+    windows overlap the earlier rule wins. Finding the segment for a
+    timestamp is then a bisect instead of evaluating every rule. Windows are
+    placed with mktime, so they follow DST changes.
+    """
+
+    def __init__(self, rules, now):
+        day_start = time.localtime(now)
+        self.start = now - 24 * 60 * 60
+        self.end = now + TIMETABLE_DAYS * 24 * 60 * 60
+        windows = []
+        for offset in range(-2, TIMETABLE_DAYS + 1):
+            midnight = time.localtime(
+                time.mktime((day_start.tm_year, day_start.tm_mon, day_start.tm_mday + offset, 0, 0, 0, 0, 0, -1))
+            )
+            for index, rule in enumerate(rules):
+                if midnight.tm_wday not in rule["days"]:
+                    continue
+                start_min = _schedule_minutes(rule["start"])
+                end_min = _schedule_minutes(rule["end"])
+                if end_min <= start_min:
+                    end_min += 24 * 60
+                windows.append((self._local(midnight, start_min), self._local(midnight, end_min), index))
+        windows.sort()
+
+        bounds = {self.start, self.end}
+        for start, end, _ in windows:
+            bounds.update(ts for ts in (start, end) if self.start < ts < self.end)
+        self.starts = []
+        self.rules = []
+        active = []  # heap of (rule index, window end)
+        pending = 0
+        for bound in sorted(bounds)[:-1]:
+            while pending < len(windows) and windows[pending][0] <= bound:
+                heapq.heappush(active, (windows[pending][2], windows[pending][1]))
+                pending += 1
+            while active and active[0][1] <= bound:
+                heapq.heappop(active)
+            rule = active[0][0] if active else -1
+            if not self.rules or self.rules[-1] != rule:
+                self.starts.append(bound)
+                self.rules.append(rule)
+
+    @staticmethod
+    def _local(midnight, minutes):
+        hour, minute = divmod(minutes, 60)
+        return time.mktime((midnight.tm_year, midnight.tm_mon, midnight.tm_mday, hour, minute, 0, 0, 0, -1))
+
+    def covers(self, now):
+        """True while now is in the table with at least a week after it."""
+        return self.start <= now and now + 7 * 24 * 60 * 60 <= self.end
+
+    def index(self, ts):
+        return max(0, bisect.bisect_right(self.starts, ts) - 1)
+
+    def segment(self, index):
+        """(start, end, rule index or -1 for the default) of segment index."""
+        end = self.starts[index + 1] if index + 1 < len(self.starts) else self.end
+        return self.starts[index], end, self.rules[index]
+
+    def __len__(self):
+        return len(self.starts)
+
+
+class SystemClock:
+    """Wall clock for the rotation scheduler; simulations inject their own."""
+
+    def time(self):
+        return time.time()
+
+    def wait(self, event, timeout):
+        return event.wait(timeout)
 
 
 _rotation_lock = threading.Lock()
 _rotation_state = RotationState()
+_rotation_clock = SystemClock()
 _rotation_stop = threading.Event()
+_rotation_scheduler = None
 _rotation_thread = None
+_rotation_sync_thread = None
+_rotation_db = None
+_rotation_next_position = 0
+_rotation_settings_dirty = False
+_rotation_unsynced = False
+_rotation_timetable = None
+_watch_lock = threading.Lock()
+_watch_wake = threading.Event()
+_watch_thread = None
+_watch_status = {"files": 0, "last_scan_ts": 0.0, "scan_seconds": None, "error": None}
+
+_events_cond = threading.Condition()
+_events_log = deque(maxlen=EVENT_LOG_SIZE)
+_events_latest = {}
+_events_seq = 0
+_display_job_seq = 0
+_refresh_seconds = DEFAULT_REFRESH_SECONDS
+# Set once rotation state is loaded; API requests wait for it during startup.
+_startup_ready = threading.Event()
+
+# name -> (type, help) in exposition order
+_METRICS = {
+    "epaper_http_requests_total": ("counter", "HTTP requests by route, method and status."),
+    "epaper_http_request_duration_seconds": ("histogram", "HTTP request latency by route (streams excluded)."),
+    "epaper_stage_duration_seconds": (
+        "histogram",
+        "Pipeline stage durations: fetch, decode, transform, format, quantize, spi, refresh, clear.",
+    ),
+    "epaper_display_lock_wait_seconds": ("histogram", "Time display jobs waited for the panel."),
+    "epaper_rotation_switches_total": ("counter", "Rotation items shown by the scheduler."),
+    "epaper_rotation_failures_total": ("counter", "Rotation items the scheduler failed to show."),
+    "epaper_cache_requests_total": ("counter", "Cache lookups by cache and result."),
+    "epaper_render_worker_crashes_total": ("counter", "Render jobs lost to a crashed render worker process."),
+    "epaper_render_worker_timeouts_total": ("counter", "Render jobs abandoned after RENDER_TIMEOUT_SECONDS."),
+    "epaper_preview_transforms_total": ("counter", "Preview transforms, by whether they rendered or were coalesced."),
+    "epaper_preview_renders_abandoned_total": ("counter", "Preview renders discarded for newer transforms."),
+    "epaper_rotation_queue_items": ("gauge", "Items in the rotation queue."),
+    "epaper_process_resident_memory_bytes": ("gauge", "Resident set size of the server process."),
+    "epaper_preview_memory_bytes": ("gauge", "Memory held by the preview source, frame and PNG."),
+}
+_metrics_lock = threading.Lock()
+_metric_counters = {  # (name, labels) -> value
+    ("epaper_rotation_switches_total", ()): 0,
+    ("epaper_rotation_failures_total", ()): 0,
+    ("epaper_render_worker_crashes_total", ()): 0,
+    ("epaper_render_worker_timeouts_total", ()): 0,
+    ("epaper_preview_renders_abandoned_total", ()): 0,
+}
+_metric_histograms = {}  # (name, labels) -> [count per bucket..., +Inf count, sum]
+
+# Render worker pool; jobs run inline until start_render_worker() and in
+# worker processes (import workers, the render worker itself)
+_render_lock = threading.Lock()
+_render_pool = None
+_render_pools_killed = weakref.WeakSet()  # pools stopped after a timeout; their other jobs render inline
+_render_owner_pid = None
+_render_worker_pid = None
+_metric_sink = None  # in the render worker: metric updates handed back with each job
+
+# Memory debugging: tracemalloc is only imported once tracing is turned on
+_memory_debug_lock = threading.Lock()
+_memory_snapshot = None  # (taken_at, snapshot) of the previous report
 
 _ROTATION_STORE_DIR = os.path.join(_THIS_DIR, ".rotation_store")
 _ROTATION_ITEMS_DIR = os.path.join(_ROTATION_STORE_DIR, "items")
+_ROTATION_THUMBS_DIR = os.path.join(_ROTATION_STORE_DIR, "thumbs")
+_ROTATION_FRAMES_DIR = os.path.join(_ROTATION_STORE_DIR, "frames")
 _ROTATION_MANIFEST_PATH = os.path.join(_ROTATION_STORE_DIR, "manifest.json")
+_ROTATION_DB_PATH = os.path.join(_ROTATION_STORE_DIR, "rotation.db")
+_IMPORT_SPOOL_PREFIX = ".import-"
+
+_ROTATION_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    item_id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    position INTEGER NOT NULL,
+    playlist TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS items_position ON items (position);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS watch_files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    item_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS watch_files_item ON watch_files (item_id);
+"""
+
+
+@dataclass
+class FetchCacheEntry:
+    key: str
+    url: str
+    etag: str = ""
+    last_modified: str = ""
+    stored_at: float = 0.0
+    validated_at: float = 0.0
+    max_age: float = 0.0
+    size: int = 0
+    last_used: float = 0.0
+
+
+_FETCH_CACHE_DIR = os.path.join(_THIS_DIR, ".fetch_cache")
+
+_fetch_cache_lock = threading.Lock()
+_fetch_cache_index = None
+_fetch_cache_bytes = 0
+_decoded_cache = OrderedDict()
+_decoded_cache_pixels = 0
+
+# Text rendering shares FreeType faces, so renders are serialized
+_text_lock = threading.Lock()
+_text_font_path = None
+_text_fonts = OrderedDict()  # (path, size) -> font
+_text_renders = OrderedDict()  # (text, font_size, path) -> grayscale canvas
 
 
 def parse_content_length(raw_value):
@@ -156,7 +684,7 @@ def parse_crop(value):
         crop = float(value or "1")
     except (TypeError, ValueError):
         crop = 1.0
-    return max(0.25, min(1.0, crop))
+    return max(MIN_CROP, min(1.0, crop))
 
 
 def parse_font_size(value):
@@ -184,11 +712,84 @@ def parse_interval_seconds(value):
     return interval
 
 
+def parse_playlist(value):
+    playlist = str(value or "").strip()
+    if len(playlist) > MAX_PLAYLIST_NAME_LENGTH:
+        raise ValueError(f"Playlist name too long (max {MAX_PLAYLIST_NAME_LENGTH} characters)")
+    return playlist
+
+
+_SCHEDULE_DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+_SCHEDULE_TIME_RE = re.compile(r"^([01]?\d|2[0-4]):([0-5]\d)$")
+
+
+def _schedule_minutes(value):
+    hour, minute = value.split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def _parse_schedule_time(value, label, allow_midnight_end=False):
+    match = _SCHEDULE_TIME_RE.match(str(value or "").strip())
+    if not match or (int(match.group(1)) == 24 and (not allow_midnight_end or match.group(2) != "00")):
+        raise ValueError(f"Schedule {label} must be HH:MM")
+    return f"{int(match.group(1)):02d}:{match.group(2)}"
+
+
+def _parse_schedule_days(value):
+    if value is None:
+        return list(range(7))
+    if not isinstance(value, list) or not value:
+        raise ValueError("Schedule days must be a non-empty list")
+    days = set()
+    for day in value:
+        if isinstance(day, str) and day.strip().lower()[:3] in _SCHEDULE_DAYS:
+            days.add(_SCHEDULE_DAYS.index(day.strip().lower()[:3]))
+        elif isinstance(day, int) and not isinstance(day, bool) and 0 <= day <= 6:
+            days.add(day)
+        else:
+            raise ValueError("Schedule days are 0-6 (Monday is 0) or mon..sun")
+    return sorted(days)
+
+
+def parse_schedule(rules):
+    """Validate time-of-day rules into their stored form.
+
+    A rule applies from start to end (local time, wrapping past midnight when
+    end is not after start; equal times mean all day) on the given weekdays
+    of its start. Quiet rules stop rotation; others can restrict it to a
+    playlist and override the interval. Earlier rules win where they overlap.
+    """
+    if not isinstance(rules, list):
+        raise ValueError("Schedule must be a list of rules")
+    if len(rules) > MAX_SCHEDULE_RULES:
+        raise ValueError(f"Too many schedule rules (max {MAX_SCHEDULE_RULES})")
+    parsed = []
+    for rule in rules:
+        if not isinstance(rule, dict):
+            raise ValueError("Schedule rules must be objects")
+        quiet = bool(rule.get("quiet", False))
+        interval = rule.get("interval_seconds")
+        parsed.append(
+            {
+                "name": str(rule.get("name") or "").strip()[:MAX_PLAYLIST_NAME_LENGTH],
+                "start": _parse_schedule_time(rule.get("start"), "start"),
+                "end": _parse_schedule_time(rule.get("end"), "end", allow_midnight_end=True),
+                "days": _parse_schedule_days(rule.get("days")),
+                "quiet": quiet,
+                "playlist": "" if quiet else parse_playlist(rule.get("playlist")),
+                "interval_seconds": None if quiet or interval in (None, "") else parse_interval_seconds(interval),
+            }
+        )
+    return parsed
+
+
 def is_truthy(value):
     return str(value or "").strip().lower() in ("1", "on", "true", "yes")
 
 
 def _blocked_ip(ip_text):
+    import ipaddress
+
     ip = ipaddress.ip_address(ip_text)
     if ip.is_loopback or ip.is_link_local or ip.is_multicast or ip.is_reserved or ip.is_unspecified:
         return True
@@ -221,50 +822,599 @@ def validate_remote_url(url):
             raise ValueError("URL host must resolve to a public IP address")
 
 
+def publish_event(kind, data):
+    """Record an event for /api/events subscribers and wake them."""
+    global _events_seq
+    raw = json.dumps(data)
+    with _events_cond:
+        _events_seq += 1
+        event = (_events_seq, kind, raw)
+        _events_log.append(event)
+        _events_latest[kind] = event
+        _events_cond.notify_all()
+
+
+def wait_for_events(last_seq, timeout):
+    """Block until events newer than last_seq exist or timeout passes.
+
+    Returns (events, missed); missed is True when the subscriber fell behind
+    the retained log and should refetch full state.
+    """
+    with _events_cond:
+        _events_cond.wait_for(lambda: _events_seq > last_seq, timeout)
+        if _events_seq <= last_seq:
+            return [], False
+        missed = not _events_log or _events_log[0][0] > last_seq + 1
+        return [e for e in _events_log if e[0] > last_seq], missed
+
+
+def latest_events():
+    """Return (current_seq, latest event per kind) for new subscribers."""
+    with _events_cond:
+        return _events_seq, sorted(_events_latest.values())
+
+
+def _metric_key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def metric_inc(name, amount=1, **labels):
+    if _metric_sink is not None:
+        _metric_sink.append(("inc", name, amount, labels))
+        return
+    key = _metric_key(name, labels)
+    with _metrics_lock:
+        _metric_counters[key] = _metric_counters.get(key, 0) + amount
+
+
+def metric_observe(name, seconds, **labels):
+    if _metric_sink is not None:
+        _metric_sink.append(("observe", name, seconds, labels))
+        return
+    key = _metric_key(name, labels)
+    index = bisect.bisect_left(METRIC_BUCKETS, seconds)
+    with _metrics_lock:
+        buckets = _metric_histograms.get(key)
+        if buckets is None:
+            buckets = _metric_histograms[key] = [0] * (len(METRIC_BUCKETS) + 2)
+        buckets[index] += 1
+        buckets[-1] += seconds
+
+
+@contextmanager
+def metric_timer(name, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metric_observe(name, time.perf_counter() - started, **labels)
+
+
+def _reset_metrics_lock():
+    # Worker pools use a fork server, but anything else that forks this
+    # process would copy a lock held by another thread, never to be released.
+    global _metrics_lock
+    _metrics_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_metrics_lock)
+
+
+def _process_rss_bytes(pid="self"):
+    try:
+        with open(f"/proc/{pid}/statm", "r", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        if pid != "self":
+            return None
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _format_metric_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34)).replace(chr(10), " ")}"'
+        for key, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def render_metrics():
+    """All metrics in the Prometheus text exposition format."""
+    with _rotation_lock:
+        queue_items = len(_rotation_state.items)
+    gauges = {
+        _metric_key("epaper_rotation_queue_items", {}): queue_items,
+        _metric_key("epaper_process_resident_memory_bytes", {}): _process_rss_bytes(),
+        _metric_key("epaper_preview_memory_bytes", {}): get_preview_memory()["used_bytes"],
+    }
+    with _metrics_lock:
+        counters = dict(_metric_counters)
+        histograms = {key: list(buckets) for key, buckets in _metric_histograms.items()}
+
+    lines = []
+    bounds = [f"{bound:g}" for bound in METRIC_BUCKETS] + ["+Inf"]
+    for name, (kind, help_text) in _METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "histogram":
+            for (metric, labels), buckets in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(bounds, buckets):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_metric_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_metric_labels(labels)} {buckets[-1]:.6f}")
+                lines.append(f"{name}_count{_format_metric_labels(labels)} {cumulative}")
+            continue
+        values = gauges if kind == "gauge" else counters
+        for (metric, labels), value in sorted(values.items()):
+            if metric == name:
+                lines.append(f"{name}{_format_metric_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def start_memory_tracing(frames=1):
+    """Start tracemalloc with `frames` frames per allocation; no-op if already tracing."""
+    import tracemalloc
+
+    frames = max(1, min(MAX_TRACEMALLOC_FRAMES, int(frames)))
+    with _memory_debug_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            print(f"[memory] tracing allocations ({frames} frame(s))")
+
+
+def stop_memory_tracing():
+    global _memory_snapshot
+    if "tracemalloc" not in sys.modules:
+        return
+    import tracemalloc
+
+    with _memory_debug_lock:
+        tracemalloc.stop()
+        _memory_snapshot = None
+
+
+def _memory_stat(stat, diff=False):
+    # Most recent call first; file:line only, reading source lines would allocate.
+    row = {"where": [f"{frame.filename}:{frame.lineno}" for frame in reversed(stat.traceback)], "size_bytes": stat.size}
+    if diff:
+        row.update(size_diff_bytes=stat.size_diff, count_diff=stat.count_diff)
+    else:
+        row["count"] = stat.count
+    return row
+
+
+def _tracemalloc_report(top, group):
+    """Top allocation sites and the change since the previous report."""
+    global _memory_snapshot
+    import tracemalloc
+
+    with _memory_debug_lock:
+        if not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            )
+        )
+        traced, peak = tracemalloc.get_traced_memory()
+        previous, _memory_snapshot = _memory_snapshot, (time.time(), snapshot)
+    report = {
+        "frames": tracemalloc.get_traceback_limit(),
+        "traced_bytes": traced,
+        "peak_bytes": peak,
+        "overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+        "top": [_memory_stat(stat) for stat in snapshot.statistics(group)[:top]],
+        "diff_since": None,
+        "diff": [],
+    }
+    if previous is not None:
+        report["diff_since"] = previous[0]
+        changes = [stat for stat in snapshot.compare_to(previous[1], group) if stat.size_diff]
+        changes.sort(key=lambda stat: abs(stat.size_diff), reverse=True)
+        report["diff"] = [_memory_stat(stat, diff=True) for stat in changes[:top]]
+    return report
+
+
+def _image_cache_bytes(images):
+    return sum(_image_bytes(image) for image in images)
+
+
+def get_memory_report(top=MEMORY_REPORT_TOP, group="lineno"):
+    """Sizes of the long-lived in-memory structures, plus tracemalloc
+    statistics when tracing is on. Each call with tracing replaces the
+    snapshot the next call's diff is computed against."""
+    top = max(1, min(MAX_MEMORY_REPORT_TOP, int(top)))
+    if group not in ("lineno", "filename", "traceback"):
+        raise ValueError("group must be lineno, filename or traceback")
+
+    with _fetch_cache_lock:
+        decoded = {"entries": len(_decoded_cache), "bytes": _image_cache_bytes(_decoded_cache.values())}
+        fetch = {"entries": len(_fetch_cache_index or {}), "disk_bytes": _fetch_cache_bytes}
+    with _text_lock:
+        text_renders = {"entries": len(_text_renders), "bytes": _image_cache_bytes(_text_renders.values())}
+        text_fonts = {"entries": len(_text_fonts)}
+    with _events_cond:
+        events = {"entries": len(_events_log), "bytes": sum(len(raw) for _, _, raw in _events_log)}
+    with _rotation_lock:
+        queue = {"items": len(_rotation_state.items), "bytes": _rotation_state.items.approx_bytes()}
+        timetable = {"segments": len(_rotation_timetable) if _rotation_timetable is not None else 0}
+    prepared = getattr(_rotation_scheduler, "_prepared", None)
+    worker_pid = _render_worker_pid if _render_pool is not None else None
+    report = {
+        "rss_bytes": _process_rss_bytes(),
+        "render_worker": {
+            "pid": worker_pid,
+            "rss_bytes": _process_rss_bytes(worker_pid) if worker_pid else None,
+        },
+        "preview": get_preview_memory(),
+        "caches": {
+            "decoded_images": decoded,
+            "fetch_index": fetch,
+            "text_renders": text_renders,
+            "text_fonts": text_fonts,
+            "events": events,
+            "rotation_queue": queue,
+            "rotation_prepared_frame": {"bytes": len(prepared[1] or b"") if prepared else 0},
+            "rotation_timetable": timetable,
+            "pages": {"entries": len(_encoded_pages), "bytes": sum(len(raw) for raw in _encoded_pages.values())},
+        },
+        "tracing": False,
+        "tracemalloc": None,
+    }
+    if "tracemalloc" in sys.modules:
+        report["tracemalloc"] = _tracemalloc_report(top, group)
+        report["tracing"] = report["tracemalloc"] is not None
+    return report
+
+
+def _import_pil():
+    """Import Pillow and apply the decode size limit; returns PIL.Image."""
+    from PIL import Image
+
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    return Image
+
+
+def epd_driver():
+    """The Waveshare epd13in3E module, imported on first use."""
+    global _epd_module
+    if _epd_module is None:
+        import epd13in3E
+
+        _epd_module = epd13in3E
+    return _epd_module
+
+
 def get_epd():
     global _epd
     if _epd is None:
-        _epd = epd13in3E.EPD()
+        _epd = epd_driver().EPD()
         _epd.Init()
     return _epd
 
 
-def fetch_image(url):
+def _fetch_cache_key(url):
+    import hashlib
+
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+
+def _fetch_cache_paths(key):
+    base = os.path.join(_FETCH_CACHE_DIR, key)
+    return base + ".body", base + ".json"
+
+
+def _load_fetch_cache_index_locked():
+    global _fetch_cache_index, _fetch_cache_bytes
+    if _fetch_cache_index is not None:
+        return
+    _fetch_cache_index = {}
+    _fetch_cache_bytes = 0
+    try:
+        names = os.listdir(_FETCH_CACHE_DIR)
+    except OSError:
+        return
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        body_path, meta_path = _fetch_cache_paths(name[:-5])
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            entry = FetchCacheEntry(**meta)
+            entry.last_used = os.stat(body_path).st_mtime
+        except (OSError, TypeError, ValueError):
+            continue
+        _fetch_cache_index[entry.key] = entry
+        _fetch_cache_bytes += entry.size
+
+
+def _drop_fetch_cache_entry_locked(entry):
+    global _fetch_cache_bytes
+    if _fetch_cache_index.pop(entry.key, None) is not None:
+        _fetch_cache_bytes -= entry.size
+    for path in _fetch_cache_paths(entry.key):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _write_fetch_cache_meta(entry):
+    _, meta_path = _fetch_cache_paths(entry.key)
+    meta = {k: v for k, v in entry.__dict__.items() if k != "last_used"}
+    tmp_path = meta_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def _store_fetch_cache_entry(entry, body):
+    """Write a fetched body to the cache, evicting least recently used entries."""
+    global _fetch_cache_bytes
+    if entry.size > FETCH_CACHE_MAX_BYTES:
+        return
+    with _fetch_cache_lock:
+        _load_fetch_cache_index_locked()
+        old = _fetch_cache_index.get(entry.key)
+        if old is not None:
+            _drop_fetch_cache_entry_locked(old)
+        victims = sorted(_fetch_cache_index.values(), key=lambda e: e.last_used)
+        while victims and _fetch_cache_bytes + entry.size > FETCH_CACHE_MAX_BYTES:
+            _drop_fetch_cache_entry_locked(victims.pop(0))
+        try:
+            os.makedirs(_FETCH_CACHE_DIR, exist_ok=True)
+            body_path, _ = _fetch_cache_paths(entry.key)
+            tmp_path = body_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, body_path)
+            _write_fetch_cache_meta(entry)
+        except OSError as e:
+            print(f"[fetch-cache] failed to store {entry.url}: {e}")
+            _drop_fetch_cache_entry_locked(entry)
+            return
+        _fetch_cache_index[entry.key] = entry
+        _fetch_cache_bytes += entry.size
+
+
+def _read_fetch_cache_body(entry):
+    body_path, _ = _fetch_cache_paths(entry.key)
+    try:
+        with open(body_path, "rb") as f:
+            data = f.read()
+        os.utime(body_path)
+    except OSError:
+        return None
+    if len(data) != entry.size:
+        return None
+    return data
+
+
+def _freshness_seconds(headers, now):
+    """Freshness lifetime from Cache-Control/Expires, else the RFC 7234 heuristic."""
+    from email.utils import parsedate_to_datetime
+
+    directives = {}
+    for part in (headers.get("Cache-Control") or "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name] = value.strip('"')
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    if "max-age" in directives:
+        try:
+            return max(0.0, float(directives["max-age"]))
+        except ValueError:
+            return 0.0
+
+    def _http_date(name):
+        try:
+            return parsedate_to_datetime(headers.get(name)).timestamp()
+        except (TypeError, ValueError, IndexError):
+            return None
+
+    expires = _http_date("Expires")
+    if expires is not None:
+        return max(0.0, expires - now)
+    last_modified = _http_date("Last-Modified")
+    if last_modified is not None:
+        return min(FETCH_CACHE_MAX_HEURISTIC_SECONDS, max(0.0, (now - last_modified) * 0.1))
+    return 0.0
+
+
+def _read_limited_response(response):
+    header_len = response.headers.get("Content-Length")
+    if header_len:
+        try:
+            declared_len = int(header_len)
+        except ValueError as e:
+            raise ValueError("Invalid response Content-Length") from e
+        if declared_len > MAX_FETCH_BYTES:
+            raise ValueError("Remote image is too large")
+
+    chunks = []
+    total = 0
+    while True:
+        chunk = response.read(65536)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > MAX_FETCH_BYTES:
+            raise ValueError("Remote image is too large")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _fetch_cached(url):
+    """Fetch url through the on-disk cache.
+
+    Returns (entry, body). body is None when the cached copy is still valid,
+    so callers holding a decoded image can skip reading it back from disk.
+    entry is None when the response was not cacheable.
+    """
+    import urllib.error
     import urllib.request
 
+    # Checked before the cache so an address that became disallowed is not served from it.
     validate_remote_url(url)
-    req = urllib.request.Request(url, headers={"User-Agent": "e-Paper/2.0"})
-    with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT_SECONDS) as response:
-        header_len = response.headers.get("Content-Length")
-        if header_len:
-            try:
-                declared_len = int(header_len)
-            except ValueError as e:
-                raise ValueError("Invalid response Content-Length") from e
-            if declared_len > MAX_FETCH_BYTES:
-                raise ValueError("Remote image is too large")
+    key = _fetch_cache_key(url)
+    headers = {"User-Agent": "e-Paper/2.0"}
+    now = time.time()
+    with _fetch_cache_lock:
+        _load_fetch_cache_index_locked()
+        entry = _fetch_cache_index.get(key)
+        if entry is not None:
+            entry.last_used = now
+            if now - entry.validated_at < entry.max_age:
+                metric_inc("epaper_cache_requests_total", cache="fetch", result="hit")
+                return entry, None
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with metric_timer("epaper_stage_duration_seconds", stage="fetch"):
+            with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT_SECONDS) as response:
+                body = _read_limited_response(response)
+                response_headers = response.headers
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or entry is None:
+            raise
+        metric_inc("epaper_cache_requests_total", cache="fetch", result="revalidated")
+        max_age = _freshness_seconds(e.headers, now)
+        with _fetch_cache_lock:
+            entry.validated_at = now
+            entry.max_age = max_age or 0.0
+            # Evicted while revalidating: the body is gone, so do not resurrect its metadata.
+            if _fetch_cache_index.get(key) is entry:
+                try:
+                    _write_fetch_cache_meta(entry)
+                except OSError:
+                    pass
+        return entry, None
+
+    metric_inc("epaper_cache_requests_total", cache="fetch", result="miss")
+    max_age = _freshness_seconds(response_headers, now)
+    if max_age is None:
+        if entry is not None:
+            with _fetch_cache_lock:
+                _drop_fetch_cache_entry_locked(entry)
+        return None, body
+    new_entry = FetchCacheEntry(
+        key=key,
+        url=url,
+        etag=response_headers.get("ETag") or "",
+        last_modified=response_headers.get("Last-Modified") or "",
+        stored_at=now,
+        validated_at=now,
+        max_age=max_age,
+        size=len(body),
+        last_used=now,
+    )
+    _store_fetch_cache_entry(new_entry, body)
+    return new_entry, body
+
+
+def fetch_image(url):
+    entry, body = _fetch_cached(url)
+    if body is None:
+        body = _read_fetch_cache_body(entry)
+        if body is None:
+            with _fetch_cache_lock:
+                _drop_fetch_cache_entry_locked(entry)
+            entry, body = _fetch_cached(url)
+    return body
+
+
+def _decoded_cache_get(token):
+    with _fetch_cache_lock:
+        image = _decoded_cache.get(token)
+        if image is not None:
+            _decoded_cache.move_to_end(token)
+        return image
+
+
+def _decoded_cache_put(token, image):
+    global _decoded_cache_pixels
+    pixels = image.width * image.height
+    if pixels > FETCH_DECODED_CACHE_MAX_PIXELS:
+        return
+    with _fetch_cache_lock:
+        stale = [t for t in _decoded_cache if t[0] == token[0]]
+        for t in stale:
+            old = _decoded_cache.pop(t)
+            _decoded_cache_pixels -= old.width * old.height
+        while _decoded_cache and _decoded_cache_pixels + pixels > FETCH_DECODED_CACHE_MAX_PIXELS:
+            _, old = _decoded_cache.popitem(last=False)
+            _decoded_cache_pixels -= old.width * old.height
+        _decoded_cache[token] = image
+        _decoded_cache_pixels += pixels
+
+
+def load_image_from_url(url, max_pixels=None, decode=None):
+    """Fetch and decode url, reusing a recently decoded copy when still valid.
+
+    max_pixels is passed on to load_image_from_bytes; decode, if given,
+    replaces it and must give the same result for the same max_pixels. The
+    returned image may be shared with the cache and must not be modified.
+    """
+    if decode is None:
+
+        def decode(body):
+            return load_image_from_bytes(body, max_pixels)
+
+    entry, body = _fetch_cached(url)
+    if entry is None:
+        return decode(body)
+
+    token = (entry.key, entry.stored_at, entry.size, max_pixels)
+    image = _decoded_cache_get(token)
+    if image is not None:
+        metric_inc("epaper_cache_requests_total", cache="decoded", result="hit")
+        return image
+    metric_inc("epaper_cache_requests_total", cache="decoded", result="miss")
+    if body is None:
+        body = _read_fetch_cache_body(entry)
+        if body is None:
+            return decode(fetch_image(url))
+    image = decode(body)
+    _decoded_cache_put(token, image)
+    return image
 
-        chunks = []
-        total = 0
-        while True:
-            chunk = response.read(65536)
-            if not chunk:
-                break
-            total += len(chunk)
-            if total > MAX_FETCH_BYTES:
-                raise ValueError("Remote image is too large")
-            chunks.append(chunk)
-        return b"".join(chunks)
 
+def load_image_from_bytes(data, max_pixels=None):
+    """Decode data; with max_pixels, JPEGs are decoded at a reduced scale
+    that still has at least that many pixels, which is much faster and
+    smaller than decoding in full and scaling down afterwards."""
+    from PIL import UnidentifiedImageError
 
-def load_image_from_bytes(data):
     if not data:
         raise ValueError("No image data provided")
+    Image = _import_pil()
     try:
-        image = Image.open(io.BytesIO(data))
-        if image.width * image.height > MAX_IMAGE_PIXELS:
-            raise ValueError("Image is too large")
-        image.load()
+        with metric_timer("epaper_stage_duration_seconds", stage="decode"):
+            image = Image.open(io.BytesIO(data))
+            if image.width * image.height > MAX_IMAGE_PIXELS:
+                raise ValueError("Image is too large")
+            if max_pixels:
+                target = _scaled_size(image.size, max_pixels)
+                if target != image.size:
+                    image.draft(None, target)
+            image.load()
     except UnidentifiedImageError as e:
         raise ValueError("Invalid image format") from e
     except (Image.DecompressionBombError, OSError) as e:
@@ -274,6 +1424,8 @@ def load_image_from_bytes(data):
 
 def apply_transform(image, rotation=0, crop=1.0, fill=False, target_aspect=DISPLAY_ASPECT):
     """Apply rotation (degrees CW), then center crop or fill crop to display ratio."""
+    from PIL import Image
+
     if rotation and rotation % 360 != 0:
         image = image.rotate(-rotation, expand=True, resample=Image.Resampling.BICUBIC)
 
@@ -298,27 +1450,160 @@ def apply_transform(image, rotation=0, crop=1.0, fill=False, target_aspect=DISPL
 
 
 def format_for_display(image):
-    if image.mode != "RGB":
-        image = image.convert("RGB")
-    w, h = image.size
-    scale = min(EPD_WIDTH / w, EPD_HEIGHT / h)
-    new_w = max(1, int(w * scale))
-    new_h = max(1, int(h * scale))
-    image = image.resize((new_w, new_h), Image.Resampling.LANCZOS)
-    canvas = Image.new("RGB", (EPD_WIDTH, EPD_HEIGHT), (255, 255, 255))
-    canvas.paste(image, ((EPD_WIDTH - new_w) // 2, (EPD_HEIGHT - new_h) // 2))
-    return canvas
+    from PIL import Image
 
+    with metric_timer("epaper_stage_duration_seconds", stage="format"):
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        w, h = image.size
+        scale = min(EPD_WIDTH / w, EPD_HEIGHT / h)
+        new_w = max(1, int(w * scale))
+        new_h = max(1, int(h * scale))
+        image = image.resize((new_w, new_h), Image.Resampling.LANCZOS)
+        canvas = Image.new("RGB", (EPD_WIDTH, EPD_HEIGHT), (255, 255, 255))
+        canvas.paste(image, ((EPD_WIDTH - new_w) // 2, (EPD_HEIGHT - new_h) // 2))
+        return canvas
 
-def show_image_on_epd(image):
-    epd = get_epd()
+
+def prepare_frame(image):
+    """Format and pack image into the panel buffer without touching the hardware."""
+    return render_image(image, ("frame",))["frame"]
+
+
+def _pack_frame(image):
+    global _frame_packer
+    if _frame_packer is None:
+        try:
+            _frame_packer = epd_driver().EPD().getbuffer
+        except (ImportError, OSError) as e:
+            # Not on the Pi, e.g. `render` on a workstation.
+            print(f"[frame] panel library unavailable ({e}); packing without it")
+            _frame_packer = _panel_getbuffer
     formatted = format_for_display(image)
-    epd.display(epd.getbuffer(formatted))
+    with metric_timer("epaper_stage_duration_seconds", stage="quantize"):
+        return _frame_packer(formatted)
 
 
-def clear_epd():
+def _panel_getbuffer(image):
+    """The driver's getbuffer for a panel-sized image, without its library:
+    quantize to the panel palette and pack two indices per byte."""
+    from PIL import Image
+
+    palette = Image.new("P", (1, 1))
+    palette.putpalette([v for rgb in PANEL_PALETTE for v in rgb] + [0, 0, 0] * (256 - len(PANEL_PALETTE)))
+    return image.convert("RGB").quantize(palette=palette).tobytes("raw", "P;4")
+
+
+def validate_frame(frame):
+    """Raise ValueError unless frame is a packed panel frame."""
+    if len(frame) != FRAME_BYTES:
+        raise ValueError(f"Frame must be {FRAME_BYTES} bytes, got {len(frame)}")
+    if frame.translate(None, _FRAME_BYTE_VALUES):
+        raise ValueError("Frame has pixels outside the panel palette")
+
+
+def encode_epd_file(frame):
+    import hashlib
+
+    return EPD_FILE_MAGIC + hashlib.sha256(frame).digest() + frame
+
+
+def decode_epd_file(data):
+    """Check an .epd file's header and checksum; returns (frame, sha256 hex)."""
+    import hashlib
+
+    header = len(EPD_FILE_MAGIC) + 32
+    if not data.startswith(EPD_FILE_MAGIC):
+        raise ValueError("Not an .epd frame file")
+    frame = data[header:]
+    validate_frame(frame)
+    digest = hashlib.sha256(frame)
+    if digest.digest() != data[len(EPD_FILE_MAGIC) : header]:
+        raise ValueError("Frame checksum mismatch")
+    return frame, digest.hexdigest()
+
+
+def parse_raw_frame(data, checksum=None):
+    """Frame and its SHA-256 hex from a request body holding an .epd file or
+    a bare packed frame, whose SHA-256 hex checksum is then required."""
+    import hashlib
+
+    if len(data) != FRAME_BYTES:
+        if not data.startswith(EPD_FILE_MAGIC):
+            raise ValueError(f"Body must be a {FRAME_BYTES}-byte frame or an .epd file, got {len(data)} bytes")
+        return decode_epd_file(data)
+    if not checksum:
+        raise ValueError("A bare frame needs its SHA-256 in the X-Frame-SHA256 header")
+    validate_frame(data)
+    digest = hashlib.sha256(data).hexdigest()
+    if digest != checksum.strip().lower():
+        raise ValueError("Frame checksum mismatch")
+    return data, digest
+
+
+def _frame_png(frame):
+    """PNG of a packed frame in the panel palette, i.e. as the panel shows it."""
+    from PIL import Image
+
+    image = Image.frombytes("P", (EPD_WIDTH, EPD_HEIGHT), frame, "raw", "P;4")
+    image.putpalette([v for rgb in PANEL_PALETTE for v in rgb])
+    buf = io.BytesIO()
+    image.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def show_image_on_epd(image):
+    get_epd().display(prepare_frame(image))
+
+
+def run_display_job(image, source, item_id=None, frame=None):
+    """Show image (or a prepared frame) under the display lock, publishing progress events.
+
+    With neither image nor frame the panel is cleared.
+    """
+    global _display_job_seq, _refresh_seconds
+    job = {"source": source, "item_id": item_id}
+    with _events_cond:
+        _display_job_seq += 1
+        job["job"] = _display_job_seq
+    publish_event("display", dict(job, state="queued"))
+    queued = time.perf_counter()
     with _display_lock:
-        get_epd().Clear()
+        metric_observe("epaper_display_lock_wait_seconds", time.perf_counter() - queued)
+        publish_event("display", dict(job, state="started"))
+        started = time.time()
+        try:
+            epd = get_epd()
+            if image is None and frame is None:
+                with metric_timer("epaper_stage_duration_seconds", stage="clear"):
+                    epd.Clear()
+            else:
+                if frame is None:
+                    frame = prepare_frame(image)
+                sent = time.time()
+                with metric_timer("epaper_stage_duration_seconds", stage="spi"):
+                    epd.SendFrame(frame)
+                with metric_timer("epaper_stage_duration_seconds", stage="refresh"):
+                    epd.TurnOnDisplay()
+                # Track how long SPI + refresh takes so the schedule can
+                # report when a frame actually appears.
+                _refresh_seconds = 0.7 * _refresh_seconds + 0.3 * (time.time() - sent)
+        except Exception as e:
+            publish_event("display", dict(job, state="failed", error=str(e)))
+            raise
+        publish_event(
+            "display",
+            dict(job, state="done", duration_seconds=round(time.time() - started, 2)),
+        )
+
+
+def clear_epd():
+    run_display_job(None, "clear")
+
+
+def display_raw_frame(frame):
+    """Send a validated packed frame to the panel as is."""
+    run_display_job(None, "raw", frame=frame)
 
 
 def _text_size(draw, s, font):
@@ -326,58 +1611,107 @@ def _text_size(draw, s, font):
     return bbox[2] - bbox[0], bbox[3] - bbox[1]
 
 
-def _load_text_font(font_size):
-    try:
-        return ImageFont.truetype(
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", font_size
-        )
-    except (OSError, IOError):
-        try:
-            return ImageFont.truetype(
-                "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-                font_size,
-            )
-        except (OSError, IOError):
-            return ImageFont.load_default()
+def _text_font_path_locked():
+    """First of TEXT_FONT_PATHS that loads, found once; "" means Pillow's default font."""
+    from PIL import ImageFont
 
-
-def _wrap_text_lines(draw, text, font, max_w):
+    global _text_font_path
+    if _text_font_path is None:
+        _text_font_path = ""
+        for path in TEXT_FONT_PATHS:
+            try:
+                ImageFont.truetype(path, 12)
+            except OSError:
+                continue
+            _text_font_path = path
+            break
+    return _text_font_path
+
+
+def _text_font_locked(font_size):
+    """Font for font_size, kept in a small LRU so the TTF is not re-read per size probe."""
+    from PIL import ImageFont
+
+    key = (_text_font_path_locked(), font_size)
+    font = _text_fonts.get(key)
+    if font is not None:
+        _text_fonts.move_to_end(key)
+        return font
+    font = ImageFont.truetype(*key) if key[0] else ImageFont.load_default()
+    _text_fonts[key] = font
+    while len(_text_fonts) > TEXT_FONT_CACHE_SIZE:
+        _text_fonts.popitem(last=False)
+    return font
+
+
+def _text_width_table(font):
+    """width(s) -> font.getlength(s), measured once per distinct string."""
+    widths = {}
+
+    def width(s):
+        w = widths.get(s)
+        if w is None:
+            w = widths[s] = font.getlength(s)
+        return w
+
+    return width
+
+
+def _split_long_word(word, width, max_w):
+    """Hard-wrap a token wider than max_w into chunks, by cumulative character width."""
+    cumulative = []
+    total = 0.0
+    for ch in word:
+        total += width(ch)
+        cumulative.append(total)
+    chunks = []
+    start = 0
+    offset = 0.0
+    while start < len(word):
+        # Longest chunk that fits; always at least one character.
+        end = max(start + 1, bisect.bisect_right(cumulative, offset + max_w, start))
+        chunks.append(word[start:end])
+        offset = cumulative[end - 1]
+        start = end
+    return chunks
+
+
+def _wrap_text_lines(text, width, max_w, max_lines=None):
+    """Greedy word wrap on summed advances, where width(s) is the advance of a word,
+    a character or the space. Returns early once more than max_lines lines exist."""
     lines = []
     paragraphs = (text or "").strip().split("\n")
-    if not paragraphs:
-        return [""]
+    space_w = width(" ")
 
     for pidx, para in enumerate(paragraphs):
+        if max_lines is not None and len(lines) > max_lines:
+            return lines
         words = para.split()
         if not words:
             lines.append("")
             continue
 
         current = []
+        current_w = 0.0
         for word in words:
-            trial = " ".join(current + [word]) if current else word
-            trial_w, _ = _text_size(draw, trial, font)
-            if trial_w <= max_w or not current:
-                if trial_w <= max_w:
-                    current.append(word)
-                    continue
-
+            word_w = width(word)
+            if word_w > max_w:
                 # Single long token: hard-wrap by characters.
-                chunk = ""
-                for ch in word:
-                    test = chunk + ch
-                    test_w, _ = _text_size(draw, test, font)
-                    if test_w > max_w and chunk:
-                        lines.append(chunk)
-                        chunk = ch
-                    else:
-                        chunk = test
-                if chunk:
-                    lines.append(chunk)
-                current = []
+                if current:
+                    lines.append(" ".join(current))
+                    current = []
+                lines.extend(_split_long_word(word, width, max_w))
+                continue
+            trial_w = current_w + space_w + word_w if current else word_w
+            if trial_w <= max_w:
+                current.append(word)
+                current_w = trial_w
             else:
                 lines.append(" ".join(current))
                 current = [word]
+                current_w = word_w
+                if max_lines is not None and len(lines) > max_lines:
+                    return lines
 
         if current:
             lines.append(" ".join(current))
@@ -388,80 +1722,121 @@ def _wrap_text_lines(draw, text, font, max_w):
     return lines if lines else [""]
 
 
-def _fits_text(text, font_size, max_w, max_h):
-    scratch = Image.new("RGB", (8, 8), (255, 255, 255))
-    draw = ImageDraw.Draw(scratch)
-    font = _load_text_font(font_size)
-    lines = _wrap_text_lines(draw, text, font, max_w)
+def _fits_text_locked(text, font_size, max_w, max_h, width=None, stop_early=True):
+    """Lay out text at font_size. width defaults to exact measurement with that font."""
+    font = _text_font_locked(font_size)
     ascent, descent = font.getmetrics()
     line_height = max(1, ascent + descent + max(2, int(font_size * 0.15)))
+    # A probe can stop wrapping as soon as it is known not to fit.
+    max_lines = max_h // line_height if stop_early else None
+    lines = _wrap_text_lines(text, width or _text_width_table(font), max_w, max_lines=max_lines)
     total_h = len(lines) * line_height
     return total_h <= max_h, lines, font, line_height
 
 
 def render_text_to_image(text, font_size=72):
-    canvas = Image.new("RGB", (EPD_WIDTH, EPD_HEIGHT), (255, 255, 255))
+    """Render text centred, as large as fits the panel. The last few renders are
+    kept (as grayscale) so repeated text sources return without re-layout."""
+    key = (text, int(font_size))
+    with _text_lock:
+        key += (_text_font_path_locked(),)
+        canvas = _text_renders.get(key)
+        if canvas is not None:
+            _text_renders.move_to_end(key)
+            metric_inc("epaper_cache_requests_total", cache="text", result="hit")
+        else:
+            metric_inc("epaper_cache_requests_total", cache="text", result="miss")
+            canvas = _render_text_locked(text, int(font_size))
+            _text_renders[key] = canvas
+            while len(_text_renders) > TEXT_RENDER_CACHE_SIZE:
+                _text_renders.popitem(last=False)
+    return canvas.convert("RGB")
+
+
+def _render_text_locked(text, font_size):
+    from PIL import Image, ImageDraw
+
+    # Black text on white: grayscale renders the same pixels at a third of the size.
+    canvas = Image.new("L", (EPD_WIDTH, EPD_HEIGHT), 255)
     draw = ImageDraw.Draw(canvas)
     max_w = EPD_WIDTH - 80
     max_h = EPD_HEIGHT - 80
 
-    # Choose the largest font size that fits the whole panel.
+    # Choose the largest font size that fits the whole panel. Probes scale word
+    # widths measured once at TEXT_MEASURE_SIZE; only the chosen size is measured
+    # exactly, stepping down if hinting made the estimate slightly optimistic.
+    reference = _text_width_table(_text_font_locked(TEXT_MEASURE_SIZE))
     lo = 12
     hi = max(12, min(420, int(font_size) * 5))
     best_size = lo
-    best_layout = None
     while lo <= hi:
         mid = (lo + hi) // 2
-        fits, lines, font, line_height = _fits_text(text, mid, max_w, max_h)
+        scale = mid / TEXT_MEASURE_SIZE
+        fits = _fits_text_locked(text, mid, max_w, max_h, width=lambda s: reference(s) * scale)[0]
         if fits:
             best_size = mid
-            best_layout = (lines, font, line_height)
             lo = mid + 1
         else:
             hi = mid - 1
 
-    if best_layout is None:
-        _, lines, font, line_height = _fits_text(text, 12, max_w, max_h)
-    else:
-        lines, font, line_height = best_layout
+    size = best_size
+    while True:
+        fits, lines, font, line_height = _fits_text_locked(text, size, max_w, max_h, stop_early=size > 12)
+        if fits or size <= 12:
+            break
+        size -= 1
 
     total_h = len(lines) * line_height
     y = (EPD_HEIGHT - total_h) // 2
     for line in lines:
-        line_w, _ = _text_size(draw, line, font)
-        x = (EPD_WIDTH - line_w) // 2
-        draw.text((x, y), line, fill=(0, 0, 0), font=font)
+        # Text too long even at the smallest size overflows; skip what is off the panel.
+        if 0 < y + line_height and y < EPD_HEIGHT:
+            line_w, _ = _text_size(draw, line, font)
+            x = (EPD_WIDTH - line_w) // 2
+            draw.text((x, y), line, fill=0, font=font)
         y += line_height
 
     return canvas
 
 
-def parse_multipart_form(rfile, content_type, content_length):
-    """Parse multipart/form-data. Returns (photo_bytes or None, fields_dict)."""
+def _multipart_boundary(content_type):
+    """The part delimiter from a multipart Content-Type, or None."""
     m = re.search(
         r'boundary=(?:"([^"]+)"|([^;\s]+))',
         content_type,
         flags=re.IGNORECASE,
     )
     if not m:
-        return None, {}
+        return None
 
     boundary_token = (m.group(1) or m.group(2) or "").strip()
     if not boundary_token:
-        return None, {}
+        return None
 
-    boundary = boundary_token.encode("latin-1")
-    if not boundary.startswith(b"--"):
-        boundary = b"--" + boundary
+    # The delimiter is always "--" plus the token, even when the token itself
+    # starts with dashes (as curl's do).
+    return b"--" + boundary_token.encode("latin-1")
 
-    length = parse_content_length(content_length)
-    body = read_limited_body(rfile, length, MAX_UPLOAD_BYTES)
 
-    parts = body.split(boundary)
-    photo = None
-    fields = {}
+def _multipart_part_names(head):
+    """(name, filename or None) from a part's headers; name is None when missing."""
+    name_m = re.search(rb'\bname=["\']([^"\']+)["\']', head)
+    filename_m = re.search(rb'filename=["\']([^"\']*)["\']', head)
+    filename = filename_m.group(1).decode("utf-8", errors="replace") if filename_m else None
+    return (name_m.group(1).decode("latin-1") if name_m else None), filename
+
+
+def read_multipart_parts(rfile, content_type, content_length, max_bytes=MAX_UPLOAD_BYTES):
+    """Read a multipart/form-data body. Returns [(name, filename or None, payload)]."""
+    boundary = _multipart_boundary(content_type)
+    if boundary is None:
+        return []
 
-    for part in parts:
+    length = parse_content_length(content_length)
+    body = read_limited_body(rfile, length, max_bytes)
+
+    parts = []
+    for part in body.split(boundary):
         part = part.strip(b"\r\n")
         if not part or part == b"--":
             continue
@@ -469,12 +1844,108 @@ def parse_multipart_form(rfile, content_type, content_length):
         head, _, payload = part.partition(b"\r\n\r\n")
         payload = payload.rstrip(b"\r\n")
 
-        name_m = re.search(rb'name=["\']([^"\']+)["\']', head)
-        if not name_m:
+        name, filename = _multipart_part_names(head)
+        if name is None:
             continue
+        parts.append((name, filename, payload))
+
+    return parts
+
+
+def spool_multipart_parts(rfile, content_type, content_length, spool_dir, max_bytes=MAX_IMPORT_BYTES):
+    """Read a multipart/form-data body, writing file parts to spool_dir as
+    they arrive instead of holding the body in memory.
+
+    Returns [(name, filename or None, value)]: value is the spooled file's
+    path for file parts and the payload bytes for other fields.
+    """
+    boundary = _multipart_boundary(content_type)
+    if boundary is None:
+        return []
+    length = parse_content_length(content_length)
+    if length > max_bytes:
+        raise ValueError("Request body is too large")
+
+    remaining = length
+    # Every delimiter, the first included, is matched as CRLF + boundary.
+    delimiter = b"\r\n" + boundary
+    keep = len(delimiter) - 1
+    buf = b"\r\n"
+    parts = []
+    file_count = 0
+
+    def fill():
+        nonlocal buf, remaining
+        chunk = rfile.read(min(65536, remaining)) if remaining > 0 else b""
+        if not chunk:
+            raise ValueError("Unexpected end of request body")
+        remaining -= len(chunk)
+        buf += chunk
+
+    try:
+        index = buf.find(delimiter)
+        while index < 0:
+            buf = buf[-keep:]
+            fill()
+            index = buf.find(delimiter)
+        buf = buf[index + len(delimiter) :]
+
+        while True:
+            while len(buf) < 2:
+                fill()
+            if buf.startswith(b"--"):
+                break
+            # Headers run from the CRLF ending the delimiter line to a blank line.
+            head_end = buf.find(b"\r\n\r\n")
+            while head_end < 0:
+                if len(buf) > MAX_FORM_BYTES:
+                    raise ValueError("Multipart part headers are too large")
+                fill()
+                head_end = buf.find(b"\r\n\r\n")
+            name, filename = _multipart_part_names(buf[:head_end])
+            buf = buf[head_end + 4 :]
+
+            if filename is not None:
+                file_count += 1
+                if file_count > MAX_IMPORT_FILES:
+                    raise ValueError(f"Too many files (max {MAX_IMPORT_FILES})")
+                path = os.path.join(spool_dir, f"part{file_count:05d}")
+                sink = open(path, "wb")
+            else:
+                path = None
+                sink = io.BytesIO()
+            with sink:
+                index = buf.find(delimiter)
+                while index < 0:
+                    if len(buf) > keep:
+                        sink.write(buf[:-keep])
+                        buf = buf[-keep:]
+                        if path is None and sink.tell() > MAX_FORM_BYTES:
+                            raise ValueError("Form field is too large")
+                    fill()
+                    index = buf.find(delimiter)
+                sink.write(buf[:index])
+                buf = buf[index + len(delimiter) :]
+                value = path if path is not None else sink.getvalue()
+            if name is not None:
+                parts.append((name, filename, value))
+    finally:
+        # Drain the rest (epilogue, or the body after an error) so the
+        # connection stays usable for the response.
+        while remaining > 0:
+            chunk = rfile.read(min(65536, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+    return parts
+
 
-        name = name_m.group(1).decode("latin-1")
-        if name == "photo" and (b"filename=" in head or len(payload) > 0):
+def parse_multipart_form(rfile, content_type, content_length):
+    """Parse multipart/form-data. Returns (photo_bytes or None, fields_dict)."""
+    photo = None
+    fields = {}
+    for name, filename, payload in read_multipart_parts(rfile, content_type, content_length):
+        if name == "photo" and (filename is not None or len(payload) > 0):
             photo = payload
         else:
             fields[name] = payload.decode("utf-8", errors="replace").strip()
@@ -488,35 +1959,318 @@ def _encode_preview_png(image):
     return buf.getvalue(), image.width, image.height
 
 
-def _rebuild_preview_locked():
-    global _preview_display, _preview_png, _preview_version
-
-    target_aspect = DISPLAY_ASPECT if _preview_state.orientation == "portrait" else (1.0 / DISPLAY_ASPECT)
-
-    transformed = apply_transform(
-        _preview_source,
-        rotation=_preview_state.rotation,
-        crop=_preview_state.crop,
-        fill=_preview_state.fill,
-        target_aspect=target_aspect,
-    )
-    if _preview_state.orientation == "landscape":
-        transformed = transformed.rotate(90, expand=True, resample=Image.Resampling.BICUBIC)
+def render_display_image(image, rotation=0, crop=1.0, fill=False, orientation="landscape"):
+    """Transform a source image into the panel-sized frame, as the preview shows it."""
+    from PIL import Image
 
-    display_image = format_for_display(transformed)
+    target_aspect = DISPLAY_ASPECT if orientation == "portrait" else (1.0 / DISPLAY_ASPECT)
 
-    if _preview_state.orientation == "landscape":
-        ui_image = display_image.rotate(-90, expand=True)
-    else:
-        ui_image = display_image
+    with metric_timer("epaper_stage_duration_seconds", stage="transform"):
+        transformed = apply_transform(
+            image,
+            rotation=rotation,
+            crop=crop,
+            fill=fill,
+            target_aspect=target_aspect,
+        )
+        if orientation == "landscape":
+            transformed = transformed.rotate(90, expand=True, resample=Image.Resampling.BICUBIC)
+
+    return format_for_display(transformed)
+
+
+def _preview_ui_image(display_image, orientation):
+    """display_image turned the way the web UI shows it."""
+    if orientation == "landscape":
+        return display_image.rotate(-90, expand=True)
+    return display_image
+
+
+def _render(source, want, settings=None, max_pixels=None):
+    """Decode or take source and produce the outputs named in want.
+
+    source is encoded image bytes or a PIL image. want may hold "source"
+    (the preview working copy of the decoded source), "display"
+    (render_display_image with settings), "png" and "png_size" (the preview
+    PNG of the display image), "frame" (the packed panel buffer of the
+    display image, or of the source without settings) and "live" (a JPEG of
+    the source at LIVE_PREVIEW_MAX_EDGE for the web page).
+    """
+    if isinstance(source, (bytes, bytearray)):
+        image = load_image_from_bytes(source, max_pixels)
+        image = _preview_working_copy(image) if "source" in want else image.convert("RGB")
+    else:
+        image = source
+    outputs = {"source": image}
+    if settings is not None:
+        display = outputs["display"] = render_display_image(image, **settings)
+        if "png" in want or "png_size" in want:
+            png, width, height = _encode_preview_png(_preview_ui_image(display, settings["orientation"]))
+            outputs["png"], outputs["png_size"] = png, (width, height)
+    if "frame" in want:
+        outputs["frame"] = _pack_frame(outputs.get("display", image))
+    if "live" in want:
+        outputs["live"] = _encode_live_preview(image)
+    return {key: outputs[key] for key in want}
+
+
+def _encode_live_preview(image):
+    from PIL import Image
+
+    if max(image.size) > LIVE_PREVIEW_MAX_EDGE:
+        image = image.copy()
+        image.thumbnail((LIVE_PREVIEW_MAX_EDGE, LIVE_PREVIEW_MAX_EDGE), Image.Resampling.LANCZOS)
+    buf = io.BytesIO()
+    image.convert("RGB").save(buf, format="JPEG", quality=85)
+    return buf.getvalue()
+
+
+def _shm_put(value):
+    """Copy bytes or a PIL image into a new shared memory block and return
+    its descriptor; anything else is passed through as is. Images are copied
+    a strip of rows at a time, so no second full-size copy is made."""
+    from multiprocessing import shared_memory
+
+    if isinstance(value, (bytes, bytearray)):
+        nbytes = len(value)
+    elif hasattr(value, "getbands"):
+        if value.mode not in ("RGB", "L"):
+            value = value.convert("RGB")
+        row_bytes = value.width * len(value.getbands())
+        nbytes = row_bytes * value.height
+    else:
+        return ("value", value)
+
+    block = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+    try:
+        if isinstance(value, (bytes, bytearray)):
+            block.buf[:nbytes] = value
+            descriptor = ("bytes", block.name, nbytes)
+        else:
+            for top in range(0, value.height, SHARED_MEMORY_STRIP_ROWS):
+                bottom = min(value.height, top + SHARED_MEMORY_STRIP_ROWS)
+                strip = value.crop((0, top, value.width, bottom)).tobytes()
+                block.buf[top * row_bytes : bottom * row_bytes] = strip
+            descriptor = ("image", block.name, nbytes, value.mode, value.size)
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    block.close()
+    return descriptor
+
+
+def _shm_get(descriptor, unlink=False):
+    """The value a descriptor from _shm_put stands for, optionally unlinking its block."""
+    from multiprocessing import shared_memory
+
+    if descriptor[0] == "value":
+        return descriptor[1]
+    block = shared_memory.SharedMemory(name=descriptor[1])
+    try:
+        data = block.buf[: descriptor[2]]
+        try:
+            if descriptor[0] == "image":
+                return _import_pil().frombytes(descriptor[3], descriptor[4], data)
+            return bytes(data)
+        finally:
+            data.release()
+    finally:
+        block.close()
+        if unlink:
+            block.unlink()
+
+
+def _shm_discard(descriptor):
+    from multiprocessing import shared_memory
+
+    if descriptor[0] == "value":
+        return
+    try:
+        block = shared_memory.SharedMemory(name=descriptor[1])
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+def _render_job(source, want, settings, max_pixels):
+    """Render worker side of render_image; returns (output descriptors,
+    metric updates, worker pid)."""
+    outputs = _render(_shm_get(source), want, settings, max_pixels)
+    results = {}
+    try:
+        for key, value in outputs.items():
+            results[key] = _shm_put(value)
+    except BaseException:
+        for descriptor in results.values():
+            _shm_discard(descriptor)
+        raise
+    metrics = list(_metric_sink or ())
+    if _metric_sink is not None:
+        _metric_sink.clear()
+    return results, metrics, os.getpid()
+
+
+def _render_worker_init():
+    global _metric_sink
+    # Ctrl+C and SIGTERM are for the server, which shuts the pool down.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    _metric_sink = []
+    _import_pil()
+
+
+def process_pool(max_workers, initializer=None):
+    """A process pool whose workers are started by a fork server.
+
+    Forking the server itself would copy locks held by its other threads
+    (scheduler, watch folder, events, requests) and its open SQLite
+    connection into the child; the fork server is a fresh interpreter with
+    no threads or database, with Pillow imported once for every worker.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["__main__", "PIL.Image"])
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=initializer)
+
+
+def _render_executor():
+    global _render_pool
+    from multiprocessing import resource_tracker
+
+    with _render_lock:
+        if _render_pool is None:
+            # Start the tracker before the fork server so the worker shares it:
+            # blocks the worker creates are unlinked here.
+            resource_tracker.ensure_running()
+            _render_pool = process_pool(RENDER_WORKERS, initializer=_render_worker_init)
+        return _render_pool
+
+
+def _stop_render_pool(pool):
+    """Kill a pool whose job timed out and let the next render start a new one."""
+    global _render_pool
+    with _render_lock:
+        if _render_pool is pool:
+            _render_pool = None
+        _render_pools_killed.add(pool)
+    # A stuck worker ignores shutdown(); the pool has no public way to stop it.
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def start_render_worker():
+    """Route render_image through the render worker process and start it now,
+    with Pillow already imported."""
+    global _render_owner_pid, _render_worker_pid
+    if not RENDER_WORKERS:
+        return
+    _render_worker_pid = _render_executor().submit(os.getpid).result(timeout=RENDER_TIMEOUT_SECONDS)
+    _render_owner_pid = os.getpid()
+
+
+def stop_render_worker():
+    global _render_pool, _render_owner_pid
+    with _render_lock:
+        pool, _render_pool = _render_pool, None
+        _render_owner_pid = None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def render_image(source, want, settings=None, max_pixels=None):
+    """_render in the render worker process once it is started, else inline.
+
+    Decoding and resampling large images then neither holds the GIL against
+    request threads nor takes the server down when a decoder crashes. Pixel
+    data crosses in shared memory; only small descriptors are pickled.
+    """
+    global _render_pool, _render_worker_pid
+    from concurrent.futures import TimeoutError as FutureTimeoutError
+    from concurrent.futures.process import BrokenProcessPool
+
+    if _render_owner_pid != os.getpid():
+        return _render(source, want, settings, max_pixels)
+    try:
+        pool = _render_executor()
+    except OSError as e:
+        print(f"[render] worker failed to start, rendering in process: {e}")
+        return _render(source, want, settings, max_pixels)
+    descriptor = _shm_put(source)
+    try:
+        future = pool.submit(_render_job, descriptor, want, settings, max_pixels)
+        results, metrics, _render_worker_pid = future.result(timeout=RENDER_TIMEOUT_SECONDS)
+    except FutureTimeoutError as e:
+        # Callers may hold _preview_lock; never wait on a stuck worker for longer.
+        metric_inc("epaper_render_worker_timeouts_total")
+        _stop_render_pool(pool)
+        raise ValueError("Image renderer timed out; the image may be corrupt") from e
+    except BrokenProcessPool as e:
+        if pool in _render_pools_killed:
+            # Lost to another job's timeout, not to this image.
+            return _render(source, want, settings, max_pixels)
+        metric_inc("epaper_render_worker_crashes_total")
+        with _render_lock:
+            if _render_pool is pool:
+                _render_pool = None
+        pool.shutdown(wait=False)
+        raise ValueError("Image renderer crashed; the image may be corrupt") from e
+    finally:
+        _shm_discard(descriptor)
+    for kind, name, value, labels in metrics:
+        (metric_inc if kind == "inc" else metric_observe)(name, value, **labels)
+    outputs = {}
+    try:
+        for key, result in results.items():
+            outputs[key] = _shm_get(result, unlink=True)
+    finally:
+        for key, result in results.items():
+            if key not in outputs:
+                _shm_discard(result)
+    return outputs
+
+
+def decode_preview_source(data):
+    """Decode an upload straight into its preview working copy."""
+    return render_image(data, ("source",), max_pixels=preview_source_max_pixels())["source"]
+
+
+def _rebuild_preview_locked():
+    return _commit_preview_locked(_render_preview_locked())
+
+
+def _render_preview_locked():
+    settings = {
+        "rotation": _preview_state.rotation,
+        "crop": _preview_state.crop,
+        "fill": _preview_state.fill,
+        "orientation": _preview_state.orientation,
+    }
+    source, max_pixels = _preview_render_source_locked()
+    try:
+        rendered = render_image(source, ("display", "png", "png_size"), settings, max_pixels)
+    except ValueError as e:
+        if source is _preview_source:
+            raise
+        print(f"[preview] using working copy, original unavailable: {e}")
+        rendered = render_image(_preview_source, ("display", "png", "png_size"), settings)
+    return rendered
 
-    png, width, height = _encode_preview_png(ui_image)
 
-    _preview_display = display_image
-    _preview_png = png
+def _commit_preview_locked(rendered):
+    global _preview_display, _preview_png, _preview_version
+
+    width, height = rendered["png_size"]
+
+    _preview_display = rendered["display"]
+    _preview_png = rendered["png"]
     _preview_version += 1
 
-    return {
+    state = {
         "rotation": _preview_state.rotation,
         "crop": _preview_state.crop,
         "fill": _preview_state.fill,
@@ -524,33 +2278,240 @@ def _rebuild_preview_locked():
         "preview_width": width,
         "preview_height": height,
         "preview_url": f"/api/preview/image?v={_preview_version}",
+        "source_url": f"/api/preview/source_image?v={_preview_source_version}",
         "version": _preview_version,
     }
-
-
-def set_preview_source(image, orientation="landscape"):
-    global _preview_source, _preview_state
+    publish_event("preview", state)
+    return state
+
+
+def load_preview_source(source, upload=None):
+    """Load the image a preview source request describes: mode "upload"
+    (the uploaded bytes), "url" or "text". Returns (image, original), where
+    original is the encoded image to keep for deep crops, if any."""
+    mode = str(source.get("mode", "")).strip().lower()
+    if mode == "upload":
+        if not upload:
+            raise ValueError("Multipart upload must include field 'photo'")
+        return decode_preview_source(upload), upload
+    if mode == "url":
+        url = str(source.get("url", "")).strip()
+        if not url:
+            raise ValueError("Missing url")
+        image = load_image_from_url(url, max_pixels=preview_source_max_pixels(), decode=decode_preview_source)
+        return image, fetch_image(url) if PREVIEW_KEEP_ORIGINAL else None
+    if mode == "text":
+        text = str(source.get("text", ""))
+        if not text.strip():
+            raise ValueError("Missing text")
+        return render_text_to_image(text.strip(), font_size=parse_font_size(source.get("font_size"))), None
+    raise ValueError("Invalid source mode. Use multipart file or JSON mode=url|text")
+
+
+def set_preview_source(image, orientation="landscape", original=None):
+    """Make image the preview source, stored at its working resolution.
+
+    original is the encoded upload; with EPAPER_PREVIEW_KEEP_ORIGINAL it is
+    kept on disk when the working copy had to be scaled down, so deep crops
+    can still be rendered from full resolution.
+    """
+    prepared = _prepare_preview_source(image, original)
     with _preview_lock:
-        _preview_source = image.convert("RGB")
-        _preview_state = PreviewState(orientation=parse_orientation(orientation))
+        _install_preview_source_locked(prepared, orientation)
         return _rebuild_preview_locked()
 
 
-def update_preview_state(rotation=None, crop=None, fill=None, orientation=None):
+def _prepare_preview_source(image, original=None):
+    """The working copy of image and, when kept, the original written to a
+    temporary file; everything set_preview_source does before locking."""
+    working = _preview_working_copy(image)
+    if not (PREVIEW_KEEP_ORIGINAL and original):
+        return working, None, None
+    Image = _import_pil()
+    original_size = Image.open(io.BytesIO(original)).size
+    if original_size[0] * original_size[1] <= working.width * working.height:
+        return working, None, None
+    os.makedirs(_PREVIEW_STORE_DIR, exist_ok=True)
+    tmp_path = f"{_PREVIEW_ORIGINAL_PATH}.{_new_item_id()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(original)
+    return working, original_size, tmp_path
+
+
+def _install_preview_source_locked(prepared, orientation):
+    """Swap in a prepared source with a fresh state; the caller rebuilds."""
+    global _preview_source, _preview_state, _preview_original_size
+    global _preview_source_version, _preview_live_jpeg
+    working, original_size, tmp_path = prepared
+    if original_size is not None:
+        os.replace(tmp_path, _PREVIEW_ORIGINAL_PATH)
+    elif _preview_original_size is not None:
+        try:
+            os.remove(_PREVIEW_ORIGINAL_PATH)
+        except OSError:
+            pass
+    _preview_original_size = original_size
+    _preview_source = working
+    _preview_source_version += 1
+    _preview_live_jpeg = None
+    _preview_state = PreviewState(orientation=parse_orientation(orientation))
+
+
+def preview_source_max_pixels():
+    """Largest RGB preview source that fits the memory budget next to the
+    panel frame, at worst an uncompressed PNG of it, and the page's JPEG
+    copy (well under a byte per pixel)."""
+    reserved = EPD_WIDTH * EPD_HEIGHT * (_PIXEL_BYTES_DEFAULT + 3) + LIVE_PREVIEW_MAX_EDGE**2
+    return max(EPD_WIDTH * EPD_HEIGHT, (PREVIEW_MEMORY_BUDGET_BYTES - reserved) // _PIXEL_BYTES_DEFAULT)
+
+
+def _scaled_size(size, max_pixels):
+    """size shrunk, keeping its aspect, to at most max_pixels and PREVIEW_SOURCE_MAX_EDGE."""
+    w, h = size
+    scale = min(1.0, PREVIEW_SOURCE_MAX_EDGE / max(w, h), (max_pixels / (w * h)) ** 0.5)
+    if scale >= 1.0:
+        return size
+    return max(1, int(w * scale)), max(1, int(h * scale))
+
+
+def _preview_working_copy(image):
+    from PIL import Image
+
+    if image.mode in ("1", "P"):
+        image = image.convert("RGB")
+    target = _scaled_size(image.size, preview_source_max_pixels())
+    if target != image.size:
+        with metric_timer("epaper_stage_duration_seconds", stage="transform"):
+            image = image.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+    return image if image.mode == "RGB" else image.convert("RGB")
+
+
+def _preview_render_source_locked():
+    """(source, max_pixels) to render from: the working copy, or the encoded
+    original from disk when the crop is deep enough that the working copy
+    would be scaled up to fill the panel."""
+    source = _preview_source
+    crop = 1.0 if _preview_state.fill else _preview_state.crop
+    if _preview_original_size is None or source.width * source.height * crop * crop >= EPD_WIDTH * EPD_HEIGHT:
+        return source, None
+    try:
+        with open(_PREVIEW_ORIGINAL_PATH, "rb") as f:
+            return f.read(), int(EPD_WIDTH * EPD_HEIGHT / (crop * crop))
+    except OSError as e:
+        print(f"[preview] using working copy, original unavailable: {e}")
+        return source, None
+
+
+# Pillow keeps single-band images at 1 byte per pixel (2 for I;16) and
+# everything else, RGB included, at 4.
+_PIXEL_BYTES = {"1": 1, "L": 1, "P": 1, "I;16": 2, "I;16L": 2, "I;16B": 2}
+_PIXEL_BYTES_DEFAULT = 4
+
+
+def _image_bytes(image):
+    if image is None:
+        return 0
+    return image.width * image.height * _PIXEL_BYTES.get(image.mode, _PIXEL_BYTES_DEFAULT)
+
+
+def get_preview_memory():
+    """Bytes held by the preview, against PREVIEW_MEMORY_BUDGET_BYTES."""
     with _preview_lock:
-        if _preview_source is None:
-            raise ValueError("No preview source loaded")
+        source = _preview_source
+        usage = {
+            "source_bytes": _image_bytes(source),
+            "display_bytes": _image_bytes(_preview_display),
+            "png_bytes": len(_preview_png or b""),
+            "live_bytes": len(_preview_live_jpeg or b""),
+        }
+        original_size = _preview_original_size
+    return dict(
+        usage,
+        used_bytes=sum(usage.values()),
+        budget_bytes=PREVIEW_MEMORY_BUDGET_BYTES,
+        source_size=None if source is None else list(source.size),
+        original_size=None if original_size is None else list(original_size),
+    )
 
-        if rotation is not None:
-            _preview_state.rotation = parse_rotation(rotation)
-        if crop is not None:
-            _preview_state.crop = parse_crop(crop)
-        if fill is not None:
-            _preview_state.fill = bool(fill)
-        if orientation is not None:
-            _preview_state.orientation = parse_orientation(orientation)
 
-        return _rebuild_preview_locked()
+def update_preview_state(rotation=None, crop=None, fill=None, orientation=None):
+    """Apply a transform and rebuild the preview; returns the new state.
+
+    Concurrent calls are coalesced, latest wins: their changes are merged,
+    one caller renders them while the others wait, and every caller gets
+    the state of the render that covered its change.
+    """
+    global _transform_rendering
+
+    changes = {"rotation": rotation, "crop": crop, "fill": fill, "orientation": orientation}
+    waiter = {}
+    with _transform_cond:
+        _transform_pending.update((key, value) for key, value in changes.items() if value is not None)
+        _transform_waiters.append(waiter)
+        while _transform_rendering and not waiter:
+            _transform_cond.wait()
+        if not waiter:
+            _transform_rendering = True
+    if waiter:
+        metric_inc("epaper_preview_transforms_total", result="coalesced")
+    else:
+        metric_inc("epaper_preview_transforms_total", result="rendered")
+        try:
+            _render_pending_transforms()
+        finally:
+            with _transform_cond:
+                _transform_rendering = False
+                _transform_cond.notify_all()
+    if "error" in waiter:
+        raise waiter["error"]
+    return waiter["state"]
+
+
+def _render_pending_transforms():
+    """Render the merged pending transforms and answer their callers.
+
+    A render that newer transforms arrived during is thrown away unpublished
+    and the preview rendered again with them, for up to
+    MAX_ABANDONED_PREVIEW_RENDERS renders in a row.
+    """
+    answered = []
+    with _preview_lock:
+        for attempt in range(MAX_ABANDONED_PREVIEW_RENDERS + 1):
+            with _transform_cond:
+                changes = dict(_transform_pending)
+                _transform_pending.clear()
+                answered.extend(_transform_waiters)
+                _transform_waiters.clear()
+            try:
+                _update_preview_state_locked(**changes)
+                rendered = _render_preview_locked()
+                with _transform_cond:
+                    newer = bool(_transform_waiters)
+                if newer and attempt < MAX_ABANDONED_PREVIEW_RENDERS:
+                    metric_inc("epaper_preview_renders_abandoned_total")
+                    continue
+                outcome = {"state": _commit_preview_locked(rendered)}
+            except Exception as e:
+                outcome = {"error": e}
+            break
+    with _transform_cond:
+        for waiter in answered:
+            waiter.update(outcome)
+        _transform_cond.notify_all()
+
+
+def _update_preview_state_locked(rotation=None, crop=None, fill=None, orientation=None):
+    if _preview_source is None:
+        raise ValueError("No preview source loaded")
+
+    if rotation is not None:
+        _preview_state.rotation = parse_rotation(rotation)
+    if crop is not None:
+        _preview_state.crop = parse_crop(crop)
+    if fill is not None:
+        _preview_state.fill = bool(fill)
+    if orientation is not None:
+        _preview_state.orientation = parse_orientation(orientation)
 
 
 def get_preview_png():
@@ -560,47 +2521,331 @@ def get_preview_png():
         return _preview_png
 
 
+def get_preview_live_jpeg():
+    """JPEG of the preview source for the page to transform locally, or None."""
+    global _preview_live_jpeg
+    with _preview_lock:
+        if _preview_live_jpeg is None and _preview_source is not None:
+            _preview_live_jpeg = render_image(_preview_source, ("live",))["live"]
+        return _preview_live_jpeg
+
+
+def _preview_snapshot_locked():
+    """(display image copy, orientation) of the current preview."""
+    if _preview_display is None:
+        raise ValueError("No preview image available")
+    return _preview_display.copy(), _preview_state.orientation
+
+
 def display_preview_buffer():
     with _preview_lock:
-        if _preview_display is None:
-            raise ValueError("No preview image available")
-        image = _preview_display.copy()
-        orientation = _preview_state.orientation
+        image, orientation = _preview_snapshot_locked()
+    _display_preview_image(image, orientation)
+
+
+def _display_preview_image(image, orientation):
     if orientation == "landscape":
         # Match panel output to the landscape preview orientation.
         image = image.rotate(180, expand=False)
-    with _display_lock:
-        show_image_on_epd(image)
+    run_display_job(image, "preview")
 
 
 def _ensure_rotation_dirs():
     os.makedirs(_ROTATION_ITEMS_DIR, exist_ok=True)
+    os.makedirs(_ROTATION_THUMBS_DIR, exist_ok=True)
+    os.makedirs(_ROTATION_FRAMES_DIR, exist_ok=True)
+
+
+def _rotation_thumb_path(item):
+    stem = os.path.splitext(item.filename)[0]
+    return os.path.join(_ROTATION_THUMBS_DIR, f"{stem}.jpg")
 
 
-def _rotation_manifest_dict_locked():
+def _rotation_frame_path(item):
+    stem = os.path.splitext(item.filename)[0]
+    return os.path.join(_ROTATION_FRAMES_DIR, f"{stem}.bin")
+
+
+def _write_rotation_file(data, path):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _write_rotation_thumb(image, path):
+    """Save a small JPEG of image for the queue list; returns the encoded bytes."""
+    from PIL import Image
+
+    thumb = image.convert("RGB")
+    thumb.thumbnail((THUMBNAIL_MAX_EDGE, THUMBNAIL_MAX_EDGE), Image.Resampling.LANCZOS)
+    buf = io.BytesIO()
+    thumb.save(buf, format="JPEG", quality=80, optimize=True)
+    data = buf.getvalue()
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return data
+
+
+def _rotation_content_filename(image):
+    """Item filename from a hash of the rendered pixels (not the PNG encoding)."""
+    import hashlib
+
+    digest = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode("ascii"))
+    digest.update(image.tobytes())
+    return f"{digest.hexdigest()[:32]}.png"
+
+
+def _rotation_item_paths(item):
+    return (
+        os.path.join(_ROTATION_ITEMS_DIR, item.filename),
+        _rotation_thumb_path(item),
+        _rotation_frame_path(item),
+    )
+
+
+def _staged_rotation_path(item, path):
+    return f"{path}.{item.item_id}.staged"
+
+
+def _stage_rotation_file(item, path, write):
+    """Stage one of item's files next to path, to be moved into place by
+    _append_rotation_item_locked.
+
+    Content already stored for another item is staged as a hard link, which
+    is cheap and keeps the content even if that item is removed (and the file
+    released) before this one is queued; write(staged_path) runs otherwise.
+    """
+    staged = _staged_rotation_path(item, path)
+    try:
+        os.link(path, staged)
+        return
+    except FileNotFoundError:
+        pass
+    except OSError:
+        # No hard links on this filesystem, or a stale staged file: write a copy.
+        pass
+    write(staged)
+
+
+def _store_rotation_image(item, image, with_frame=False):
+    """Stage item's image, thumbnail and optionally packed frame; safe to call
+    outside _rotation_lock and in a worker process."""
+    path, thumb_path, frame_path = _rotation_item_paths(item)
+    _stage_rotation_file(item, path, lambda staged: image.save(staged, format="PNG"))
+    _stage_rotation_file(item, thumb_path, lambda staged: _write_rotation_thumb(image, staged))
+    if with_frame:
+        _stage_rotation_file(item, frame_path, lambda staged: _write_rotation_file(prepare_frame(image), staged))
+
+
+def _commit_staged_rotation_files_locked(item):
+    """Move item's staged files into place. A stored copy is the same content,
+    so replacing it is harmless; a staged hard link to it is left for
+    _discard_staged_rotation_files, as rename() does nothing for two links
+    to one file."""
+    for path in _rotation_item_paths(item):
+        try:
+            os.replace(_staged_rotation_path(item, path), path)
+        except FileNotFoundError:
+            pass
+
+
+def _discard_staged_rotation_files(item):
+    """Drop the staged files of an item that will not be queued."""
+    for path in _rotation_item_paths(item):
+        try:
+            os.remove(_staged_rotation_path(item, path))
+        except OSError:
+            pass
+
+
+def _remove_rotation_item_files(item):
+    for path in _rotation_item_paths(item):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _release_rotation_files_locked(item):
+    """Delete item's stored files once no queued item references them."""
+    if _rotation_state.items.refs(item.filename) == 0:
+        _remove_rotation_item_files(item)
+
+
+def _rotation_db_locked():
+    global _rotation_db
+    import sqlite3
+
+    if _rotation_db is None:
+        _ensure_rotation_dirs()
+        conn = sqlite3.connect(_ROTATION_DB_PATH, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Commits are atomic immediately; durability comes from the periodic
+        # checkpoint in sync_rotation_state().
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_ROTATION_DB_SCHEMA)
+        if "playlist" not in {row[1] for row in conn.execute("PRAGMA table_info(items)")}:
+            conn.execute("ALTER TABLE items ADD COLUMN playlist TEXT NOT NULL DEFAULT ''")
+        _rotation_db = conn
+    return _rotation_db
+
+
+def _rotation_db_write_locked(statements):
+    """Run (sql, params) statements in one transaction."""
+    global _rotation_unsynced
+    conn = _rotation_db_locked()
+    conn.execute("BEGIN")
+    try:
+        for sql, params in statements:
+            conn.execute(sql, params)
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    _rotation_unsynced = True
+
+
+def _rotation_settings_locked():
     return {
         "enabled": bool(_rotation_state.enabled),
         "interval_seconds": int(_rotation_state.interval_seconds),
-        "next_index": int(_rotation_state.next_index),
+        "next_item_id": _rotation_state.items.cursor_id or "",
         "last_switch_ts": float(_rotation_state.last_switch_ts),
-        "items": [
-            {
-                "item_id": item.item_id,
-                "filename": item.filename,
-                "created_at": float(item.created_at),
-            }
-            for item in _rotation_state.items
-        ],
+        "align_to_clock": bool(_rotation_state.align_to_clock),
+        "watch_dir": _rotation_state.watch_dir,
+        "watch_transform": dict(_rotation_state.watch_transform),
+        "schedule": list(_rotation_state.schedule),
     }
 
 
+def _settings_statements(settings):
+    return [
+        ("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+        for key, value in settings.items()
+    ]
+
+
 def _persist_rotation_locked():
-    _ensure_rotation_dirs()
-    payload = _rotation_manifest_dict_locked()
-    tmp_path = _ROTATION_MANIFEST_PATH + ".tmp"
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2, sort_keys=True)
-    os.replace(tmp_path, _ROTATION_MANIFEST_PATH)
+    """Mark settings and cursor changed; written by the next sync, not per call."""
+    global _rotation_settings_dirty
+    _rotation_settings_dirty = True
+
+
+def _flush_rotation_settings_locked():
+    global _rotation_settings_dirty
+    if not _rotation_settings_dirty:
+        return
+    _rotation_db_write_locked(_settings_statements(_rotation_settings_locked()))
+    _rotation_settings_dirty = False
+
+
+def _append_rotation_item_locked(item):
+    """Queue item, moving its staged files into place; returns True when its
+    content was already stored for another item.
+
+    Under _rotation_lock, like _release_rotation_files_locked, so a file
+    cannot be released between being found here and being referenced.
+    """
+    global _rotation_next_position
+    if _rotation_state.items.get(item.item_id) is not None:
+        raise ValueError("Duplicate rotation item")
+    _commit_staged_rotation_files_locked(item)
+    if not os.path.exists(os.path.join(_ROTATION_ITEMS_DIR, item.filename)):
+        raise ValueError("Rotation item image is missing")
+    deduplicated = _rotation_state.items.refs(item.filename) > 0
+    try:
+        _rotation_db_write_locked(
+            [
+                (
+                    "INSERT INTO items (item_id, filename, created_at, position, playlist) VALUES (?, ?, ?, ?, ?)",
+                    (item.item_id, item.filename, float(item.created_at), _rotation_next_position, item.playlist),
+                )
+            ]
+        )
+    except Exception:
+        _release_rotation_files_locked(item)
+        raise
+    # Only once it is stored, so memory never holds an item the database lacks.
+    _rotation_state.items.append(item)
+    _rotation_next_position += 1
+    _persist_rotation_locked()
+    return deduplicated
+
+
+def _delete_rotation_items_locked(item_ids):
+    """Unqueue items, deleting stored files that are no longer referenced."""
+    for item_id in item_ids:
+        _release_rotation_files_locked(_rotation_state.items.remove(item_id))
+    # A watched file keeps its signature without an item, so scans leave it
+    # out until the file itself changes.
+    _rotation_db_write_locked(
+        [("DELETE FROM items WHERE item_id = ?", (item_id,)) for item_id in item_ids]
+        + [("UPDATE watch_files SET item_id = '' WHERE item_id = ?", (item_id,)) for item_id in item_ids]
+    )
+    _persist_rotation_locked()
+
+
+def sync_rotation_state():
+    """Write pending settings and checkpoint the WAL so everything is on disk."""
+    global _rotation_unsynced
+    with _rotation_lock:
+        if _rotation_db is None:
+            return
+        _flush_rotation_settings_locked()
+        if _rotation_unsynced:
+            _rotation_db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            _rotation_unsynced = False
+
+
+def _new_item_id():
+    import uuid
+
+    return uuid.uuid4().hex
+
+
+def _migrate_rotation_manifest_locked():
+    """Import a pre-SQLite manifest.json once, then set it aside."""
+    try:
+        with open(_ROTATION_MANIFEST_PATH, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        payload = {}
+
+    statements = []
+    seen = set()
+    item_ids = []
+    for entry in payload.get("items", []):
+        item_id = str(entry.get("item_id") or "").strip()
+        if not item_id or item_id in seen:
+            item_id = _new_item_id()
+        filename = str(entry.get("filename") or "").strip()
+        if not filename:
+            continue
+        seen.add(item_id)
+        item_ids.append(item_id)
+        statements.append(
+            (
+                "INSERT INTO items (item_id, filename, created_at, position) VALUES (?, ?, ?, ?)",
+                (item_id, filename, float(entry.get("created_at") or 0.0), len(statements)),
+            )
+        )
+
+    try:
+        next_index = int(payload.get("next_index") or 0)
+    except (TypeError, ValueError):
+        next_index = 0
+    settings = {
+        "enabled": bool(payload.get("enabled", False)),
+        "interval_seconds": parse_interval_seconds(payload.get("interval_seconds")),
+        "next_item_id": item_ids[next_index % len(item_ids)] if item_ids else "",
+        "last_switch_ts": float(payload.get("last_switch_ts") or 0.0),
+    }
+    _rotation_db_write_locked(statements + _settings_statements(settings))
+    os.replace(_ROTATION_MANIFEST_PATH, _ROTATION_MANIFEST_PATH + ".migrated")
+    print(f"[rotation] migrated {len(statements)} items from manifest.json")
 
 
 def _normalize_rotation_state_locked():
@@ -609,79 +2854,262 @@ def _normalize_rotation_state_locked():
     if _rotation_state.interval_seconds > MAX_ROTATION_INTERVAL_SECONDS:
         _rotation_state.interval_seconds = MAX_ROTATION_INTERVAL_SECONDS
 
-    valid_items = []
-    for item in _rotation_state.items:
-        path = os.path.join(_ROTATION_ITEMS_DIR, item.filename)
-        if os.path.exists(path):
-            valid_items.append(item)
-    _rotation_state.items = valid_items
-    if not _rotation_state.items:
-        _rotation_state.next_index = 0
-    else:
-        _rotation_state.next_index = _rotation_state.next_index % len(_rotation_state.items)
+    # One directory listing instead of a stat per item.
+    try:
+        present = set(os.listdir(_ROTATION_ITEMS_DIR))
+    except OSError:
+        present = set()
+    missing = [item.item_id for item in _rotation_state.items if item.filename not in present]
+    if missing:
+        _delete_rotation_items_locked(missing)
+
+
+def _remove_interrupted_rotation_files():
+    """Drop upload spools and staged item files left behind by an import or
+    add cut short by a crash or power loss."""
+    import shutil
+
+    for directory in (_ROTATION_STORE_DIR, _ROTATION_ITEMS_DIR, _ROTATION_THUMBS_DIR, _ROTATION_FRAMES_DIR):
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        for name in names:
+            path = os.path.join(directory, name)
+            if directory == _ROTATION_STORE_DIR and name.startswith(_IMPORT_SPOOL_PREFIX):
+                shutil.rmtree(path, ignore_errors=True)
+            elif name.endswith(".staged"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
 
 
 def load_rotation_state():
+    global _rotation_next_position
     _ensure_rotation_dirs()
+    _remove_interrupted_rotation_files()
     with _rotation_lock:
-        if not os.path.exists(_ROTATION_MANIFEST_PATH):
-            _persist_rotation_locked()
-            return
+        conn = _rotation_db_locked()
+        has_rows = conn.execute("SELECT EXISTS (SELECT 1 FROM settings) OR EXISTS (SELECT 1 FROM items)").fetchone()[0]
+        if not has_rows and os.path.exists(_ROTATION_MANIFEST_PATH):
+            _migrate_rotation_manifest_locked()
 
-        try:
-            with open(_ROTATION_MANIFEST_PATH, "r", encoding="utf-8") as f:
-                payload = json.load(f)
-        except (OSError, json.JSONDecodeError):
-            payload = {}
-
-        items = []
-        for entry in payload.get("items", []):
-            item_id = str(entry.get("item_id") or "").strip() or uuid.uuid4().hex
-            filename = str(entry.get("filename") or "").strip()
-            if not filename:
+        settings = {}
+        for key, value in conn.execute("SELECT key, value FROM settings"):
+            try:
+                settings[key] = json.loads(value)
+            except json.JSONDecodeError:
                 continue
-            created_at = float(entry.get("created_at") or 0.0)
-            items.append(RotationItem(item_id=item_id, filename=filename, created_at=created_at))
 
-        _rotation_state.enabled = bool(payload.get("enabled", False))
-        _rotation_state.interval_seconds = parse_interval_seconds(payload.get("interval_seconds"))
-        _rotation_state.next_index = int(payload.get("next_index") or 0)
-        _rotation_state.last_switch_ts = float(payload.get("last_switch_ts") or 0.0)
+        items = RotationQueue()
+        for item_id, filename, created_at, playlist in conn.execute(
+            "SELECT item_id, filename, created_at, playlist FROM items ORDER BY position"
+        ):
+            items.append(
+                RotationItem(item_id=item_id, filename=filename, created_at=float(created_at), playlist=playlist)
+            )
+        _rotation_next_position = conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM items").fetchone()[0]
+
+        _rotation_state.enabled = bool(settings.get("enabled", False))
+        _rotation_state.interval_seconds = parse_interval_seconds(
+            settings.get("interval_seconds", _rotation_state.interval_seconds)
+        )
+        _rotation_state.last_switch_ts = float(settings.get("last_switch_ts") or 0.0)
+        _rotation_state.align_to_clock = bool(settings.get("align_to_clock", False))
+        _rotation_state.watch_dir = str(settings.get("watch_dir") or "")
+        _rotation_state.watch_transform = dict(settings.get("watch_transform") or {})
+        try:
+            _rotation_state.schedule = parse_schedule(settings.get("schedule") or [])
+        except ValueError as e:
+            print(f"[rotation] ignoring stored schedule: {e}")
+            _rotation_state.schedule = []
+        _set_rotation_timetable_stale()
         _rotation_state.items = items
+        items.set_cursor(settings.get("next_item_id"))
+        # Normalize after placing the cursor so removals keep it on the same item.
         _normalize_rotation_state_locked()
         _persist_rotation_locked()
-
-
-def get_rotation_status():
+        _flush_rotation_settings_locked()
+    publish_rotation_status()
+
+
+def _next_clock_boundary(ts, interval):
+    """First multiple of interval after ts, counted from local midnight.
+
+    The count restarts at every midnight, so an interval that does not divide
+    a day (7 minutes: ... 23:55, 00:00, 00:07) still lines up with it.
+    """
+    day = time.localtime(ts)
+    # Wall-clock seconds, so boundaries stay on the clock across DST changes.
+    wall = day.tm_hour * 3600 + day.tm_min * 60 + day.tm_sec + (ts % 1)
+    hours, seconds = divmod(int(min((wall // interval + 1) * interval, 24 * 60 * 60)), 3600)
+    due = time.mktime((day.tm_year, day.tm_mon, day.tm_mday, hours, seconds // 60, seconds % 60, 0, 0, -1))
+    # The repeated hour when clocks go back can map a boundary to before ts.
+    return due if due > ts else ts + interval
+
+
+def _set_rotation_timetable_stale():
+    global _rotation_timetable
+    _rotation_timetable = None
+
+
+def _rotation_timetable_locked(now):
+    """The timetable for the current schedule, rebuilt about once a day."""
+    global _rotation_timetable
+    if _rotation_timetable is None or not _rotation_timetable.covers(now):
+        _rotation_timetable = RotationTimetable(_rotation_state.schedule, now)
+    return _rotation_timetable
+
+
+def _schedule_rule(rule_index):
+    return _rotation_state.schedule[rule_index] if rule_index >= 0 else None
+
+
+def _slot_playlist(rule):
+    """Playlist shown under rule ("" is the whole queue), or None when quiet."""
+    if rule is None:
+        return ""
+    return None if rule["quiet"] else rule["playlist"]
+
+
+def _rotation_slot_locked(ts, now=None):
+    """(playlist, interval_seconds) in effect at ts; playlist None when quiet."""
+    interval = _rotation_state.interval_seconds
+    if not _rotation_state.schedule:
+        return "", interval
+    timetable = _rotation_timetable_locked(ts if now is None else now)
+    _, _, rule_index = timetable.segment(timetable.index(ts))
+    rule = _schedule_rule(rule_index)
+    return _slot_playlist(rule), (rule or {}).get("interval_seconds") or interval
+
+
+def _due_after(last, interval):
+    if _rotation_state.align_to_clock:
+        return _next_clock_boundary(last, interval)
+    return last + interval
+
+
+def _next_rotation_due_locked(now=None):
+    """Timestamp of the next switch, or None when rotation is idle.
+
+    With a schedule, quiet segments and segments whose playlist is empty are
+    skipped, so the panel is not woken until a segment that shows something
+    starts; a segment that changes the playlist switches at its start.
+    """
+    if not _rotation_state.enabled or not _rotation_state.items:
+        return None
+    last = _rotation_state.last_switch_ts
+    if not _rotation_state.schedule:
+        return 0.0 if last <= 0 else _due_after(last, _rotation_state.interval_seconds)
+
+    now = _rotation_clock.time() if now is None else now
+    timetable = _rotation_timetable_locked(now)
+    current = timetable.index(now)
+    previous = None if current == 0 else _slot_playlist(_schedule_rule(timetable.segment(current - 1)[2]))
+    for index in range(current, len(timetable)):
+        start, end, rule_index = timetable.segment(index)
+        rule = _schedule_rule(rule_index)
+        playlist = _slot_playlist(rule)
+        changed, previous = playlist != previous, playlist
+        if playlist is None or not _rotation_state.items.has_playlist(playlist):
+            previous = None
+            continue
+        if last <= 0:
+            return 0.0 if index == current else start
+        if changed and last < start:
+            return start
+        due = max(start, _due_after(last, (rule or {}).get("interval_seconds") or _rotation_state.interval_seconds))
+        if due < end:
+            return due
+    return None
+
+
+def parse_status_window(offset=None, limit=None):
+    """(offset, limit) for a status item listing; no limit lists every item."""
+    try:
+        offset = int(offset or 0)
+        limit = None if limit in (None, "") else int(limit)
+    except (TypeError, ValueError) as e:
+        raise ValueError("offset and limit must be integers") from e
+    if offset < 0:
+        raise ValueError("offset must be 0 or more")
+    if limit is not None and not 1 <= limit <= MAX_STATUS_ITEMS:
+        raise ValueError(f"limit must be between 1 and {MAX_STATUS_ITEMS}")
+    return offset, limit
+
+
+def get_rotation_status(items=True, offset=0, limit=None, playlist=None, around_next=False):
+    """Rotation settings, schedule and progress, plus a listing of queued
+    items: all of them, or a window of up to limit items from offset (or
+    centred on the next item), optionally only those of one playlist.
+    Without items only the summary is built, which stays O(1) in the queue
+    length; queue_version tells clients when a listing they hold is stale.
+    """
     with _rotation_lock:
         count = len(_rotation_state.items)
-        now = time.time()
-        next_in_seconds = None
-        if _rotation_state.enabled and count > 0:
-            if _rotation_state.last_switch_ts <= 0:
-                next_in_seconds = 0
-            else:
-                remaining = _rotation_state.interval_seconds - (now - _rotation_state.last_switch_ts)
-                next_in_seconds = max(0, int(remaining))
-        items = []
-        for idx, item in enumerate(_rotation_state.items):
-            items.append(
-                {
-                    "item_id": item.item_id,
-                    "created_at": float(item.created_at),
-                    "preview_url": f"/api/rotation/item_image?id={item.item_id}",
-                    "is_next": idx == int(_rotation_state.next_index),
-                }
-            )
-        return {
+        now = _rotation_clock.time()
+        due_at = _next_rotation_due_locked(now)
+        # The image appears one refresh after the transfer starts at due_at.
+        next_in_seconds = None if due_at is None else max(0, int(max(due_at, now) - now + _refresh_seconds))
+        status = {
             "enabled": bool(_rotation_state.enabled),
             "interval_seconds": int(_rotation_state.interval_seconds),
+            "align_to_clock": bool(_rotation_state.align_to_clock),
             "item_count": count,
             "next_index": int(_rotation_state.next_index),
             "last_switch_ts": float(_rotation_state.last_switch_ts),
             "next_in_seconds": next_in_seconds,
-            "items": items,
+            "next_switch_ts": due_at,
+            "refresh_seconds": round(_refresh_seconds, 1),
+            "watch": dict(_watch_status, path=_rotation_state.watch_dir or None),
+            "schedule": list(_rotation_state.schedule),
+            "schedule_active": _schedule_status_locked(now),
+            "queue_version": _rotation_state.items.version,
         }
+        if not items:
+            return status
+        next_id = _rotation_state.items.cursor_id
+        around = status["next_index"] if around_next else None
+        total, offset, window = _rotation_state.items.window(offset, limit, playlist, around)
+        status["items"] = [
+            {
+                "index": index,
+                "item_id": item.item_id,
+                "created_at": float(item.created_at),
+                "preview_url": f"/api/rotation/item_image?id={item.item_id}",
+                "thumb_url": f"/api/rotation/item_thumb?id={item.item_id}",
+                "is_next": item.item_id == next_id,
+                "playlist": item.playlist,
+            }
+            for index, item in window
+        ]
+        status["items_offset"] = offset
+        status["items_total"] = total
+        return status
+
+
+def _schedule_status_locked(now):
+    """The schedule segment in effect now, or None without a schedule."""
+    if not _rotation_state.schedule:
+        return None
+    timetable = _rotation_timetable_locked(now)
+    _, until, rule_index = timetable.segment(timetable.index(now))
+    rule = _schedule_rule(rule_index)
+    return {
+        "rule": rule_index if rule is not None else None,
+        "name": (rule or {}).get("name") or "",
+        "quiet": bool(rule and rule["quiet"]),
+        "playlist": (rule or {}).get("playlist") or "",
+        "until": until,
+    }
+
+
+def publish_rotation_status():
+    """Build the rotation status summary once and push it to event subscribers."""
+    status = get_rotation_status(items=False)
+    publish_event("rotation", status)
+    return status
 
 
 def set_rotation_enabled(enabled):
@@ -691,67 +3119,71 @@ def set_rotation_enabled(enabled):
             # Display promptly when turning on.
             _rotation_state.last_switch_ts = 0.0
         _persist_rotation_locked()
-    return get_rotation_status()
+    wake_rotation_scheduler()
+    return publish_rotation_status()
 
 
-def set_rotation_interval(interval_seconds):
+def set_rotation_interval(interval_seconds=None, align_to_clock=None):
     with _rotation_lock:
-        _rotation_state.interval_seconds = parse_interval_seconds(interval_seconds)
+        if interval_seconds is not None:
+            _rotation_state.interval_seconds = parse_interval_seconds(interval_seconds)
+        if align_to_clock is not None:
+            _rotation_state.align_to_clock = bool(align_to_clock)
         _persist_rotation_locked()
-    return get_rotation_status()
+    wake_rotation_scheduler()
+    return publish_rotation_status()
 
 
-def clear_rotation_items():
+def set_rotation_schedule(rules):
+    schedule = parse_schedule(rules)
     with _rotation_lock:
-        for item in _rotation_state.items:
-            path = os.path.join(_ROTATION_ITEMS_DIR, item.filename)
-            try:
-                os.remove(path)
-            except OSError:
-                pass
-        _rotation_state.items = []
-        _rotation_state.next_index = 0
-        _rotation_state.last_switch_ts = 0.0
+        _rotation_state.schedule = schedule
+        _set_rotation_timetable_stale()
         _persist_rotation_locked()
-    return get_rotation_status()
+    wake_rotation_scheduler()
+    return publish_rotation_status()
 
 
-def remove_rotation_item(item_id):
+def set_rotation_item_playlist(item_id, playlist):
     item_id = str(item_id or "").strip()
     if not item_id:
         raise ValueError("Missing item_id")
+    playlist = parse_playlist(playlist)
 
     with _rotation_lock:
-        idx = -1
-        target = None
-        for i, item in enumerate(_rotation_state.items):
-            if item.item_id == item_id:
-                idx = i
-                target = item
-                break
+        _find_rotation_item_locked(item_id)
+        _rotation_state.items.set_playlist(item_id, playlist)
+        _rotation_db_write_locked([("UPDATE items SET playlist = ? WHERE item_id = ?", (playlist, item_id))])
+    wake_rotation_scheduler()
+    return publish_rotation_status()
 
-        if target is None:
-            raise ValueError("Rotation item not found")
 
-        path = os.path.join(_ROTATION_ITEMS_DIR, target.filename)
-        try:
-            os.remove(path)
-        except OSError:
-            pass
+def clear_rotation_items():
+    with _rotation_lock:
+        stored = {item.filename: item for item in _rotation_state.items}
+        _rotation_state.items.clear()
+        for item in stored.values():
+            _remove_rotation_item_files(item)
+        _rotation_state.last_switch_ts = 0.0
+        _rotation_db_write_locked([("DELETE FROM items", ()), ("UPDATE watch_files SET item_id = ''", ())])
+        _persist_rotation_locked()
+    wake_rotation_scheduler()
+    return publish_rotation_status()
+
+
+def remove_rotation_item(item_id):
+    item_id = str(item_id or "").strip()
+    if not item_id:
+        raise ValueError("Missing item_id")
 
-        del _rotation_state.items[idx]
+    with _rotation_lock:
+        _find_rotation_item_locked(item_id)
+        _delete_rotation_items_locked([item_id])
         if not _rotation_state.items:
-            _rotation_state.next_index = 0
             _rotation_state.last_switch_ts = 0.0
-        else:
-            if idx < _rotation_state.next_index:
-                _rotation_state.next_index -= 1
-            if _rotation_state.next_index >= len(_rotation_state.items):
-                _rotation_state.next_index = 0
-
-        _persist_rotation_locked()
 
-    return get_rotation_status()
+    wake_rotation_scheduler()
+    return publish_rotation_status()
 
 
 def jump_to_rotation_item(item_id):
@@ -762,65 +3194,678 @@ def jump_to_rotation_item(item_id):
     with _rotation_lock:
         if not _rotation_state.items:
             raise ValueError("Rotation queue is empty")
+        target = _find_rotation_item_locked(item_id)
 
-        idx = -1
-        target = None
-        for i, item in enumerate(_rotation_state.items):
-            if item.item_id == item_id:
-                idx = i
-                target = item
-                break
-        if target is None:
-            raise ValueError("Rotation item not found")
+    # Read outside the lock, so status, events and adds do not wait on the SD card.
+    frame = _read_rotation_frame_cache(target)
+    try:
+        data = None if frame else _read_rotation_item_image(target)
+    except OSError as e:
+        raise ValueError("Rotation item image is missing") from e
 
-        image = _load_rotation_item_image(target)
-        _rotation_state.next_index = (idx + 1) % len(_rotation_state.items)
-        _rotation_state.last_switch_ts = time.time()
+    with _rotation_lock:
+        # Removed while its files were read.
+        _find_rotation_item_locked(item_id)
+        _rotation_state.items.set_cursor_after(item_id)
+        _rotation_state.last_switch_ts = _rotation_clock.time()
         _persist_rotation_locked()
+    wake_rotation_scheduler()
 
-    with _display_lock:
-        show_image_on_epd(image)
-
-    return get_rotation_status()
+    status = publish_rotation_status()
+    if frame is None:
+        frame = render_image(data, ("frame",))["frame"]
+    run_display_job(None, "rotation", item_id=item_id, frame=frame)
+    return status
 
 
-def add_preview_to_rotation():
+def add_preview_to_rotation(playlist=""):
+    playlist = parse_playlist(playlist)
     with _preview_lock:
-        if _preview_display is None:
-            raise ValueError("No preview image available")
-        image = _preview_display.copy()
+        image, _ = _preview_snapshot_locked()
+    return _add_image_to_rotation(image, playlist)
+
 
+def _add_image_to_rotation(image, playlist=""):
     _ensure_rotation_dirs()
-    item_id = uuid.uuid4().hex
-    filename = f"{item_id}.png"
-    path = os.path.join(_ROTATION_ITEMS_DIR, filename)
-    image.save(path, format="PNG")
+    item = RotationItem(
+        item_id=_new_item_id(),
+        filename=_rotation_content_filename(image),
+        created_at=time.time(),
+        playlist=playlist,
+    )
+    _store_rotation_image(item, image)
 
-    with _rotation_lock:
-        _rotation_state.items.append(
-            RotationItem(item_id=item_id, filename=filename, created_at=time.time())
-        )
-        if len(_rotation_state.items) == 1:
-            _rotation_state.next_index = 0
-        _persist_rotation_locked()
-        count = len(_rotation_state.items)
+    try:
+        with _rotation_lock:
+            deduplicated = _append_rotation_item_locked(item)
+            count = len(_rotation_state.items)
+    finally:
+        _discard_staged_rotation_files(item)
+
+    wake_rotation_scheduler()
+    publish_rotation_status()
+    return {"item_id": item.item_id, "item_count": count, "deduplicated": deduplicated}
+
+
+def add_frame_to_rotation(frame, digest, image_png=None, thumb=None, playlist=""):
+    """Queue a frame rendered elsewhere (see `render` and `push`), storing the
+    given PNG, thumbnail and frame as they are; nothing is decoded.
 
-    return {"item_id": item_id, "item_count": count}
+    digest is the frame's SHA-256 hex, as decode_epd_file returns it; it
+    names the stored files, so identical frames share them. Without
+    image_png the queue image is made from the frame itself, and without
+    thumb the thumbnail is made on first request.
+    """
+    if image_png is not None and not image_png.startswith(b"\x89PNG\r\n\x1a\n"):
+        raise ValueError("Field 'image' must be a PNG")
+    if thumb is not None and not thumb.startswith(b"\xff\xd8"):
+        raise ValueError("Field 'thumb' must be a JPEG")
 
+    _ensure_rotation_dirs()
+    item = RotationItem(
+        item_id=_new_item_id(),
+        filename=f"{digest[:32]}.png",
+        created_at=time.time(),
+        playlist=playlist,
+    )
+
+    image_path, thumb_path, frame_path = _rotation_item_paths(item)
+    _stage_rotation_file(item, image_path, lambda staged: _write_rotation_file(image_png or _frame_png(frame), staged))
+    for data, path in ((thumb, thumb_path), (frame, frame_path)):
+        if data is not None:
+            _stage_rotation_file(item, path, lambda staged, data=data: _write_rotation_file(data, staged))
+    try:
+        with _rotation_lock:
+            deduplicated = _append_rotation_item_locked(item)
+            count = len(_rotation_state.items)
+    finally:
+        _discard_staged_rotation_files(item)
 
-def display_now(also_add=False):
+    wake_rotation_scheduler()
+    publish_rotation_status()
+    return {"item_id": item.item_id, "item_count": count, "deduplicated": deduplicated}
+
+
+def display_now(also_add=False, playlist=""):
     added = None
     if also_add:
-        added = add_preview_to_rotation()
+        added = add_preview_to_rotation(playlist)
     display_preview_buffer()
     return {"added": added}
 
 
-def _load_rotation_item_image(item):
-    path = os.path.join(_ROTATION_ITEMS_DIR, item.filename)
+def _parse_batch_operation(raw, has_upload):
+    op = str(raw.get("op", "")).strip().lower()
+    if op == "source":
+        mode = str(raw.get("mode", "")).strip().lower()
+        if mode not in ("upload", "url", "text"):
+            raise ValueError("mode must be upload, url or text")
+        if mode == "upload" and not has_upload:
+            raise ValueError("mode upload needs a multipart request with field 'photo'")
+        return op, dict(raw, mode=mode)
+    if op == "transform":
+        params = {key: raw[key] for key in ("rotation", "crop", "fill", "orientation") if key in raw}
+        if "fill" in params and not isinstance(params["fill"], bool):
+            params["fill"] = is_truthy(params["fill"])
+        return op, params
+    if op == "display":
+        return op, {}
+    if op == "add":
+        return op, {"playlist": parse_playlist(raw.get("playlist"))}
+    if op == "jump":
+        item_id = str(raw.get("item_id") or "").strip()
+        if not item_id:
+            raise ValueError("Missing item_id")
+        return op, {"item_id": item_id}
+    raise ValueError(f"op must be one of {', '.join(BATCH_OPERATIONS)}")
+
+
+def parse_batch(operations, has_upload=False):
+    """Validate a batch up front, so a bad operation fails it before any runs.
+
+    Returns [(op, params)]. At most one source is allowed, and source and
+    transform operations must come before display, add and jump.
+    """
+    if not isinstance(operations, list) or not operations:
+        raise ValueError("operations must be a non-empty list")
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise ValueError(f"At most {MAX_BATCH_OPERATIONS} operations per batch")
+    parsed = []
+    for index, raw in enumerate(operations, start=1):
+        try:
+            if not isinstance(raw, dict):
+                raise ValueError("must be an object")
+            op, params = _parse_batch_operation(raw, has_upload)
+            if op == "source" and any(seen == "source" for seen, _ in parsed):
+                raise ValueError("only one source per batch")
+            if op in ("source", "transform") and any(seen not in ("source", "transform") for seen, _ in parsed):
+                raise ValueError("source and transform must come before display, add and jump")
+        except ValueError as e:
+            raise ValueError(f"Operation {index}: {e}") from e
+        parsed.append((op, params))
+    return parsed
+
+
+def run_batch(operations, upload=None):
+    """Run operations from parse_batch in order; returns the preview state
+    (None if unchanged) and one result per operation.
+
+    The source is loaded first. It and all transforms are then applied in
+    one hold of the preview lock and rendered once, and display and add use
+    that very preview, whatever other clients change in the meantime.
+    """
+    source = next((params for op, params in operations if op == "source"), None)
+    transforms = [params for op, params in operations if op == "transform"]
+    needs_preview = any(op in ("display", "add") for op, _ in operations)
+    prepared = None
+    if source is not None:
+        prepared = _prepare_preview_source(*load_preview_source(source, upload))
+
+    state = snapshot = None
+    if prepared is not None or transforms or needs_preview:
+        with _preview_lock:
+            if prepared is not None:
+                _install_preview_source_locked(prepared, source.get("orientation"))
+            for params in transforms:
+                _update_preview_state_locked(**params)
+            if prepared is not None or transforms:
+                state = _rebuild_preview_locked()
+            if needs_preview:
+                snapshot = _preview_snapshot_locked()
+
+    results = []
+    for index, (op, params) in enumerate(operations, start=1):
+        result = {"op": op}
+        try:
+            if op == "display":
+                _display_preview_image(*snapshot)
+            elif op == "add":
+                result.update(_add_image_to_rotation(snapshot[0], params["playlist"]))
+            elif op == "jump":
+                jump_to_rotation_item(params["item_id"])
+                result["item_id"] = params["item_id"]
+        except ValueError as e:
+            raise ValueError(f"Operation {index}: {e}") from e
+        results.append(result)
+    return {"state": state, "results": results}
+
+
+def parse_import_settings(fields):
+    """Default transform for every file in a bulk import, from form fields."""
+    return {
+        "rotation": parse_rotation(fields.get("rotation", 0)),
+        "crop": parse_crop(fields.get("crop", 1.0)),
+        "fill": is_truthy(fields.get("fill", "")),
+        "orientation": parse_orientation(fields.get("orientation")),
+    }
+
+
+def _is_import_image_name(name):
+    base = os.path.basename(name)
+    return not base.startswith(".") and base.lower().endswith(IMPORT_IMAGE_EXTENSIONS)
+
+
+def collect_import_files(uploads, extract_dir=None):
+    """Expand uploaded (filename, path) pairs, including zip archives, into
+    [(name, read)] where read() returns the image bytes, or with extract_dir
+    the path of the file (zip members are extracted there on demand)."""
+    import zipfile
+
+    files = []
+    for filename, path in uploads:
+        name = filename or "upload"
+        if zipfile.is_zipfile(path):
+            try:
+                archive = zipfile.ZipFile(path)
+            except zipfile.BadZipFile as e:
+                raise ValueError(f"Invalid zip archive: {name}") from e
+            for info in archive.infolist():
+                if info.is_dir() or info.filename.startswith("__MACOSX/") or not _is_import_image_name(info.filename):
+                    continue
+                files.append(
+                    (info.filename, lambda archive=archive, info=info: _read_zip_member(archive, info, extract_dir))
+                )
+        elif os.path.getsize(path):
+            files.append((name, (lambda path=path: path) if extract_dir else _file_reader(path)))
+        if len(files) > MAX_IMPORT_FILES:
+            raise ValueError(f"Too many files (max {MAX_IMPORT_FILES})")
+    return files
+
+
+def _read_zip_member(archive, info, extract_dir=None):
+    if info.file_size > MAX_UPLOAD_BYTES:
+        raise ValueError(f"File too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)")
+    with archive.open(info) as f:
+        if extract_dir is None:
+            data = f.read(MAX_UPLOAD_BYTES + 1)
+            size = len(data)
+        else:
+            import tempfile
+
+            fd, path = tempfile.mkstemp(dir=extract_dir)
+            size = 0
+            with os.fdopen(fd, "wb") as out:
+                # The header's file_size is not trusted; stop one byte past the limit.
+                while size <= MAX_UPLOAD_BYTES:
+                    chunk = f.read(65536)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+                    size += len(chunk)
+    if size > MAX_UPLOAD_BYTES:
+        raise ValueError(f"File too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)")
+    return data if extract_dir is None else path
+
+
+def _import_source_bytes(source):
+    """Image bytes of an import file handed to a worker as bytes or as a path."""
+    if not isinstance(source, str):
+        return source
+    with open(source, "rb") as f:
+        data = f.read(MAX_UPLOAD_BYTES + 1)
+    # Spooled copies are read once; free their disk space as the import goes.
+    os.remove(source)
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise ValueError(f"File too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)")
+    return data
+
+
+def _import_rotation_image(source, settings):
+    """Process pool worker: render one file into stored image, thumbnail and
+    frame files; returns its (not yet queued) RotationItem. source is the
+    file's bytes or the path of a spooled copy, which is removed once read."""
+    image = render_display_image(load_image_from_bytes(_import_source_bytes(source)), **settings)
+    item = RotationItem(
+        item_id=_new_item_id(),
+        filename=_rotation_content_filename(image),
+        created_at=time.time(),
+    )
+    _store_rotation_image(item, image, with_frame=True)
+    return item
+
+
+def import_rotation_images(files, settings, workers=None, playlist=""):
+    """Render files in a process pool and append them to the queue in upload order.
+
+    Yields one progress dict per file, then a summary with "done": True.
+    Nothing here touches the preview state.
+    """
+    _ensure_rotation_dirs()
+    total = len(files)
+    workers = max(1, min(workers or os.cpu_count() or 1, total or 1))
+    pending = deque()
+    imported = failed = 0
+    source = iter(enumerate(files))
+
+    def submit(pool):
+        index, (name, read) = next(source)
+        try:
+            future = pool.submit(_import_rotation_image, read(), settings)
+        except Exception as e:
+            future = e
+        pending.append((index, name, future))
+
+    with process_pool(workers) as pool:
+        try:
+            while True:
+                # Keep a small window in flight so memory stays bounded.
+                while len(pending) < workers * 2:
+                    try:
+                        submit(pool)
+                    except StopIteration:
+                        break
+                if not pending:
+                    break
+                index, name, future = pending.popleft()
+                progress = {"index": index, "total": total, "file": name}
+                try:
+                    if isinstance(future, Exception):
+                        raise future
+                    item = future.result()
+                    item.playlist = playlist
+                    try:
+                        with _rotation_lock:
+                            deduplicated = _append_rotation_item_locked(item)
+                    finally:
+                        _discard_staged_rotation_files(item)
+                except Exception as e:
+                    failed += 1
+                    yield dict(progress, ok=False, error=str(e))
+                    continue
+                imported += 1
+                yield dict(progress, ok=True, item_id=item.item_id, deduplicated=deduplicated)
+        finally:
+            # Client went away mid-import: drop files staged for items that were never queued.
+            for _, _, future in pending:
+                if not isinstance(future, Exception):
+                    future.cancel()
+            pool.shutdown(wait=True)
+            for _, _, future in pending:
+                if isinstance(future, Exception) or future.cancelled() or future.exception() is not None:
+                    continue
+                _discard_staged_rotation_files(future.result())
+            if imported:
+                wake_rotation_scheduler()
+                publish_rotation_status()
+
+    with _rotation_lock:
+        count = len(_rotation_state.items)
+    yield {"done": True, "imported": imported, "failed": failed, "item_count": count}
+
+
+def collect_render_inputs(paths):
+    """[(name, read)] for image files, zip archives and directories (searched
+    recursively) named on the `render` command line."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                for name in sorted(names):
+                    if _is_import_image_name(name):
+                        full = os.path.join(root, name)
+                        files.append((os.path.relpath(full, path), _file_reader(full)))
+        elif path.lower().endswith(".zip"):
+            files.extend(collect_import_files([(os.path.basename(path), path)]))
+        else:
+            files.append((os.path.basename(path), _file_reader(path)))
+    return files
+
+
+def _file_reader(path):
+    def read():
+        with open(path, "rb") as f:
+            return f.read()
+
+    return read
+
+
+def _render_frame_file(data, settings, prefix):
+    """Process pool worker: render one file into prefix.epd, .png and .jpg."""
+    image = render_display_image(load_image_from_bytes(data), **settings)
+    _write_rotation_file(encode_epd_file(prepare_frame(image)), f"{prefix}.epd")
+    buf = io.BytesIO()
+    image.save(buf, format="PNG")
+    _write_rotation_file(buf.getvalue(), f"{prefix}.png")
+    _write_rotation_thumb(image, f"{prefix}.jpg")
+
+
+def render_frame_files(files, settings, output_dir, workers=None):
+    """Render files in a process pool into output_dir, each as a packed frame
+    (.epd), panel image (.png) and thumbnail (.jpg) named after its input
+    and numbered in input order. Yields one progress dict per file."""
+    os.makedirs(output_dir, exist_ok=True)
+    total = len(files)
+    digits = len(str(total))
+    workers = max(1, min(workers or os.cpu_count() or 1, total or 1))
+    pending = deque()
+    source = iter(enumerate(files))
+
+    with process_pool(workers) as pool:
+        while True:
+            # Keep a small window in flight so memory stays bounded.
+            while len(pending) < workers * 2:
+                try:
+                    index, (name, read) = next(source)
+                except StopIteration:
+                    break
+                stem = re.sub(r"[^A-Za-z0-9._-]+", "_", os.path.splitext(os.path.basename(name))[0])[:64]
+                stem = f"{index + 1:0{digits}d}-{stem or 'image'}"
+                try:
+                    future = pool.submit(_render_frame_file, read(), settings, os.path.join(output_dir, stem))
+                except Exception as e:
+                    future = e
+                pending.append((index, name, stem, future))
+            if not pending:
+                break
+            index, name, stem, future = pending.popleft()
+            progress = {"index": index, "total": total, "file": name}
+            try:
+                if isinstance(future, Exception):
+                    raise future
+                future.result()
+            except Exception as e:
+                yield dict(progress, ok=False, error=str(e))
+                continue
+            yield dict(progress, ok=True, output=stem)
+
+
+def _encode_multipart(fields, files):
+    """(content type, body) of a multipart/form-data request; files are
+    (name, filename, bytes)."""
+    import uuid
+
+    boundary = uuid.uuid4().hex
+    chunks = []
+    for name, value in fields.items():
+        chunks.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, filename, data in files:
+        head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        )
+        chunks.append(head.encode() + data + b"\r\n")
+    chunks.append(f"--{boundary}--\r\n".encode())
+    return f"multipart/form-data; boundary={boundary}", b"".join(chunks)
+
+
+def push_frame_files(directory, server, playlist=""):
+    """Upload `render` output in directory to a running server's rotation
+    queue, in file name order. Yields one result dict per frame."""
+    import urllib.error
+    import urllib.request
+
+    url = server.rstrip("/") + "/api/rotation/push"
+    for name in sorted(n for n in os.listdir(directory) if n.endswith(".epd")):
+        prefix = os.path.join(directory, name[: -len(".epd")])
+        try:
+            files = [
+                ("frame", name, _file_reader(f"{prefix}.epd")()),
+                ("image", "image.png", _file_reader(f"{prefix}.png")()),
+            ]
+            if os.path.exists(f"{prefix}.jpg"):
+                files.append(("thumb", "thumb.jpg", _file_reader(f"{prefix}.jpg")()))
+            content_type, body = _encode_multipart({"playlist": playlist}, files)
+            request = urllib.request.Request(url, data=body, headers={"Content-Type": content_type}, method="POST")
+            with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT_SECONDS) as response:
+                payload = json.load(response)
+        except urllib.error.HTTPError as e:
+            try:
+                payload = json.load(e)
+            except ValueError:
+                payload = {"ok": False, "error": f"HTTP {e.code}"}
+        except OSError as e:
+            payload = {"ok": False, "error": str(e)}
+        if payload.get("ok"):
+            yield dict(payload["added"], file=name, ok=True)
+        else:
+            yield {"file": name, "ok": False, "error": payload.get("error", "Push failed")}
+
+
+def _scan_watch_dir(root):
+    """Map relative path -> (mtime_ns, size) for every image under root."""
+    found = {}
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        with os.scandir(os.path.join(root, rel)) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                path = os.path.join(rel, entry.name) if rel else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(path)
+                elif entry.is_file() and _is_import_image_name(entry.name):
+                    st = entry.stat()
+                    found[path] = (st.st_mtime_ns, st.st_size)
+    return found
+
+
+def _read_watch_file(path):
     with open(path, "rb") as f:
-        data = f.read()
-    return load_image_from_bytes(data)
+        data = f.read(MAX_UPLOAD_BYTES + 1)
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise ValueError(f"File too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)")
+    return data
+
+
+def _drop_watch_items_locked(item_ids):
+    present = [item_id for item_id in item_ids if _rotation_state.items.get(item_id) is not None]
+    if present:
+        _delete_rotation_items_locked(present)
+    return len(present)
+
+
+def sync_watch_folder():
+    """Bring the queue in line with the watched directory.
+
+    Only files whose (mtime, size) changed since the last scan are rendered;
+    deleted files drop out of the queue. Returns a summary, or None when no
+    directory is bound or it cannot be read (e.g. an unmounted share), in
+    which case the queue is left alone.
+    """
+    with _watch_lock:
+        with _rotation_lock:
+            root = _rotation_state.watch_dir
+            settings = dict(_rotation_state.watch_transform)
+            indexed = {
+                path: (mtime_ns, size, item_id)
+                for path, mtime_ns, size, item_id in _rotation_db_locked().execute(
+                    "SELECT path, mtime_ns, size, item_id FROM watch_files"
+                )
+            }
+        if not root:
+            return None
+
+        started = time.time()
+        try:
+            found = _scan_watch_dir(root)
+        except OSError as e:
+            _watch_status.update(error=str(e), last_scan_ts=started)
+            print(f"[watch] cannot scan {root}: {e}")
+            return None
+
+        changed = sorted(path for path, sig in found.items() if indexed.get(path, (None, None))[:2] != sig)
+        deleted = [path for path in indexed if path not in found]
+        stale = [indexed[path][2] for path in deleted + changed if path in indexed]
+
+        removed = 0
+        if stale or deleted:
+            with _rotation_lock:
+                if _rotation_state.watch_dir != root:
+                    return None
+                removed = _drop_watch_items_locked(stale)
+                _rotation_db_write_locked([("DELETE FROM watch_files WHERE path = ?", (path,)) for path in deleted])
+
+        added = failed = 0
+        if changed:
+            files = [(path, lambda path=path: _read_watch_file(os.path.join(root, path))) for path in changed]
+            progress_iter = import_rotation_images(files, parse_import_settings(settings))
+            for progress in progress_iter:
+                if progress.get("done"):
+                    break
+                path = progress["file"]
+                mtime_ns, size = found[path]
+                # Failures are recorded too, so a broken file is retried only once it changes.
+                with _rotation_lock:
+                    if _rotation_state.watch_dir != root or _rotation_state.watch_transform != settings:
+                        # Rebound mid-index: this item belongs to the old binding.
+                        _drop_watch_items_locked([progress.get("item_id", "")])
+                        progress_iter.close()
+                        return None
+                    # An item removed while the scan ran is left out like any other removed item.
+                    item_id = progress.get("item_id", "")
+                    if _rotation_state.items.get(item_id) is None:
+                        item_id = ""
+                    _rotation_db_write_locked(
+                        [
+                            (
+                                "INSERT OR REPLACE INTO watch_files (path, mtime_ns, size, item_id) VALUES (?, ?, ?, ?)",
+                                (path, mtime_ns, size, item_id),
+                            )
+                        ]
+                    )
+                if progress["ok"]:
+                    added += 1
+                else:
+                    failed += 1
+                    print(f"[watch] skipped {path}: {progress['error']}")
+        elif removed:
+            wake_rotation_scheduler()
+            publish_rotation_status()
+
+        _watch_status.update(
+            files=len(found),
+            last_scan_ts=started,
+            scan_seconds=round(time.time() - started, 3),
+            error=None,
+        )
+        return {"files": len(found), "added": added, "removed": removed, "failed": failed}
+
+
+def set_watch_folder(path, transform=None):
+    """Bind the rotation queue to a directory ("" unbinds).
+
+    Items from a previously bound directory are removed; the new directory is
+    indexed in the background by the watch worker.
+    """
+    path = str(path or "").strip()
+    if path:
+        path = os.path.realpath(os.path.expanduser(path))
+        if not os.path.isdir(path):
+            raise ValueError("Watch folder does not exist")
+    transform = parse_import_settings(transform or {})
+
+    # Not under _watch_lock: a running scan notices the change and stops.
+    with _rotation_lock:
+        if path != _rotation_state.watch_dir:
+            item_ids = [row[0] for row in _rotation_db_locked().execute("SELECT item_id FROM watch_files")]
+            _drop_watch_items_locked(item_ids)
+            _rotation_db_write_locked([("DELETE FROM watch_files", ())])
+            _watch_status.update(files=0, last_scan_ts=0.0, scan_seconds=None, error=None)
+        elif transform != _rotation_state.watch_transform:
+            # Same folder, new transform: re-render the queued files on the next scan.
+            _rotation_db_write_locked([("UPDATE watch_files SET mtime_ns = -1 WHERE item_id != ''", ())])
+        _rotation_state.watch_dir = path
+        _rotation_state.watch_transform = transform
+        # Written now rather than on the next sync so the binding always
+        # matches the watch_files index after a crash.
+        _persist_rotation_locked()
+        _flush_rotation_settings_locked()
+
+    _watch_wake.set()
+    wake_rotation_scheduler()
+    return publish_rotation_status()
+
+
+def _rotation_watch_worker():
+    while not _rotation_stop.is_set():
+        try:
+            summary = sync_watch_folder()
+            if summary and (summary["added"] or summary["removed"]):
+                print(f"[watch] {summary}")
+        except Exception as e:
+            # Database, disk or import pool trouble: keep the thread and retry on the next scan.
+            print(f"[watch] failed to sync folder: {e!r}")
+        _watch_wake.wait(WATCH_SCAN_SECONDS)
+        _watch_wake.clear()
+
+
+def _find_rotation_item_locked(item_id):
+    target = _rotation_state.items.get(item_id)
+    if target is None:
+        raise ValueError("Rotation item not found")
+    return target
+
+
+def _read_rotation_item_image(item):
+    with open(os.path.join(_ROTATION_ITEMS_DIR, item.filename), "rb") as f:
+        return f.read()
+
+
+def _load_rotation_item_image(item):
+    return load_image_from_bytes(_read_rotation_item_image(item))
 
 
 def get_rotation_item_png(item_id):
@@ -829,13 +3874,7 @@ def get_rotation_item_png(item_id):
         raise ValueError("Missing item_id")
 
     with _rotation_lock:
-        target = None
-        for item in _rotation_state.items:
-            if item.item_id == item_id:
-                target = item
-                break
-        if target is None:
-            raise ValueError("Rotation item not found")
+        target = _find_rotation_item_locked(item_id)
         path = os.path.join(_ROTATION_ITEMS_DIR, target.filename)
 
     try:
@@ -844,53 +3883,193 @@ def get_rotation_item_png(item_id):
     except OSError as e:
         raise ValueError("Rotation item image is missing") from e
 
-    return data
+    return data
+
+
+def get_rotation_item_thumb(item_id):
+    """Return JPEG thumbnail bytes for an item, building it lazily for older items."""
+    item_id = str(item_id or "").strip()
+    if not item_id:
+        raise ValueError("Missing item_id")
+
+    with _rotation_lock:
+        target = _find_rotation_item_locked(item_id)
+
+    path = _rotation_thumb_path(target)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        metric_inc("epaper_cache_requests_total", cache="thumbnail", result="hit")
+        return data
+    except OSError:
+        pass
+    metric_inc("epaper_cache_requests_total", cache="thumbnail", result="miss")
+
+    try:
+        image = _load_rotation_item_image(target)
+    except OSError as e:
+        raise ValueError("Rotation item image is missing") from e
+    _ensure_rotation_dirs()
+    return _write_rotation_thumb(image, path)
+
+
+def _read_rotation_frame_cache(item):
+    """item's cached packed frame, or None."""
+    try:
+        with open(_rotation_frame_path(item), "rb") as f:
+            frame = f.read()
+        if len(frame) == FRAME_BYTES:
+            metric_inc("epaper_cache_requests_total", cache="frame", result="hit")
+            return frame
+    except OSError:
+        pass
+    metric_inc("epaper_cache_requests_total", cache="frame", result="miss")
+    return None
+
+
+def _prepare_rotation_frame(item):
+    """Packed panel buffer for an item, from the frame cache when present."""
+    frame = _read_rotation_frame_cache(item)
+    if frame is not None:
+        return frame
+    frame = render_image(_read_rotation_item_image(item), ("frame",))["frame"]
+    try:
+        _ensure_rotation_dirs()
+        _write_rotation_file(frame, _rotation_frame_path(item))
+    except OSError as e:
+        print(f"[rotation] failed to cache frame for item={item.item_id}: {e}")
+    return frame
+
+
+def _display_rotation_item(item, frame=None):
+    status = publish_rotation_status()
+    try:
+        if frame is None:
+            frame = _prepare_rotation_frame(item)
+        run_display_job(None, "rotation", item_id=item.item_id, frame=frame)
+        metric_inc("epaper_rotation_switches_total")
+        print(f"[rotation] displayed item={item.item_id} next_index={status['next_index']}")
+    except Exception as e:
+        metric_inc("epaper_rotation_failures_total")
+        print(f"[rotation] failed to display item={item.item_id}: {e}")
+
+
+class RotationScheduler:
+    """Sleeps until the next rotation switch is due.
+
+    State changes call wake() so the schedule is re-planned immediately;
+    with rotation disabled the thread blocks without a timeout. The next
+    item's panel buffer is prepared up to ROTATION_PREPARE_LEAD_SECONDS
+    before it is due, so the SPI transfer starts on schedule. The clock,
+    prepare and display callbacks are injectable so a day of rotation can
+    be simulated without waiting or hardware.
+    """
+
+    def __init__(self, clock=None, display=None, prepare=None):
+        self.clock = clock or _rotation_clock
+        self.display = display or _display_rotation_item
+        self.prepare = prepare or _prepare_rotation_frame
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._prepared = None  # (item_id, frame or None if preparing failed)
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def tick(self):
+        """Switch if a switch is due. Returns (selected_item, next_due_ts, upcoming_item)."""
+        with _rotation_lock:
+            now = self.clock.time()
+            due_at = _next_rotation_due_locked(now)
+            if due_at is None or now < due_at:
+                upcoming = None
+                if due_at is not None:
+                    upcoming = _rotation_state.items.peek(_rotation_slot_locked(due_at, now)[0])
+                return None, due_at, upcoming
+            playlist, interval = _rotation_slot_locked(now)
+            selected = _rotation_state.items.advance(playlist)
+            # Record the scheduled time rather than now, so lateness does not
+            # accumulate; resync after long stalls (e.g. a suspended clock).
+            late = now - due_at
+            _rotation_state.last_switch_ts = now if due_at <= 0 or late >= interval else due_at
+            _persist_rotation_locked()
+            return selected, _next_rotation_due_locked(now), None
+
+    def _take_prepared(self, item):
+        prepared, self._prepared = self._prepared, None
+        if prepared is not None and prepared[0] == item.item_id:
+            return prepared[1]
+        return None
+
+    def _prepare_ahead(self, item):
+        try:
+            frame = self.prepare(item)
+        except Exception as e:
+            print(f"[rotation] failed to prepare item={item.item_id}: {e}")
+            frame = None
+        self._prepared = (item.item_id, frame)
+
+    def run(self):
+        while not self._stop.is_set():
+            # Clear before reading state so a change made during tick() wakes us.
+            self._wake.clear()
+            selected, due_at, upcoming = self.tick()
+            if selected is not None:
+                self.display(selected, self._take_prepared(selected))
+                continue
+            if due_at is None:
+                self._prepared = None
+                self.clock.wait(self._wake, None)
+                continue
+            remaining = due_at - self.clock.time()
+            if upcoming is not None and (self._prepared is None or self._prepared[0] != upcoming.item_id):
+                if remaining <= ROTATION_PREPARE_LEAD_SECONDS:
+                    self._prepare_ahead(upcoming)
+                    continue
+                # Wake early enough to prepare the frame before it is due.
+                remaining -= ROTATION_PREPARE_LEAD_SECONDS
+            self.clock.wait(self._wake, max(0.0, remaining))
+
 
+def wake_rotation_scheduler():
+    if _rotation_scheduler is not None:
+        _rotation_scheduler.wake()
 
-def _rotation_worker():
-    while not _rotation_stop.wait(1.0):
-        selected = None
-        with _rotation_lock:
-            if _rotation_state.enabled and _rotation_state.items:
-                now = time.time()
-                due = (
-                    _rotation_state.last_switch_ts <= 0
-                    or (now - _rotation_state.last_switch_ts) >= _rotation_state.interval_seconds
-                )
-                if due:
-                    _rotation_state.next_index %= len(_rotation_state.items)
-                    selected = _rotation_state.items[_rotation_state.next_index]
-                    _rotation_state.next_index = (_rotation_state.next_index + 1) % len(
-                        _rotation_state.items
-                    )
-                    _rotation_state.last_switch_ts = now
-                    _persist_rotation_locked()
 
-        if not selected:
-            continue
+def _rotation_sync_worker():
+    import sqlite3
 
+    while not _rotation_stop.wait(ROTATION_SYNC_SECONDS):
         try:
-            image = _load_rotation_item_image(selected)
-            with _display_lock:
-                show_image_on_epd(image)
-            print(
-                f"[rotation] displayed item={selected.item_id} next_index={get_rotation_status()['next_index']}"
-            )
-        except Exception as e:
-            print(f"[rotation] failed to display item={selected.item_id}: {e}")
+            sync_rotation_state()
+        except sqlite3.Error as e:
+            print(f"[rotation] failed to sync state: {e}")
 
 
 def start_rotation_worker():
-    global _rotation_thread
+    global _rotation_scheduler, _rotation_thread, _rotation_sync_thread, _watch_thread
     if _rotation_thread and _rotation_thread.is_alive():
         return
     _rotation_stop.clear()
-    _rotation_thread = threading.Thread(target=_rotation_worker, name="rotation-worker", daemon=True)
+    _rotation_scheduler = RotationScheduler()
+    _rotation_thread = threading.Thread(target=_rotation_scheduler.run, name="rotation-worker", daemon=True)
     _rotation_thread.start()
+    _rotation_sync_thread = threading.Thread(target=_rotation_sync_worker, name="rotation-sync", daemon=True)
+    _rotation_sync_thread.start()
+    _watch_thread = threading.Thread(target=_rotation_watch_worker, name="rotation-watch", daemon=True)
+    _watch_thread.start()
 
 
 def stop_rotation_worker():
     _rotation_stop.set()
+    _watch_wake.set()
+    if _rotation_scheduler is not None:
+        _rotation_scheduler.stop()
+    sync_rotation_state()
 
 
 API_DOCS_HTML = """<!DOCTYPE html>
@@ -908,17 +4087,62 @@ API_DOCS_HTML = """<!DOCTYPE html>
 </head>
 <body>
   <h1>e-Paper Photo API</h1>
-  <p>All responses are JSON except <code>GET /api/preview/image</code> and <code>GET /api/rotation/item_image</code>.</p>
+  <p>All responses are JSON except <code>GET /api/preview/image</code>, <code>GET /api/preview/source_image</code>, <code>GET /api/rotation/item_image</code>, <code>GET /api/rotation/item_thumb</code>, <code>GET /api/metrics</code> and <code>GET /api/events</code>.</p>
 
   <h2>GET /api/status</h2>
   <pre>curl http://localhost:5000/api/status</pre>
-
-  <h2>GET /api/rotation/status</h2>
-  <pre>curl http://localhost:5000/api/rotation/status</pre>
+  <p><code>preview_memory</code> reports the bytes held by the preview source, panel frame and PNG
+  against the budget (<code>EPAPER_PREVIEW_MEMORY_MB</code>), the stored
+  <code>source_size</code>, and <code>original_size</code> when a full-resolution upload is kept
+  on disk. <code>rotation</code> is the rotation summary, without the item list.</p>
+
+  <h2>GET /api/rotation/status?offset=0&amp;limit=50</h2>
+  <pre>curl "http://localhost:5000/api/rotation/status?limit=50&amp;around=next"</pre>
+  <p>Rotation settings, schedule and progress with the queued items. Without parameters every
+  item is listed; <code>offset</code> and <code>limit</code> (up to 500) return a window,
+  <code>around=next</code> centres it on the next item, <code>playlist</code> lists only that
+  playlist's items (empty for untagged ones) and <code>summary=1</code> leaves the items out.
+  Each item has its queue <code>index</code>; <code>items_offset</code> and
+  <code>items_total</code> describe the window. <code>queue_version</code> changes whenever
+  items are added, removed or retagged, so a client can keep the pages it has loaded until then.
+  Responses of the other rotation endpoints carry the summary only.</p>
 
   <h2>GET /api/rotation/item_image?id=&lt;item_id&gt;</h2>
   <p>Returns PNG bytes for a queued rotation item image.</p>
 
+  <h2>GET /api/rotation/item_thumb?id=&lt;item_id&gt;</h2>
+  <p>Returns a small JPEG thumbnail for a queued rotation item (long-lived cache headers).</p>
+
+  <h2>GET /api/metrics</h2>
+  <p>Prometheus text format: request counts and latency per route, pipeline stage durations
+  (fetch, decode, transform, format, quantize, spi, refresh), display lock wait, rotation
+  switches and failures, cache hits and misses (fetch, decoded, frame, thumbnail), queue length,
+  preview memory and process RSS, and render worker crashes and timeouts. Stages run inside bulk import
+  workers are not included; stages run in the render worker are.</p>
+
+  <h2>GET /api/debug/memory?top=15&amp;group=lineno</h2>
+  <p>Memory report for tracking down growth: process RSS, the render worker's pid and RSS,
+  preview memory, and entries and sizes
+  of the in-memory caches (decoded images, rendered texts, event log, rotation queue, prepared
+  frame, ...). When allocation tracing is on it also lists the <code>top</code> allocation sites
+  (grouped by <code>lineno</code>, <code>filename</code> or <code>traceback</code>) and
+  <code>diff</code>, the biggest changes since the previous call. Pillow allocates pixel data
+  outside the Python allocator, so images only show up in the structure sizes and RSS.</p>
+
+  <h2>POST /api/debug/memory</h2>
+  <pre>{"tracing": true, "frames": 1}</pre>
+  <p>Start or stop <code>tracemalloc</code> allocation tracing (<code>frames</code> per
+  allocation, up to 25). Tracing slows allocations and uses memory itself, so it is off unless
+  started here or with <code>EPAPER_TRACEMALLOC=&lt;frames&gt;</code>; while off, nothing is
+  recorded.</p>
+
+  <h2>GET /api/events</h2>
+  <p>Server-Sent Events stream. Event types: <code>rotation</code> (rotation status summary),
+  <code>preview</code> (preview state and version), <code>display</code> (display job
+  <code>queued</code>/<code>started</code>/<code>done</code>/<code>failed</code>), and
+  <code>resync</code> when a client fell behind and should refetch status.</p>
+  <pre>curl -N http://localhost:5000/api/events</pre>
+
   <h2>POST /api/preview/source</h2>
   <p>Set source image from one of:</p>
   <ul>
@@ -926,31 +4150,136 @@ API_DOCS_HTML = """<!DOCTYPE html>
     <li>JSON: <code>{"mode":"url","url":"https://..."}</code></li>
     <li>JSON: <code>{"mode":"text","text":"hello","font_size":72}</code></li>
   </ul>
+  <p>Decoding and rendering run in a separate render worker process; if it crashes on an
+  image or takes longer than 60 seconds, the request fails with 400 and a fresh worker
+  takes the next one.</p>
 
   <h2>POST /api/preview/transform</h2>
   <p>Update preview transform:</p>
   <pre>{"rotation":90,"crop":0.85,"fill":false,"orientation":"landscape"}</pre>
+  <p>Transforms sent while the preview is rendering are merged, the latest value of each field
+  winning, and rendered once; a render that newer transforms arrive during is discarded. Every
+  request gets the state that includes its change, so a burst of edits costs about two renders.</p>
 
   <h2>GET /api/preview/image</h2>
   <p>Returns PNG bytes for current preview buffer.</p>
 
+  <h2>GET /api/preview/source_image</h2>
+  <p>Returns a JPEG of the preview source, untransformed and at most 1600 px on the long edge.
+  The web UI applies rotation, crop and fill to it on a canvas while you edit and sends the
+  final transform only with Display Now or Add (as a <code>/api/batch</code>), so editing costs
+  no server rendering. Preview states carry its URL as <code>source_url</code>; it changes
+  with every new source.</p>
+
   <h2>POST /api/display</h2>
   <p>Push current preview buffer to e-paper display.</p>
 
+  <h2>POST /api/display/raw</h2>
+  <pre>curl --data-binary @frame.epd -H 'Content-Type: application/octet-stream' http://localhost:5000/api/display/raw
+curl --data-binary @frame.bin -H "X-Frame-SHA256: $(sha256sum frame.bin | cut -d' ' -f1)" \
+  -H 'Content-Type: application/octet-stream' http://localhost:5000/api/display/raw</pre>
+  <p>Send a panel-ready frame straight to the display: the body is an <code>.epd</code> file (as
+  written by <code>display_photo.py render</code>) or a bare 960,000-byte frame (1200x1600, two
+  4-bit palette indices per byte, high nibble first, as the driver's <code>getbuffer</code> packs
+  them) with its SHA-256 in <code>X-Frame-SHA256</code>. The size, palette indices and checksum
+  are checked (index 4, the driver's unused second black, is rejected); nothing is decoded,
+  converted or quantized.</p>
+
   <h2>POST /api/clear</h2>
   <p>Clear the e-paper display.</p>
 
+  <h2>POST /api/batch</h2>
+  <pre>{"operations":[{"op":"source","mode":"url","url":"https://...","orientation":"portrait"},
+  {"op":"transform","rotation":90},{"op":"transform","crop":0.8},
+  {"op":"display"},{"op":"add","playlist":"day"}]}</pre>
+  <p>Run several steps as one request. Operations are <code>source</code> (fields as for
+  <code>/api/preview/source</code>, with <code>"mode":"upload"</code> for a multipart
+  <code>photo</code>), <code>transform</code> (fields as for <code>/api/preview/transform</code>),
+  <code>display</code>, <code>add</code> (optional <code>playlist</code>) and <code>jump</code>
+  (<code>item_id</code>). At most one source, up to 32 operations; source and transforms come
+  first. The whole batch is checked before anything runs. The source and transforms are applied
+  together and the preview is rendered once, and display and add use that preview even if another
+  client changes it meanwhile. With an upload, send multipart with <code>photo</code> and an
+  <code>operations</code> field holding the JSON list. The response has <code>state</code>
+  (the new preview state, or null), one entry per operation in <code>results</code>, and the
+  rotation summary. A failing operation fails the request with 400 and names its number;
+  operations before it have already run.</p>
+
   <h2>POST /api/rotation/toggle</h2>
   <pre>{"enabled": true}</pre>
 
   <h2>POST /api/rotation/settings</h2>
   <pre>{"interval_seconds": 900}</pre>
+  <p>Set <code>"align_to_clock": true</code> to switch on wall-clock boundaries
+  (e.g. every hour on the hour with <code>3600</code>) instead of counting from the last switch.
+  Boundaries are counted from local midnight.</p>
+  <p>The next frame is prepared shortly before it is due, so the panel transfer starts on
+  schedule. In <code>/api/rotation/status</code>, <code>next_switch_ts</code> is when the
+  transfer starts and <code>next_in_seconds</code> includes the measured
+  <code>refresh_seconds</code>, i.e. when the image actually appears.</p>
+
+  <h2>POST /api/rotation/schedule</h2>
+  <pre>{"rules": [
+  {"name": "night", "start": "23:00", "end": "07:00", "quiet": true},
+  {"name": "weekend", "start": "07:00", "end": "23:00", "days": ["sat", "sun"], "playlist": "family"},
+  {"name": "day", "start": "07:00", "end": "19:00", "playlist": "day", "interval_seconds": 1800}
+]}</pre>
+  <p>Time-of-day rules in local time. A rule runs from <code>start</code> to <code>end</code>
+  (past midnight when <code>end</code> is earlier; equal times mean all day) on the weekdays in
+  <code>days</code> (<code>0</code>-<code>6</code> from Monday or <code>mon</code>..<code>sun</code>,
+  default every day), matched on the day it starts. Where rules overlap the earlier one wins;
+  outside all rules the whole queue rotates at the default interval. Quiet rules stop refreshes
+  entirely; other rules rotate only items tagged with their <code>playlist</code> (all items when
+  empty), optionally at their own <code>interval_seconds</code>. When a rule changes what is
+  shown, the switch happens at its start; rules with no matching items are skipped. The rule in
+  effect is reported as <code>schedule_active</code> in rotation status.
+  <code>{"rules": []}</code> removes the schedule.</p>
+
+  <h2>POST /api/rotation/playlist</h2>
+  <pre>{"item_id":"abc123...", "playlist": "day"}</pre>
+  <p>Tag a queued item with a playlist (<code>""</code> untags it).</p>
 
   <h2>POST /api/rotation/add</h2>
-  <p>Add current preview buffer to rotation playlist.</p>
+  <pre>{"playlist": "day"}</pre>
+  <p>Add current preview buffer to rotation playlist, optionally tagged with a schedule
+  playlist (the body may be omitted). Images are stored by content hash, so
+  adding an identical frame again shares storage and caches; the response then has
+  <code>"deduplicated": true</code> in <code>added</code>.</p>
+
+  <h2>POST /api/rotation/import</h2>
+  <p>Bulk add images to the rotation queue without touching the preview. Multipart upload
+  with any number of image files and/or zip archives, plus optional default transform fields
+  <code>orientation</code>, <code>rotation</code>, <code>crop</code> and <code>fill</code>, and a
+  <code>playlist</code> to tag the imported items with.
+  The upload is spooled to disk as it arrives, not held in memory.
+  Files are rendered in parallel; the response streams one JSON object per line as each file
+  finishes, ending with <code>{"done": true, "imported": 12, "failed": 0, ...}</code>.</p>
+
+  <h2>POST /api/rotation/push</h2>
+  <p>Add a frame rendered elsewhere, as <code>display_photo.py push</code> does with the output
+  of <code>display_photo.py render</code>. Multipart upload with <code>frame</code> (an
+  <code>.epd</code> file: <code>EPD1</code>, the SHA-256 of the frame, then the 960,000-byte
+  packed frame), <code>image</code> (the panel image as PNG, shown in the queue), optional
+  <code>thumb</code> (JPEG) and <code>playlist</code>. The frame's size, palette and checksum are
+  checked; nothing is decoded or rendered, and the frame is what rotation sends to the panel.
+  Response as for <code>/api/rotation/add</code>.</p>
+
+  <h2>POST /api/rotation/add_raw?playlist=day</h2>
+  <p>Add a panel-ready frame to the rotation queue; the body is as for
+  <code>/api/display/raw</code>. The frame is sent to the panel as is when the item comes up. Its
+  queue image is made once from the frame itself, in the panel's colours. Response as for
+  <code>/api/rotation/add</code>.</p>
+
+  <h2>POST /api/rotation/watch</h2>
+  <pre>{"path": "/mnt/photos", "orientation": "portrait", "fill": true}</pre>
+  <p>Bind the queue to a directory (searched recursively). It is re-scanned every minute by
+  modification time and size: new or changed images are rendered into the queue, deleted ones
+  drop out. Items removed from the queue (or cleared) stay out until their file is modified.
+  Transform fields are optional, as for import. <code>{"path": ""}</code> unbinds
+  and removes the folder's items. Scan state is reported as <code>watch</code> in rotation status.</p>
 
   <h2>POST /api/rotation/display_now</h2>
-  <pre>{"also_add": true}</pre>
+  <pre>{"also_add": true, "playlist": ""}</pre>
 
   <h2>POST /api/rotation/jump</h2>
   <pre>{"item_id":"abc123..."}</pre>
@@ -1018,7 +4347,7 @@ HTML_PAGE = """<!DOCTYPE html>
       min-height: calc(100vh - 34px);
       align-content: start;
     }
-    input[type="file"], input[type="url"], input[type="number"], textarea {
+    input[type="file"], input[type="url"], input[type="number"], input[type="text"], textarea {
       width: 100%;
       border: 1px solid var(--border);
       border-radius: 10px;
@@ -1062,7 +4391,7 @@ HTML_PAGE = """<!DOCTYPE html>
       place-items: center;
       padding: 10px;
     }
-    #previewImage { max-width: 100%; max-height: 100%; border-radius: 10px; box-shadow: 0 8px 20px rgba(16, 35, 61, 0.18); }
+    #previewCanvas { max-width: 100%; max-height: 100%; border-radius: 10px; box-shadow: 0 8px 20px rgba(16, 35, 61, 0.18); }
     #previewEmpty { color: var(--muted); text-align: center; }
     .status {
       margin-top: 12px;
@@ -1153,10 +4482,30 @@ HTML_PAGE = """<!DOCTYPE html>
           <input id="rotationInterval" type="number" min="30" max="86400" value="900" style="width: 120px;" />
           <button id="saveRotationIntervalBtn" class="btn-secondary">Save Interval</button>
         </div>
+        <div class="row">
+          <label class="small" style="display:inline-flex;align-items:center;gap:6px;">
+            <input id="rotationAlign" type="checkbox" />
+            Align switches to the clock (e.g. on the hour)
+          </label>
+        </div>
+        <div class="row">
+          <label for="rotationPlaylist" style="min-width: 120px;">Playlist</label>
+          <input id="rotationPlaylist" type="text" maxlength="64" placeholder="(none)" style="width: 160px;" />
+        </div>
         <div class="row">
           <button id="addRotationBtn" class="btn-secondary">Add Preview To Rotation</button>
           <button id="clearRotationBtn" class="btn-secondary">Clear Rotation Queue</button>
         </div>
+        <div class="row">
+          <input id="importInput" type="file" accept="image/*,.zip" multiple />
+          <button id="importRotationBtn" class="btn-secondary">Import Files Into Rotation</button>
+        </div>
+        <p class="small">Imports use the current orientation, rotation, crop and fill settings. Added and imported images are tagged with the playlist above.</p>
+        <label for="rotationSchedule" class="small">Schedule (JSON rules, earlier rules win where they overlap)</label>
+        <textarea id="rotationSchedule" spellcheck="false" placeholder='[{"start":"23:00","end":"07:00","quiet":true}, {"start":"07:00","end":"19:00","playlist":"day"}]'></textarea>
+        <div class="row">
+          <button id="saveRotationScheduleBtn" class="btn-secondary">Save Schedule</button>
+        </div>
         <div id="rotationQueueList" class="rotation-queue"></div>
       </section>
 
@@ -1177,18 +4526,17 @@ HTML_PAGE = """<!DOCTYPE html>
             <label for="cropSlider">Crop amount: <span id="cropValue">100%</span></label>
             <input id="cropSlider" type="range" min="25" max="100" step="1" value="100" />
             <div class="row" style="margin-top: 8px;">
-              <button id="applyCropBtn" class="btn-secondary">Apply Crop</button>
               <button id="fillToggleBtn" class="btn-secondary">Crop To Fill: Off</button>
             </div>
           </div>
         </div>
 
         <div class="preview-box">
-          <img id="previewImage" alt="Preview" style="display:none;" />
+          <canvas id="previewCanvas" style="display:none;"></canvas>
           <div id="previewEmpty">No preview loaded yet.</div>
         </div>
 
-        <p class="small">Preview buffer is server-side. "Display Now" sends exactly this buffered preview to the panel.</p>
+        <p class="small">Edits are previewed in the browser. "Display Now" and "Add Preview To Rotation" send them to the server, which renders the panel image once and sends exactly that.</p>
 
         <div class="row">
           <label class="small" style="display:inline-flex;align-items:center;gap:6px;">
@@ -1213,14 +4561,29 @@ HTML_PAGE = """<!DOCTYPE html>
       orientation: "landscape",
       rotationEnabled: false,
       rotationInterval: 900,
+      rotationAlign: false,
+      rotationSchedule: [],
+      rotationScheduleActive: null,
       rotationItemCount: 0,
       rotationItems: [],
+      rotationQueueVersion: null,
+      rotationItemsLoading: false,
+      rotationItemsReload: false,
       rotationNextIndex: 0,
+      previewVersion: 0,
+      previewSourceUrl: null,
+      previewDirty: false,
       hasPreview: false,
       busy: false,
     };
     const CLIENT_UPLOAD_TARGET_BYTES = 10 * 1024 * 1024;
     const CLIENT_UPLOAD_MAX_EDGE = 2600;
+    const ROTATION_PAGE_SIZE = 50;
+    const ROTATION_MAX_PAGE_SIZE = __MAX_STATUS_ITEMS__;
+    const PANEL_WIDTH = __EPD_WIDTH__;
+    const PANEL_HEIGHT = __EPD_HEIGHT__;
+    // Downscaled preview source; edits are drawn from it without a server round trip.
+    const previewSource = new Image();
 
     const el = {
       status: document.getElementById("status"),
@@ -1228,7 +4591,7 @@ HTML_PAGE = """<!DOCTYPE html>
       url: document.getElementById("urlInput"),
       text: document.getElementById("textInput"),
       fontSize: document.getElementById("fontSize"),
-      preview: document.getElementById("previewImage"),
+      preview: document.getElementById("previewCanvas"),
       previewEmpty: document.getElementById("previewEmpty"),
       cropSlider: document.getElementById("cropSlider"),
       cropValue: document.getElementById("cropValue"),
@@ -1238,13 +4601,18 @@ HTML_PAGE = """<!DOCTYPE html>
       rotationToggle: document.getElementById("rotationToggleBtn"),
       rotationMeta: document.getElementById("rotationMeta"),
       rotationInterval: document.getElementById("rotationInterval"),
+      rotationAlign: document.getElementById("rotationAlign"),
+      rotationPlaylist: document.getElementById("rotationPlaylist"),
+      rotationSchedule: document.getElementById("rotationSchedule"),
       rotationQueueList: document.getElementById("rotationQueueList"),
+      importFiles: document.getElementById("importInput"),
       alsoAddNow: document.getElementById("alsoAddNow"),
     };
 
     function setBusy(busy) {
       state.busy = busy;
       for (const button of document.querySelectorAll("button")) button.disabled = busy;
+      el.cropSlider.disabled = busy;
     }
 
     function setStatus(message, kind = "") {
@@ -1373,8 +4741,16 @@ HTML_PAGE = """<!DOCTYPE html>
       el.rotationToggle.textContent = `Rotation: ${state.rotationEnabled ? "On" : "Off"}`;
       el.rotationToggle.className = state.rotationEnabled ? "btn-primary" : "btn-secondary";
       const nextText = state.rotationItemCount > 0 ? `, next #${state.rotationNextIndex + 1}` : "";
-      el.rotationMeta.textContent = `${state.rotationItemCount} items queued${nextText}`;
+      const active = state.rotationScheduleActive;
+      let scheduleText = "";
+      if (active) {
+        const until = new Date(active.until * 1000).toLocaleTimeString([], { hour: "2-digit", minute: "2-digit" });
+        const what = active.quiet ? "quiet" : active.playlist ? `playlist "${active.playlist}"` : "all items";
+        scheduleText = `, ${what} until ${until}`;
+      }
+      el.rotationMeta.textContent = `${state.rotationItemCount} items queued${nextText}${scheduleText}`;
       el.rotationInterval.value = String(state.rotationInterval);
+      el.rotationAlign.checked = state.rotationAlign;
     }
 
     function renderRotationQueue() {
@@ -1390,21 +4766,24 @@ HTML_PAGE = """<!DOCTYPE html>
         return;
       }
 
-      for (let idx = 0; idx < state.rotationItems.length; idx += 1) {
-        const item = state.rotationItems[idx];
+      for (const item of state.rotationItems) {
+        const idx = item.index;
         const card = document.createElement("div");
         card.className = "queue-item";
 
         const img = document.createElement("img");
         img.className = "queue-thumb";
         img.alt = `Queue ${idx + 1}`;
-        img.src = `${item.preview_url}&cb=${Date.now()}`;
+        img.loading = "lazy";
+        img.src = item.thumb_url;
         card.appendChild(img);
 
         const meta = document.createElement("div");
         meta.className = "queue-meta";
         const when = item.created_at ? new Date(item.created_at * 1000).toLocaleString() : "unknown";
-        meta.textContent = `#${idx + 1}${item.is_next ? " (next)" : ""} - added ${when}`;
+        const tag = item.playlist ? ` [${item.playlist}]` : "";
+        const isNext = idx === state.rotationNextIndex;
+        meta.textContent = `#${idx + 1}${isNext ? " (next)" : ""}${tag} - added ${when}`;
         card.appendChild(meta);
 
         const del = document.createElement("button");
@@ -1425,45 +4804,214 @@ HTML_PAGE = """<!DOCTYPE html>
 
         host.appendChild(card);
       }
+
+      if (state.rotationItems.length < state.rotationItemCount) {
+        const more = document.createElement("div");
+        more.className = "small";
+        more.textContent = `Showing ${state.rotationItems.length} of ${state.rotationItemCount}, scroll for more.`;
+        host.appendChild(more);
+      }
+    }
+
+    // Queue entries are fetched a page at a time as the list is scrolled;
+    // status events only carry a summary, and its queue_version says when
+    // the pages already loaded are stale.
+    async function loadRotationItems(reset) {
+      if (state.rotationItemsLoading) {
+        state.rotationItemsReload = state.rotationItemsReload || reset;
+        return;
+      }
+      const offset = reset ? 0 : state.rotationItems.length;
+      const limit = reset
+        ? Math.min(ROTATION_MAX_PAGE_SIZE, Math.max(ROTATION_PAGE_SIZE, state.rotationItems.length))
+        : ROTATION_PAGE_SIZE;
+      state.rotationItemsLoading = true;
+      try {
+        const payload = await requestJSON(`/api/rotation/status?offset=${offset}&limit=${limit}`, { method: "GET" });
+        const rotation = payload.rotation;
+        if (!reset && rotation.queue_version !== state.rotationQueueVersion) {
+          state.rotationItemsReload = true;
+        } else {
+          const items = Array.isArray(rotation.items) ? rotation.items : [];
+          state.rotationItems = reset ? items : state.rotationItems.concat(items);
+          state.rotationQueueVersion = rotation.queue_version;
+          state.rotationItemCount = Number(rotation.item_count) || 0;
+          state.rotationNextIndex = Number(rotation.next_index) || 0;
+        }
+      } catch (err) {
+        setStatus(err.message || "Failed to load rotation queue.", "err");
+      } finally {
+        state.rotationItemsLoading = false;
+      }
+      if (state.rotationItemsReload) {
+        state.rotationItemsReload = false;
+        loadRotationItems(true);
+        return;
+      }
+      syncUiFromState();
+      renderRotationQueue();
     }
 
     function applyRotationStatus(rotation) {
       if (!rotation) return;
       state.rotationEnabled = !!rotation.enabled;
       state.rotationInterval = Number(rotation.interval_seconds) || 900;
+      state.rotationAlign = !!rotation.align_to_clock;
+      const schedule = Array.isArray(rotation.schedule) ? rotation.schedule : [];
+      if (document.activeElement !== el.rotationSchedule) {
+        el.rotationSchedule.value = schedule.length ? JSON.stringify(schedule, null, 1) : "";
+      }
+      state.rotationSchedule = schedule;
+      state.rotationScheduleActive = rotation.schedule_active || null;
       state.rotationItemCount = Number(rotation.item_count) || 0;
       state.rotationNextIndex = Number(rotation.next_index) || 0;
-      state.rotationItems = Array.isArray(rotation.items) ? rotation.items : [];
       syncUiFromState();
-      renderRotationQueue();
+      if (rotation.queue_version !== state.rotationQueueVersion) {
+        loadRotationItems(true);
+      } else {
+        renderRotationQueue();
+      }
     }
 
-    function setPreviewImage(url) {
-      if (!url) return;
-      el.preview.src = url;
-      el.preview.style.display = "block";
+    // Mirrors apply_transform and format_for_display on the server: rotate
+    // clockwise, center crop or fill crop to the frame aspect, then fit into
+    // the panel frame on white (a landscape frame is shown turned, as the
+    // server's preview image is).
+    function drawPreview() {
+      if (!previewSource.naturalWidth) return;
+      const quarterTurn = state.rotation === 90 || state.rotation === 270;
+      const w = quarterTurn ? previewSource.naturalHeight : previewSource.naturalWidth;
+      const h = quarterTurn ? previewSource.naturalWidth : previewSource.naturalHeight;
+      const landscape = state.orientation !== "portrait";
+      const frameWidth = landscape ? PANEL_HEIGHT : PANEL_WIDTH;
+      const frameHeight = landscape ? PANEL_WIDTH : PANEL_HEIGHT;
+
+      let cropWidth = w;
+      let cropHeight = h;
+      if (state.fill) {
+        const aspect = frameWidth / frameHeight;
+        if (w / h > aspect) {
+          cropWidth = Math.max(1, Math.floor(h * aspect));
+        } else {
+          cropHeight = Math.max(1, Math.floor(w / aspect));
+        }
+      } else if (state.crop > 0 && state.crop < 1) {
+        cropWidth = Math.max(1, Math.floor(w * state.crop));
+        cropHeight = Math.max(1, Math.floor(h * state.crop));
+      }
+
+      const scale = Math.min(frameWidth / cropWidth, frameHeight / cropHeight);
+      const width = Math.max(1, Math.floor(cropWidth * scale));
+      const height = Math.max(1, Math.floor(cropHeight * scale));
+      const left = Math.floor((frameWidth - width) / 2);
+      const top = Math.floor((frameHeight - height) / 2);
+
+      const canvas = el.preview;
+      canvas.width = frameWidth;
+      canvas.height = frameHeight;
+      const ctx = canvas.getContext("2d");
+      ctx.fillStyle = "#ffffff";
+      ctx.fillRect(0, 0, frameWidth, frameHeight);
+      ctx.save();
+      ctx.beginPath();
+      ctx.rect(left, top, width, height);
+      ctx.clip();
+      ctx.translate(left + width / 2, top + height / 2);
+      ctx.scale(width / cropWidth, height / cropHeight);
+      ctx.rotate((state.rotation * Math.PI) / 180);
+      ctx.imageSmoothingQuality = "high";
+      ctx.drawImage(previewSource, -previewSource.naturalWidth / 2, -previewSource.naturalHeight / 2);
+      ctx.restore();
+      canvas.style.display = "block";
       el.previewEmpty.style.display = "none";
-      state.hasPreview = true;
     }
 
+    previewSource.addEventListener("load", drawPreview);
+
     function applyResponse(payload) {
       state.rotation = payload.state.rotation;
       state.crop = payload.state.crop;
       state.fill = payload.state.fill;
       state.orientation = payload.state.orientation;
+      state.previewVersion = Math.max(state.previewVersion, Number(payload.state.version) || 0);
+      state.previewDirty = false;
+      state.hasPreview = true;
       syncUiFromState();
-      setPreviewImage(payload.state.preview_url + `&cb=${Date.now()}`);
+      if (payload.state.source_url !== state.previewSourceUrl) {
+        state.previewSourceUrl = payload.state.source_url;
+        previewSource.src = payload.state.source_url;
+      } else {
+        drawPreview();
+      }
+    }
+
+    // Local edits travel with the request that uses the preview, so the
+    // server renders them once, only when needed.
+    function previewOperations() {
+      if (!state.previewDirty) return [];
+      return [{
+        op: "transform",
+        rotation: state.rotation,
+        crop: state.crop,
+        fill: state.fill,
+        orientation: state.orientation,
+      }];
     }
 
     async function refreshRotationStatus() {
       try {
-        const payload = await requestJSON("/api/rotation/status", { method: "GET" });
+        const payload = await requestJSON("/api/rotation/status?summary=1", { method: "GET" });
         applyRotationStatus(payload.rotation);
       } catch (err) {
         setStatus(err.message || "Failed to load rotation status.", "err");
       }
     }
 
+    const DISPLAY_JOB_MESSAGES = {
+      queued: "Display update queued...",
+      started: "Display updating (~19s)...",
+      done: "Display updated.",
+      failed: "Display update failed.",
+    };
+
+    function subscribeEvents() {
+      if (!window.EventSource) {
+        refreshRotationStatus();
+        return;
+      }
+      const source = new EventSource("/api/events");
+      // After a reconnect the server may have restarted; reload the queue.
+      source.addEventListener("open", () => {
+        state.rotationQueueVersion = null;
+      });
+      source.addEventListener("rotation", (event) => {
+        applyRotationStatus(JSON.parse(event.data));
+      });
+      source.addEventListener("preview", (event) => {
+        const preview = JSON.parse(event.data);
+        if (Number(preview.version) <= state.previewVersion) return;
+        // Unsent local edits win over another client's transform of the same
+        // source; they are sent with the next display or add.
+        if (state.previewDirty && preview.source_url === state.previewSourceUrl) {
+          state.previewVersion = Number(preview.version) || state.previewVersion;
+          return;
+        }
+        applyResponse({ state: preview });
+      });
+      source.addEventListener("display", (event) => {
+        if (state.busy) return;
+        const job = JSON.parse(event.data);
+        const message = DISPLAY_JOB_MESSAGES[job.state];
+        if (!message) return;
+        const kind = job.state === "failed" ? "err" : (job.state === "done" ? "ok" : "");
+        setStatus(job.error ? `${message} ${job.error}` : message, kind);
+      });
+      source.addEventListener("resync", () => {
+        state.rotationQueueVersion = null;
+        refreshRotationStatus();
+      });
+    }
+
     async function loadFileSource() {
       const file = el.file.files && el.file.files[0];
       if (!file) {
@@ -1554,27 +5102,15 @@ HTML_PAGE = """<!DOCTYPE html>
       }
     }
 
-    async function updateTransform(changes, message) {
+    function updateTransform(changes) {
       if (!state.hasPreview) {
         setStatus("Load a source first.", "err");
         return;
       }
-
-      setBusy(true);
-      setStatus(message || "Updating preview...");
-      try {
-        const payload = await requestJSON("/api/preview/transform", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify(changes),
-        });
-        applyResponse(payload);
-        setStatus("Preview updated.", "ok");
-      } catch (err) {
-        setStatus(err.message || "Failed to update preview.", "err");
-      } finally {
-        setBusy(false);
-      }
+      Object.assign(state, changes);
+      state.previewDirty = true;
+      syncUiFromState();
+      drawPreview();
     }
 
     async function pushPreviewToDisplay() {
@@ -1586,15 +5122,19 @@ HTML_PAGE = """<!DOCTYPE html>
       setBusy(true);
       setStatus("Displaying on e-paper (~19s)...");
       try {
+        const operations = previewOperations();
+        if (el.alsoAddNow.checked) operations.push({ op: "add", playlist: el.rotationPlaylist.value.trim() });
+        operations.push({ op: "display" });
         const payload = await requestJSON(
-          "/api/rotation/display_now",
+          "/api/batch",
           {
             method: "POST",
             headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ also_add: !!el.alsoAddNow.checked }),
+            body: JSON.stringify({ operations }),
           },
           { timeoutMs: 90000, retries: 0 }
         );
+        if (payload.state) applyResponse(payload);
         applyRotationStatus(payload.rotation);
         if (el.alsoAddNow.checked) {
           setStatus("Display update started and preview added to rotation.", "ok");
@@ -1616,11 +5156,18 @@ HTML_PAGE = """<!DOCTYPE html>
       setBusy(true);
       setStatus("Adding preview to rotation...");
       try {
+        const operations = previewOperations();
+        operations.push({ op: "add", playlist: el.rotationPlaylist.value.trim() });
         const payload = await requestJSON(
-          "/api/rotation/add",
-          { method: "POST" },
+          "/api/batch",
+          {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ operations }),
+          },
           { timeoutMs: 90000, retries: 0 }
         );
+        if (payload.state) applyResponse(payload);
         applyRotationStatus(payload.rotation);
         setStatus("Preview added to rotation queue.", "ok");
       } catch (err) {
@@ -1630,6 +5177,63 @@ HTML_PAGE = """<!DOCTYPE html>
       }
     }
 
+    async function importIntoRotation() {
+      const files = Array.from(el.importFiles.files || []);
+      if (!files.length) {
+        setStatus("Choose images or a zip to import.", "err");
+        return;
+      }
+
+      setBusy(true);
+      setStatus(`Uploading ${files.length} file(s)...`);
+      try {
+        const form = new FormData();
+        for (const file of files) form.append("files", file, file.name);
+        form.append("orientation", state.orientation);
+        form.append("rotation", String(state.rotation));
+        form.append("crop", String(state.crop));
+        form.append("fill", state.fill ? "1" : "0");
+        form.append("playlist", el.rotationPlaylist.value.trim());
+
+        const response = await fetch("/api/rotation/import", { method: "POST", body: form });
+        if (!response.ok) {
+          const payload = await response.json().catch(() => null);
+          throw new Error((payload && payload.error) || `Import failed (${response.status})`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = "";
+        let summary = null;
+        const errors = [];
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffered += decoder.decode(value, { stream: true });
+          const lines = buffered.split("\\n");
+          buffered = lines.pop();
+          for (const line of lines) {
+            if (!line.trim()) continue;
+            const progress = JSON.parse(line);
+            if (progress.done) {
+              summary = progress;
+            } else {
+              if (!progress.ok) errors.push(`${progress.file}: ${progress.error}`);
+              setStatus(`Imported ${progress.index + 1}/${progress.total}: ${progress.file}`);
+            }
+          }
+        }
+        if (!summary) throw new Error("Import interrupted");
+        el.importFiles.value = "";
+        const failed = summary.failed ? `, ${summary.failed} failed (${errors.slice(0, 3).join("; ")})` : "";
+        setStatus(`Imported ${summary.imported} image(s)${failed}.`, summary.failed ? "err" : "ok");
+      } catch (err) {
+        setStatus(err.message || "Import failed.", "err");
+      } finally {
+        setBusy(false);
+      }
+    }
+
     async function toggleRotationMode() {
       setBusy(true);
       setStatus("Updating rotation mode...");
@@ -1659,7 +5263,7 @@ HTML_PAGE = """<!DOCTYPE html>
         const payload = await requestJSON("/api/rotation/settings", {
           method: "POST",
           headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ interval_seconds: intervalSeconds }),
+          body: JSON.stringify({ interval_seconds: intervalSeconds, align_to_clock: !!el.rotationAlign.checked }),
         });
         applyRotationStatus(payload.rotation);
         setStatus(`Rotation interval set to ${payload.rotation.interval_seconds}s.`, "ok");
@@ -1670,6 +5274,33 @@ HTML_PAGE = """<!DOCTYPE html>
       }
     }
 
+    async function saveRotationSchedule() {
+      let rules;
+      try {
+        const text = el.rotationSchedule.value.trim();
+        rules = text ? JSON.parse(text) : [];
+      } catch (err) {
+        setStatus("Schedule is not valid JSON.", "err");
+        return;
+      }
+      setBusy(true);
+      setStatus("Saving schedule...");
+      try {
+        const payload = await requestJSON("/api/rotation/schedule", {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify({ rules }),
+        });
+        applyRotationStatus(payload.rotation);
+        const count = payload.rotation.schedule.length;
+        setStatus(count ? `Schedule saved (${count} rule(s)).` : "Schedule cleared.", "ok");
+      } catch (err) {
+        setStatus(err.message || "Failed to save schedule.", "err");
+      } finally {
+        setBusy(false);
+      }
+    }
+
     async function clearRotationQueue() {
       setBusy(true);
       setStatus("Clearing rotation queue...");
@@ -1742,42 +5373,47 @@ HTML_PAGE = """<!DOCTYPE html>
     document.getElementById("oriPortraitBtn").addEventListener("click", () => {
       state.orientation = "portrait";
       syncUiFromState();
-      updateTransform({ orientation: "portrait" }, "Switching to portrait preview...");
+      updateTransform({ orientation: "portrait" });
     });
 
     document.getElementById("oriLandscapeBtn").addEventListener("click", () => {
       state.orientation = "landscape";
       syncUiFromState();
-      updateTransform({ orientation: "landscape" }, "Switching to landscape preview...");
+      updateTransform({ orientation: "landscape" });
     });
 
     document.getElementById("rotateLeftBtn").addEventListener("click", () => {
       const next = (state.rotation + 270) % 360;
-      updateTransform({ rotation: next }, "Rotating preview...");
+      updateTransform({ rotation: next });
     });
 
     document.getElementById("rotateRightBtn").addEventListener("click", () => {
       const next = (state.rotation + 90) % 360;
-      updateTransform({ rotation: next }, "Rotating preview...");
+      updateTransform({ rotation: next });
     });
 
     el.cropSlider.addEventListener("input", () => {
       el.cropValue.textContent = `${el.cropSlider.value}%`;
-    });
-
-    document.getElementById("applyCropBtn").addEventListener("click", () => {
-      updateTransform({ crop: Number(el.cropSlider.value) / 100 }, "Applying crop...");
+      if (state.hasPreview) updateTransform({ crop: Number(el.cropSlider.value) / 100 });
     });
 
     document.getElementById("fillToggleBtn").addEventListener("click", () => {
-      updateTransform({ fill: !state.fill }, "Toggling fill crop...");
+      updateTransform({ fill: !state.fill });
     });
 
     document.getElementById("pushBtn").addEventListener("click", pushPreviewToDisplay);
     document.getElementById("addRotationBtn").addEventListener("click", addPreviewToRotation);
+    document.getElementById("importRotationBtn").addEventListener("click", importIntoRotation);
     document.getElementById("rotationToggleBtn").addEventListener("click", toggleRotationMode);
     document.getElementById("saveRotationIntervalBtn").addEventListener("click", saveRotationInterval);
+    document.getElementById("saveRotationScheduleBtn").addEventListener("click", saveRotationSchedule);
     document.getElementById("clearRotationBtn").addEventListener("click", clearRotationQueue);
+    el.rotationQueueList.addEventListener("scroll", () => {
+      const host = el.rotationQueueList;
+      if (state.rotationItems.length >= state.rotationItemCount) return;
+      if (host.scrollTop + host.clientHeight < host.scrollHeight - 200) return;
+      loadRotationItems(false);
+    });
     document.getElementById("rotationQueueList").addEventListener("click", (event) => {
       const btn = event.target.closest("button[data-item-id]");
       if (!btn) return;
@@ -1791,19 +5427,61 @@ HTML_PAGE = """<!DOCTYPE html>
     document.getElementById("clearBtn").addEventListener("click", clearDisplay);
 
     syncUiFromState();
-    refreshRotationStatus();
+    subscribeEvents();
   </script>
 </body>
 </html>
 """
 
+# Values the page script shares with the server, filled in from the constants above.
+HTML_PAGE = (
+    HTML_PAGE.replace("__EPD_WIDTH__", str(EPD_WIDTH))
+    .replace("__EPD_HEIGHT__", str(EPD_HEIGHT))
+    .replace("__MAX_STATUS_ITEMS__", str(MAX_STATUS_ITEMS))
+)
+
+
+# HTML pages encoded once, on first request
+_encoded_pages = {}
+
 
 class Handler(BaseHTTPRequestHandler):
     def log_message(self, fmt, *args):
         print("[%s] %s" % (self.log_date_time_string(), fmt % args))
 
+    def handle_one_request(self):
+        self._status = None
+        # A request line the base class rejects (414, malformed 400) sets neither,
+        # and on a kept-alive connection they would still hold the previous request's.
+        self.command = None
+        self.path = ""
+        started = time.perf_counter()
+        super().handle_one_request()
+        if self._status is None:
+            return
+        try:
+            self._record_request_metrics(started)
+        except Exception as e:
+            # The response has been sent; bookkeeping must not turn it into a traceback.
+            print(f"[metrics] failed to record request: {e!r}")
+
+    def _record_request_metrics(self, started):
+        path = self._path_only()
+        command = getattr(self, "command", None)
+        method = command if command and hasattr(self, "do_" + command) else "OTHER"
+        # Known routes only, so unknown URLs cannot grow the label set.
+        known = method != "OTHER" and self._status != 404 and (path.startswith("/api/") or path in ("/", "/index.html"))
+        route = path if known else "other"
+        metric_inc("epaper_http_requests_total", route=route, method=method, status=self._status)
+        if route != "/api/events":
+            metric_observe("epaper_http_request_duration_seconds", time.perf_counter() - started, route=route)
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
     def _path_only(self):
-        return self.path.split("?", 1)[0]
+        return (getattr(self, "path", "") or "").split("?", 1)[0]
 
     def _send_json(self, status, body):
         raw = json.dumps(body).encode("utf-8")
@@ -1823,22 +5501,28 @@ class Handler(BaseHTTPRequestHandler):
         except json.JSONDecodeError as e:
             raise ValueError("Invalid JSON body") from e
 
+    def _send_page(self, name, html):
+        raw = _encoded_pages.get(name)
+        if raw is None:
+            raw = _encoded_pages[name] = html.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-type", "text/html; charset=utf-8")
+        self.send_header("Content-length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
     def do_GET(self):
         path = self._path_only()
         if path in ("/", "/index.html"):
-            self.send_response(200)
-            self.send_header("Content-type", "text/html; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(HTML_PAGE.encode("utf-8"))
+            self._send_page("index", HTML_PAGE)
             return
 
         if path == "/api/docs":
-            self.send_response(200)
-            self.send_header("Content-type", "text/html; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(API_DOCS_HTML.encode("utf-8"))
+            self._send_page("docs", API_DOCS_HTML)
             return
 
+        _startup_ready.wait()
+
         if path == "/api/status":
             self._send_json(
                 200,
@@ -1854,13 +5538,58 @@ class Handler(BaseHTTPRequestHandler):
                     },
                     "allow_private_urls": ALLOW_PRIVATE_URLS,
                     "has_preview": get_preview_png() is not None,
-                    "rotation": get_rotation_status(),
+                    "preview_memory": get_preview_memory(),
+                    "rotation": get_rotation_status(items=False),
                 },
             )
             return
 
+        if path == "/api/debug/memory":
+            qs = parse_qs(urlparse(self.path).query)
+            try:
+                report = get_memory_report(
+                    top=(qs.get("top") or [MEMORY_REPORT_TOP])[0],
+                    group=(qs.get("group") or ["lineno"])[0],
+                )
+            except ValueError as e:
+                self._send_json(400, {"ok": False, "error": str(e)})
+                return
+            self._send_json(200, {"ok": True, "memory": report})
+            return
+
         if path == "/api/rotation/status":
-            self._send_json(200, {"ok": True, "rotation": get_rotation_status()})
+            # Blank values kept: playlist= lists the untagged items.
+            qs = parse_qs(urlparse(self.path).query, keep_blank_values=True)
+            around = (qs.get("around") or [""])[0]
+            playlist = qs.get("playlist")
+            try:
+                if around not in ("", "next"):
+                    raise ValueError("around must be next")
+                offset, limit = parse_status_window((qs.get("offset") or [None])[0], (qs.get("limit") or [None])[0])
+                status = get_rotation_status(
+                    items=not is_truthy((qs.get("summary") or [""])[0]),
+                    offset=offset,
+                    limit=limit,
+                    playlist=parse_playlist(playlist[0]) if playlist else None,
+                    around_next=around == "next",
+                )
+            except ValueError as e:
+                self._send_json(400, {"ok": False, "error": str(e)})
+                return
+            self._send_json(200, {"ok": True, "rotation": status})
+            return
+
+        if path == "/api/events":
+            self._api_events()
+            return
+
+        if path == "/api/metrics":
+            raw = render_metrics().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
             return
 
         if path == "/api/rotation/item_image":
@@ -1879,6 +5608,36 @@ class Handler(BaseHTTPRequestHandler):
             self.wfile.write(png)
             return
 
+        if path == "/api/rotation/item_thumb":
+            qs = parse_qs(urlparse(self.path).query)
+            item_id = (qs.get("id") or [""])[0]
+            try:
+                thumb = get_rotation_item_thumb(item_id)
+            except ValueError as e:
+                self.send_error(404, str(e))
+                return
+            self.send_response(200)
+            self.send_header("Content-type", "image/jpeg")
+            # Item IDs are never reused for different content.
+            self.send_header("Cache-Control", f"public, max-age={THUMBNAIL_CACHE_SECONDS}, immutable")
+            self.send_header("Content-length", str(len(thumb)))
+            self.end_headers()
+            self.wfile.write(thumb)
+            return
+
+        if path == "/api/preview/source_image":
+            jpeg = get_preview_live_jpeg()
+            if not jpeg:
+                self.send_error(404, "No preview available")
+                return
+            self.send_response(200)
+            self.send_header("Content-type", "image/jpeg")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Content-length", str(len(jpeg)))
+            self.end_headers()
+            self.wfile.write(jpeg)
+            return
+
         if path == "/api/preview/image":
             png = get_preview_png()
             if not png:
@@ -1894,8 +5653,44 @@ class Handler(BaseHTTPRequestHandler):
 
         self.send_error(404)
 
+    def _api_events(self):
+        self.send_response(200)
+        self.send_header("Content-type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("X-Accel-Buffering", "no")
+        self.end_headers()
+
+        last_id = self.headers.get("Last-Event-ID")
+        seq, latest = latest_events()
+        try:
+            last_seq = int(last_id) if last_id else -1
+        except ValueError:
+            last_seq = -1
+        if last_seq < 0 or last_seq > seq:
+            # Fresh subscriber: replay the latest event of each kind instead of
+            # rebuilding state, so opening tabs costs no rotation lock traffic.
+            pending, missed, last_seq = latest, False, seq
+        else:
+            pending, missed = [], False
+
+        try:
+            self.wfile.write(b"retry: 3000\n\n")
+            while True:
+                if missed:
+                    self.wfile.write(b"event: resync\ndata: {}\n\n")
+                for event_seq, kind, raw in pending:
+                    self.wfile.write(f"id: {event_seq}\nevent: {kind}\ndata: {raw}\n\n".encode("utf-8"))
+                    last_seq = max(last_seq, event_seq)
+                if not pending and not missed:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+                pending, missed = wait_for_events(last_seq, EVENT_KEEPALIVE_SECONDS)
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
     def do_POST(self):
         path = self._path_only()
+        _startup_ready.wait()
 
         try:
             if path == "/api/preview/source":
@@ -1907,18 +5702,45 @@ class Handler(BaseHTTPRequestHandler):
             if path == "/api/display":
                 self._api_display()
                 return
+            if path == "/api/display/raw":
+                self._api_display_raw()
+                return
             if path == "/api/clear":
                 self._api_clear()
                 return
+            if path == "/api/batch":
+                self._api_batch()
+                return
+            if path == "/api/debug/memory":
+                self._api_debug_memory()
+                return
             if path == "/api/rotation/toggle":
                 self._api_rotation_toggle()
                 return
             if path == "/api/rotation/settings":
                 self._api_rotation_settings()
                 return
+            if path == "/api/rotation/schedule":
+                self._api_rotation_schedule()
+                return
+            if path == "/api/rotation/playlist":
+                self._api_rotation_playlist()
+                return
             if path == "/api/rotation/add":
                 self._api_rotation_add()
                 return
+            if path == "/api/rotation/add_raw":
+                self._api_rotation_add_raw()
+                return
+            if path == "/api/rotation/push":
+                self._api_rotation_push()
+                return
+            if path == "/api/rotation/import":
+                self._api_rotation_import()
+                return
+            if path == "/api/rotation/watch":
+                self._api_rotation_watch()
+                return
             if path == "/api/rotation/display_now":
                 self._api_rotation_display_now()
                 return
@@ -1943,7 +5765,6 @@ class Handler(BaseHTTPRequestHandler):
 
     def _api_preview_source(self):
         content_type = self.headers.get("Content-type", "")
-        orientation = "landscape"
 
         if content_type.startswith("multipart/form-data"):
             data, form = parse_multipart_form(
@@ -1951,30 +5772,14 @@ class Handler(BaseHTTPRequestHandler):
                 content_type,
                 self.headers.get("Content-length", "0"),
             )
-            if not data:
-                raise ValueError("Multipart upload must include field 'photo'")
             orientation = parse_orientation(form.get("orientation"))
-            image = load_image_from_bytes(data)
+            image, original = load_preview_source({"mode": "upload"}, upload=data)
         else:
             payload = self._read_json()
-            mode = str(payload.get("mode", "")).strip().lower()
             orientation = parse_orientation(payload.get("orientation"))
+            image, original = load_preview_source(payload)
 
-            if mode == "url":
-                url = str(payload.get("url", "")).strip()
-                if not url:
-                    raise ValueError("Missing url")
-                image = load_image_from_bytes(fetch_image(url))
-            elif mode == "text":
-                text = str(payload.get("text", ""))
-                if not text.strip():
-                    raise ValueError("Missing text")
-                font_size = parse_font_size(payload.get("font_size"))
-                image = render_text_to_image(text.strip(), font_size=font_size)
-            else:
-                raise ValueError("Invalid source mode. Use multipart file or JSON mode=url|text")
-
-        state = set_preview_source(image, orientation=orientation)
+        state = set_preview_source(image, orientation=orientation, original=original)
         self._send_json(200, {"ok": True, "state": state})
 
     def _api_preview_transform(self):
@@ -2000,10 +5805,60 @@ class Handler(BaseHTTPRequestHandler):
         display_preview_buffer()
         self._send_json(200, {"ok": True, "message": "Display updating (~19s)"})
 
+    def _read_raw_frame(self):
+        length = parse_content_length(self.headers.get("Content-length", "0"))
+        data = read_limited_body(self.rfile, length, FRAME_BYTES + len(EPD_FILE_MAGIC) + 32)
+        return parse_raw_frame(data, self.headers.get("X-Frame-SHA256"))
+
+    def _api_display_raw(self):
+        frame, _digest = self._read_raw_frame()
+        display_raw_frame(frame)
+        self._send_json(200, {"ok": True, "message": "Display updating (~19s)"})
+
+    def _api_rotation_add_raw(self):
+        qs = parse_qs(urlparse(self.path).query)
+        playlist = parse_playlist((qs.get("playlist") or [""])[0])
+        frame, digest = self._read_raw_frame()
+        added = add_frame_to_rotation(frame, digest, playlist=playlist)
+        self._send_json(200, {"ok": True, "added": added, "rotation": get_rotation_status(items=False)})
+
+    def _api_batch(self):
+        content_type = self.headers.get("Content-type", "")
+        upload = None
+        if content_type.startswith("multipart/form-data"):
+            upload, form = parse_multipart_form(
+                self.rfile,
+                content_type,
+                self.headers.get("Content-length", "0"),
+            )
+            try:
+                operations = json.loads(form.get("operations") or "null")
+            except json.JSONDecodeError as e:
+                raise ValueError("Field 'operations' must be a JSON list") from e
+        else:
+            operations = self._read_json().get("operations")
+        result = run_batch(parse_batch(operations, has_upload=bool(upload)), upload)
+        self._send_json(200, {"ok": True, **result, "rotation": get_rotation_status(items=False)})
+
     def _api_clear(self):
         clear_epd()
         self._send_json(200, {"ok": True, "message": "Screen cleared"})
 
+    def _api_debug_memory(self):
+        payload = self._read_json()
+        tracing = payload.get("tracing")
+        if tracing is None:
+            raise ValueError("Missing tracing")
+        tracing = tracing if isinstance(tracing, bool) else is_truthy(tracing)
+        if tracing:
+            try:
+                start_memory_tracing(payload.get("frames") or 1)
+            except (TypeError, ValueError) as e:
+                raise ValueError("frames must be a number") from e
+        else:
+            stop_memory_tracing()
+        self._send_json(200, {"ok": True, "memory": get_memory_report()})
+
     def _api_rotation_toggle(self):
         payload = self._read_json()
         enabled = payload.get("enabled")
@@ -2015,27 +5870,115 @@ class Handler(BaseHTTPRequestHandler):
 
     def _api_rotation_settings(self):
         payload = self._read_json()
-        if "interval_seconds" not in payload:
-            raise ValueError("Missing interval_seconds")
-        status = set_rotation_interval(payload.get("interval_seconds"))
+        if "interval_seconds" not in payload and "align_to_clock" not in payload:
+            raise ValueError("Missing interval_seconds or align_to_clock")
+        align = payload.get("align_to_clock")
+        if align is not None:
+            align = align if isinstance(align, bool) else is_truthy(align)
+        status = set_rotation_interval(payload.get("interval_seconds"), align_to_clock=align)
+        self._send_json(200, {"ok": True, "rotation": status})
+
+    def _api_rotation_schedule(self):
+        payload = self._read_json()
+        if "rules" not in payload:
+            raise ValueError("Missing rules")
+        status = set_rotation_schedule(payload.get("rules"))
+        self._send_json(200, {"ok": True, "rotation": status})
+
+    def _api_rotation_playlist(self):
+        payload = self._read_json()
+        status = set_rotation_item_playlist(payload.get("item_id"), payload.get("playlist"))
         self._send_json(200, {"ok": True, "rotation": status})
 
     def _api_rotation_add(self):
-        added = add_preview_to_rotation()
-        self._send_json(200, {"ok": True, "added": added, "rotation": get_rotation_status()})
+        payload = self._read_json()
+        added = add_preview_to_rotation(payload.get("playlist"))
+        self._send_json(200, {"ok": True, "added": added, "rotation": get_rotation_status(items=False)})
+
+    def _api_rotation_import(self):
+        content_type = self.headers.get("Content-type", "")
+        if not content_type.startswith("multipart/form-data"):
+            raise ValueError("Import must be a multipart/form-data upload")
+        import tempfile
+
+        # Uploads are spooled next to the rotation store (on disk, not a RAM-backed /tmp)
+        # and the workers read them from there, so the body is never held in memory.
+        _ensure_rotation_dirs()
+        with tempfile.TemporaryDirectory(prefix=_IMPORT_SPOOL_PREFIX, dir=_ROTATION_STORE_DIR) as spool_dir:
+            parts = spool_multipart_parts(
+                self.rfile,
+                content_type,
+                self.headers.get("Content-length", "0"),
+                spool_dir,
+            )
+            fields = {}
+            uploads = []
+            for name, filename, value in parts:
+                if filename is None:
+                    fields[name] = value.decode("utf-8", errors="replace").strip()
+                else:
+                    uploads.append((filename, value))
+            settings = parse_import_settings(fields)
+            playlist = parse_playlist(fields.get("playlist"))
+            files = collect_import_files(uploads, extract_dir=spool_dir)
+            if not files:
+                raise ValueError("Upload contains no images")
+
+            # One JSON object per line as each file finishes.
+            self.send_response(200)
+            self.send_header("Content-type", "application/x-ndjson; charset=utf-8")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("X-Accel-Buffering", "no")
+            self.end_headers()
+            progress = import_rotation_images(files, settings, playlist=playlist)
+            try:
+                for line in progress:
+                    self.wfile.write(json.dumps(line).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            finally:
+                progress.close()
+
+    def _api_rotation_push(self):
+        content_type = self.headers.get("Content-type", "")
+        if not content_type.startswith("multipart/form-data"):
+            raise ValueError("Push must be a multipart/form-data upload")
+        parts = {
+            name: payload
+            for name, _filename, payload in read_multipart_parts(
+                self.rfile,
+                content_type,
+                self.headers.get("Content-length", "0"),
+            )
+        }
+        for name in ("frame", "image"):
+            if not parts.get(name):
+                raise ValueError(f"Missing field '{name}'")
+        frame, digest = decode_epd_file(parts["frame"])
+        playlist = parse_playlist(parts.get("playlist", b"").decode("utf-8", errors="replace"))
+        added = add_frame_to_rotation(frame, digest, parts["image"], parts.get("thumb") or None, playlist)
+        self._send_json(200, {"ok": True, "added": added, "rotation": get_rotation_status(items=False)})
+
+    def _api_rotation_watch(self):
+        payload = self._read_json()
+        if "path" not in payload:
+            raise ValueError("Missing path")
+        status = set_watch_folder(payload.get("path"), transform=payload)
+        self._send_json(200, {"ok": True, "rotation": status})
 
     def _api_rotation_display_now(self):
         payload = self._read_json()
         also_add = payload.get("also_add", False)
         also_add = also_add if isinstance(also_add, bool) else is_truthy(also_add)
-        result = display_now(also_add=also_add)
+        result = display_now(also_add=also_add, playlist=payload.get("playlist"))
         self._send_json(
             200,
             {
                 "ok": True,
                 "message": "Display updating (~19s)",
                 "result": result,
-                "rotation": get_rotation_status(),
+                "rotation": get_rotation_status(items=False),
             },
         )
 
@@ -2063,11 +6006,45 @@ class Handler(BaseHTTPRequestHandler):
         self._send_json(200, {"ok": True, "rotation": status})
 
 
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def _finish_startup():
+    """Load rotation state and start the workers after the socket is bound,
+    then import Pillow and the panel driver so the first request does not wait."""
+    started = time.perf_counter()
+    try:
+        load_rotation_state()
+        start_rotation_worker()
+    except Exception:
+        import traceback
+
+        traceback.print_exc()
+        # Serving with an unloaded queue could overwrite it; let systemd restart us.
+        os._exit(1)
+    _startup_ready.set()
+    print("Rotation state loaded in %.0f ms" % ((time.perf_counter() - started) * 1000))
+    _import_pil()
+    try:
+        epd_driver()
+    except Exception as e:
+        print("Panel driver failed to load: %s" % e)
+    try:
+        start_render_worker()
+    except Exception as e:
+        print("Render worker failed to start, rendering in process: %s" % e)
+
+
 def run_server():
-    port = 5000
-    load_rotation_state()
-    start_rotation_worker()
-    server = HTTPServer(("0.0.0.0", port), Handler)
+    port = SERVER_PORT
+    if TRACEMALLOC_FRAMES:
+        start_memory_tracing(TRACEMALLOC_FRAMES)
+    # systemd stops the service with SIGTERM; exit through the same cleanup as Ctrl+C.
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=_finish_startup, name="startup", daemon=True).start()
     print("e-Paper photo server: http://localhost:%s" % port)
     print("  UI: source -> preview buffer -> display")
     print(
@@ -2080,14 +6057,86 @@ def run_server():
         print("\nStopped.")
     finally:
         stop_rotation_worker()
+        stop_render_worker()
         server.server_close()
         sys.exit(0)
 
 
+def render_main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="display_photo.py render",
+        description="Render images into packed panel frames, panel images and thumbnails for `push`. "
+        "Needs no panel, so it can run on a faster machine than the Pi.",
+    )
+    parser.add_argument("inputs", nargs="+", help="image files, zip archives or directories")
+    parser.add_argument("-o", "--output", required=True, help="directory to write <n>-<name>.epd/.png/.jpg to")
+    parser.add_argument("--orientation", choices=sorted(ALLOWED_ORIENTATIONS), default="landscape")
+    parser.add_argument("--rotation", type=int, choices=sorted(ALLOWED_ROTATIONS), default=0)
+    parser.add_argument("--crop", type=float, default=1.0, help=f"center crop, {MIN_CROP} to 1")
+    parser.add_argument("--fill", action="store_true", help="crop to fill the frame")
+    parser.add_argument("--workers", type=int, help="render processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    settings = {
+        "rotation": args.rotation,
+        "crop": parse_crop(args.crop),
+        "fill": args.fill,
+        "orientation": args.orientation,
+    }
+    try:
+        files = collect_render_inputs(args.inputs)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if not files:
+        parser.error("no images found")
+
+    started = time.perf_counter()
+    failed = 0
+    for progress in render_frame_files(files, settings, args.output, args.workers):
+        position = f"[{progress['index'] + 1}/{progress['total']}] {progress['file']}"
+        if progress["ok"]:
+            print(f"{position} -> {progress['output']}.epd")
+        else:
+            failed += 1
+            print(f"{position} failed: {progress['error']}")
+    print(f"Rendered {len(files) - failed} of {len(files)} in {time.perf_counter() - started:.1f} s into {args.output}")
+    return 1 if failed else 0
+
+
+def push_main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="display_photo.py push",
+        description="Add frames made by `render` to a running server's rotation queue, in file name order.",
+    )
+    parser.add_argument("directory", help="output directory of `render`")
+    parser.add_argument("--server", default=f"http://localhost:{SERVER_PORT}", help="server URL")
+    parser.add_argument("--playlist", default="", help="playlist to tag the items with")
+    args = parser.parse_args(argv)
+
+    pushed = failed = 0
+    for result in push_frame_files(args.directory, args.server, args.playlist):
+        if result["ok"]:
+            pushed += 1
+            print(f"{result['file']} -> {result['item_id']}" + (" (deduplicated)" if result["deduplicated"] else ""))
+        else:
+            failed += 1
+            print(f"{result['file']} failed: {result['error']}")
+    print(f"Pushed {pushed} frame(s), {failed} failed")
+    return 1 if failed or not pushed else 0
+
+
 def main():
     if len(sys.argv) >= 2:
+        if sys.argv[1] == "render":
+            sys.exit(render_main(sys.argv[2:]))
+        if sys.argv[1] == "push":
+            sys.exit(push_main(sys.argv[2:]))
         if sys.argv[1] == "--clear":
-            epd = epd13in3E.EPD()
+            epd = epd_driver().EPD()
             epd.Init()
             print("Clearing screen...")
             epd.Clear()
@@ -2097,8 +6146,7 @@ def main():
 
         url = sys.argv[1]
         print("Fetching image...")
-        data = fetch_image(url)
-        image = load_image_from_bytes(data)
+        image = load_image_from_url(url)
         print("Displaying (refresh ~19s)...")
         show_image_on_epd(image)
         get_epd().sleep()
@@ -241,17 +241,10 @@ class EPD():
 
         # Convert the soruce image to the 7 colors, dithering if needed
         image_7color = image_temp.convert("RGB").quantize(palette=pal_image)
-        buf_7color = bytearray(image_7color.tobytes('raw'))
-
-        # PIL does not support 4 bit color, so pack the 4 bits of color
-        # into a single byte to transfer to the panel
-        buf = [0x00] * int(self.width * self.height / 2)
-        idx = 0
-        for i in range(0, len(buf_7color), 2):
-            buf[idx] = (buf_7color[i] << 4) + buf_7color[i+1]
-            idx += 1
-            
-        return buf
+
+        # Pack two 4 bit palette indices per byte (high nibble first) for the
+        # panel; PIL's P;4 raw packer does this in C
+        return image_7color.tobytes('raw', 'P;4')
     
     def Clear(self, color=0x11):
         epdconfig.digital_write(self.EPD_CS_M_PIN, 0)
@@ -268,6 +261,10 @@ class EPD():
         self.TurnOnDisplay()
 
     def display(self, image):
+        self.SendFrame(image)
+        self.TurnOnDisplay()
+
+    def SendFrame(self, image):
         Width =int(self.width / 4)
         Width1 =int(self.width / 2)
 
@@ -283,8 +280,6 @@ class EPD():
             self.SendData2(image[i * Width1+Width : i * Width1+Width1], Width)
         self.CS_ALL(1)
 
-        self.TurnOnDisplay()
-
     def sleep(self):
         self.CS_ALL(0)
         self.SendCommand(0x07)